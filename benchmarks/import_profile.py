@@ -0,0 +1,102 @@
+# Import-time profile of main.py's startup path
+# Runs every module-level import of main.py under `python -X importtime` and reports the
+# total and the slowest imports, i.e. what runs before the main window can appear
+#
+# Usage:
+#   python -m benchmarks.import_profile
+#   python -m benchmarks.import_profile --root path/to/other/checkout --top 20
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+
+
+def get_startup_imports(main_script_path: Path) -> str:
+    """
+    Collect the module-level import statements of a script.
+
+    Args:
+        main_script_path: Script to read, normally main.py
+
+    Returns:
+        Source code with one import statement per line
+    """
+    module = ast.parse(main_script_path.read_text(encoding="utf-8"))
+    return "\n".join(
+        ast.unparse(statement)
+        for statement in module.body
+        if isinstance(statement, (ast.Import, ast.ImportFrom))
+    )
+
+
+def profile_imports(root: Path) -> List[Tuple[str, int, int, int]]:
+    """
+    Import main.py's startup modules in a fresh interpreter and record their times.
+
+    Args:
+        root: Checkout whose main.py and src package are profiled
+
+    Returns:
+        List of (module, self microseconds, cumulative microseconds, depth)
+    """
+    startup_imports = get_startup_imports(root / "main.py")
+    environment = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", startup_imports],
+        cwd=root,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    import_times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative_time, module_name = line[len("import time:") :].split("|")
+        if not self_time.strip().isdigit():
+            # Header line
+            continue
+        depth = (len(module_name) - len(module_name.lstrip())) // 2
+        import_times.append(
+            (module_name.strip(), int(self_time), int(cumulative_time), depth)
+        )
+    return import_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile main.py's startup imports")
+    parser.add_argument("--root", type=Path, default=REPOSITORY_ROOT)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--runs", type=int, default=3, help="Fresh interpreters to take the best of"
+    )
+    arguments = parser.parse_args()
+
+    runs = [profile_imports(arguments.root) for _ in range(arguments.runs)]
+    best_run = min(runs, key=lambda run: sum(entry[1] for entry in run))
+    total_time = sum(entry[1] for entry in best_run)
+    print(
+        f"Startup imports of {arguments.root / 'main.py'}: {total_time / 1000:.0f} ms"
+    )
+    print(f"{'cumulative ms':>13}  module")
+    # The outermost modules show where the time goes from main.py's point of view
+    slowest_imports = sorted(
+        (entry for entry in best_run if entry[3] <= 1),
+        key=lambda entry: entry[2],
+        reverse=True,
+    )
+    for module_name, _, cumulative_time, depth in slowest_imports[: arguments.top]:
+        print(f"{cumulative_time / 1000:>13.1f}  {'  ' * depth}{module_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1261 @@
+# Hot-path benchmarks against synthetic MTGA installs
+# Generates an install per scale and times the app's own code for the operations users
+# wait on, so a regression shows up as a jump in one row of the table. Update downloads
+# are checked against a local server with Range support that drops connections
+#
+# Usage:
+#   python -m benchmarks.run_benchmarks
+#   python -m benchmarks.run_benchmarks --scales small medium --output results.json
+#
+# Nothing outside the temporary directory is touched: HOME is redirected before the
+# app's modules are imported, since backups, thumbnails and the asset index live there
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager, redirect_stdout
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# (cards, bundles) per scale; real installs have tens of thousands of cards
+SCALES = {
+    "small": (2000, 20),
+    "medium": (10000, 100),
+    "large": (40000, 400),
+}
+REPEATS = 5
+SEARCH_QUERY = "blazing golem"
+# More distinct queries than the artist search cache holds, so every search is a miss
+ARTIST_QUERY_COUNT = 50
+# Combined decklists of this many different cards each
+DECKLIST_COUNT = 3
+DECKLIST_SIZE = 60
+LOOKUP_COUNT = 200
+# Cards whose localized text is edited, each save writing all four fields
+LOCALIZATION_SAVE_COUNT = 20
+TEXTURE_COUNT = 10
+# Editor image sizes for the per-click display benchmark
+DISPLAY_IMAGE_SIZES = ((2048, 1536), (4096, 4096))
+PRESET_FRACTION = 0.1
+# Textures of the bundle one texture is replaced in, for texture journal against
+# whole-bundle backups
+JOURNAL_BUNDLE_TEXTURES = 16
+JOURNAL_TEXTURE_SIZE = (1024, 1024)
+MESH_BUNDLE_COUNT = 8
+MESH_SEGMENTS = (200, 120, 60)
+SET_SWAP_COUNT = 10
+UPDATE_SIZE_MB = 64
+UPDATE_INTERRUPTIONS = 2
+# Stand-in executable for patch updates: compressed modules like a PyInstaller archive
+PATCH_MODULE_COUNT = 4000
+PATCH_CHANGED_MODULES = 20
+
+
+class EventSink:
+    """Stands in for a FreeSimpleGUI window that receives background thread events."""
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, object]] = []
+        self.done = threading.Event()
+
+    def write_event_value(self, key: str, value) -> None:
+        self.events.append((key, value))
+        if key == "-EXPORT_DONE-":
+            self.done.set()
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that doesn't log every request."""
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class RangeRequestHandler(QuietHandler):
+    """
+    Static file handler with Range support that can cut responses short.
+
+    Stands in for the release download server. Set `interruptions` to make that
+    many responses close the connection after `interrupt_after` bytes.
+    """
+
+    interruptions = 0
+    interrupt_after = 0
+    bytes_sent = 0
+
+    def do_GET(self) -> None:
+        file_path = Path(self.translate_path(self.path))
+        if not file_path.is_file():
+            self.send_error(404)
+            return
+        file_size = file_path.stat().st_size
+        first_byte = 0
+        range_header = self.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            first_byte = int(range_header[len("bytes=") :].split("-")[0])
+            if first_byte >= file_size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{file_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {first_byte}-{file_size - 1}/{file_size}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(file_size - first_byte))
+        self.send_header("ETag", f'"{file_path.stat().st_mtime_ns}"')
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        bytes_to_send = file_size - first_byte
+        if RangeRequestHandler.interruptions > 0:
+            RangeRequestHandler.interruptions -= 1
+            bytes_to_send = min(bytes_to_send, RangeRequestHandler.interrupt_after)
+            self.close_connection = True
+        with open(file_path, "rb") as served_file:
+            served_file.seek(first_byte)
+            while bytes_to_send > 0:
+                chunk = served_file.read(min(bytes_to_send, 1024 * 1024))
+                self.wfile.write(chunk)
+                bytes_to_send -= len(chunk)
+                RangeRequestHandler.bytes_sent += len(chunk)
+
+
+@contextmanager
+def serve_directory(directory: Path, handler_class=QuietHandler):
+    """
+    Serve a directory over HTTP on a free local port.
+
+    Args:
+        directory: Directory to serve
+        handler_class: Request handler, QuietHandler serves plain static files
+
+    Yields:
+        Base URL of the server
+    """
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(handler_class, directory=str(directory))
+    )
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def time_call(function: Callable, repeats: int = REPEATS) -> List[float]:
+    """
+    Time a function several times.
+
+    Args:
+        function: Function to call without arguments
+        repeats: Number of calls
+
+    Returns:
+        Seconds taken by each call
+    """
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(name: str, timings: List[float], items: int = 1) -> Dict:
+    """
+    Reduce timings to the numbers shown in the results table.
+
+    Args:
+        name: Benchmark name
+        timings: Seconds per run
+        items: Items processed per run, for the per-item time
+
+    Returns:
+        Dictionary with the name, median, best and worst run in milliseconds
+    """
+    median = statistics.median(timings)
+    return {
+        "name": name,
+        "runs": len(timings),
+        "items": items,
+        "median_ms": median * 1000,
+        "min_ms": min(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "per_item_ms": median * 1000 / max(items, 1),
+    }
+
+
+def run_scale(scale: str, card_count: int, bundle_count: int, work_root: Path) -> List:
+    """
+    Generate one install and run every benchmark against it.
+
+    Args:
+        scale: Scale name, used for the install directory
+        card_count: Cards in the card database
+        bundle_count: Card art bundles
+        work_root: Temporary directory for the install and outputs
+
+    Returns:
+        Summaries of every benchmark
+    """
+    # Imported here so HOME is already redirected
+    from benchmarks.synthetic_install import (
+        create_synthetic_install,
+        make_card_art,
+        write_mesh_bundle,
+        write_texture_bundle,
+    )
+    from PIL import Image
+
+    from src.bundle_export import start_bulk_export
+    from src.bundle_writer import BUNDLE_COMPRESSIONS, save_bundle_file
+    from src.card_models import (
+        MTGACard,
+        build_card_name_index,
+        card_name_key,
+        filter_card_list,
+        filter_cards_by_names,
+    )
+    from src.backup_store import BACKUP_DIRECTORY, backup_bundle
+    from src.load_preset import (
+        capture_baseline,
+        change_grp_id,
+        get_baseline_path,
+        save_grp_id_info,
+    )
+    from src.mesh_export import MESH_EXPORT_FORMATS, MeshGeometry, export_mesh
+    from src.localization import (
+        CARD_LOCALIZATION_FIELDS,
+        LocalizationStore,
+        import_localization_pack,
+    )
+    from src.set_swapper import find_asset_bundles, perform_set_swap
+    from src.sql_editor import (
+        create_database_connection,
+        fetch_card_list,
+        get_localization_from_id,
+        get_tokens_by_artist,
+        set_localization_from_id,
+        unlock_parallax_style,
+    )
+    from src.texture_journal import get_journal_directory
+    from src.image_utils import (
+        clear_display_frames,
+        convert_texture_to_bytes,
+        get_display_frame,
+        resize_image_to_screen,
+    )
+    from src.texture_memory import DecodedImageList
+    from src.token_search import (
+        build_artist_index,
+        find_art_bundle,
+        get_token_preview,
+        list_art_bundles,
+    )
+    from src.unity_bundle import (
+        configure_unity_version,
+        extract_textures_from_bundle,
+        get_card_texture_data,
+        journal_original_texture,
+        load_unity_bundle,
+        replace_texture_in_bundle,
+        restore_textures_in_bundle,
+    )
+
+    scale_root = work_root / scale
+    started = time.perf_counter()
+    install = create_synthetic_install(
+        scale_root / "MTGA", card_count, bundle_count, textures_per_bundle=2
+    )
+    print(
+        f"[{scale}] generated {card_count} cards and {bundle_count} bundles "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    database_path = str(install.database_path)
+    configure_unity_version(database_path, "2022.3.42f1")
+    cursor, connection, _ = create_database_connection(database_path)
+    results = []
+
+    # Card list load, as done when a database is selected
+    card_list = fetch_card_list(cursor)
+    results.append(
+        summarize("card list load", time_call(lambda: fetch_card_list(cursor)))
+    )
+
+    # Search, one filter per keystroke of a typed query
+    keystroke_timings = []
+    for prefix_length in range(1, len(SEARCH_QUERY) + 1):
+        search_query = SEARCH_QUERY[:prefix_length]
+        keystroke_timings += time_call(
+            lambda: filter_card_list(card_list, search_query), repeats=3
+        )
+    results.append(summarize("search keystroke", keystroke_timings))
+
+    # Decklist filter, as done when one or more decklists are loaded
+    card_name_index = build_card_name_index(card_list)
+    deck_card_names = set()
+    generator = random.Random(7)
+    for _ in range(DECKLIST_COUNT):
+        deck_card_names.update(
+            "".join(character for character in name.lower() if character.isalnum())
+            for *_, name in generator.sample(install.cards, DECKLIST_SIZE)
+        )
+    deck_cards = filter_cards_by_names(card_list, card_name_index, deck_card_names)
+    if deck_cards != [
+        card for card in card_list if card_name_key(card) in deck_card_names
+    ]:
+        raise RuntimeError("Decklist filter doesn't match a scan of the card list")
+    results.append(
+        summarize(
+            "decklist filter",
+            time_call(
+                lambda: filter_cards_by_names(
+                    card_list, card_name_index, deck_card_names
+                )
+            ),
+            items=len(deck_card_names),
+        )
+    )
+
+    # Bundle lookup by ArtId, as done for every swapped card
+    art_ids = [card[1] for card in install.cards[:LOOKUP_COUNT]]
+    results.append(
+        summarize(
+            "bundle lookup",
+            time_call(
+                lambda: [
+                    find_asset_bundles(install.asset_bundle_directory, 0, art_id)
+                    for art_id in art_ids
+                ]
+            ),
+            items=len(art_ids),
+        )
+    )
+
+    # Texture extraction and first decode, as done when a card is opened
+    texture_cards = [
+        MTGACard(name, expansion_code, "1", str(grp_id), str(art_id))
+        for grp_id, art_id, expansion_code, _, name in install.cards[:TEXTURE_COUNT]
+    ]
+
+    def open_cards() -> None:
+        for card in texture_cards:
+            with redirect_stdout(StringIO()):
+                images, textures = get_card_texture_data(card, database_path)
+            images[0]
+            if isinstance(images, DecodedImageList):
+                images.release()
+
+    results.append(
+        summarize("texture extraction", time_call(open_cards), items=len(texture_cards))
+    )
+
+    # Showing an image in an editor, per click: the PNG encode the editors used to
+    # hand to Tk against raw pixels. Without a display, PIL's PNG decode stands in
+    # for Tk's and copying the pixels out stands in for ImageTk.PhotoImage
+    try:
+        import tkinter
+
+        tk_root = tkinter.Tk()
+        tk_root.withdraw()
+    except Exception:
+        tk_root = None
+
+    for width, height in DISPLAY_IMAGE_SIZES:
+        display_image = Image.merge(
+            "RGBA",
+            [
+                *make_card_art(width, (width, height)).split(),
+                Image.effect_noise((width, height), 64),
+            ],
+        )
+
+        def display_png() -> None:
+            png_bytes = convert_texture_to_bytes(resize_image_to_screen(display_image))
+            Image.open(io.BytesIO(png_bytes)).load()
+
+        def display_raw() -> None:
+            if tk_root is not None:
+                get_display_frame(display_image)
+            else:
+                resize_image_to_screen(display_image).convert("RGBA").tobytes()
+
+        results.append(
+            summarize(
+                f"display click png {width}x{height}", time_call(display_png, repeats=3)
+            )
+        )
+        results.append(
+            summarize(
+                f"display click raw {width}x{height}", time_call(display_raw, repeats=3)
+            )
+        )
+        if tk_root is not None:
+            get_display_frame(display_image, ("display", width))
+            results.append(
+                summarize(
+                    f"display click cached {width}x{height}",
+                    time_call(
+                        lambda: get_display_frame(display_image, ("display", width))
+                    ),
+                )
+            )
+            clear_display_frames()
+    if tk_root is not None:
+        tk_root.destroy()
+    else:
+        print(
+            f"[{scale}] no display, display click raw times the pixel copy instead of Tk"
+        )
+
+    # Token search by artist, then the grid previews of the results
+    artist_index = build_artist_index(cursor)
+    artist_queries = [f"artist {number}" for number in range(ARTIST_QUERY_COUNT)]
+    artist_queries += ["ARTIST 39", "st 1", "7", ""]
+    for artist_query in artist_queries:
+        if artist_index.search(artist_query) != get_tokens_by_artist(
+            artist_query, cursor
+        ):
+            raise RuntimeError(f"Artist index doesn't match SQL for {artist_query!r}")
+    results.append(
+        summarize(
+            "artist search",
+            time_call(
+                lambda: [
+                    artist_index.search(artist_query)
+                    for artist_query in artist_queries[:ARTIST_QUERY_COUNT]
+                ]
+            ),
+            items=ARTIST_QUERY_COUNT,
+        )
+    )
+
+    bundle_names = list_art_bundles(install.asset_bundle_directory)
+    preview_bundles = [
+        os.path.join(install.asset_bundle_directory, bundle_name)
+        for bundle_name in {
+            find_art_bundle(bundle_names, art_id)
+            for _, art_id in artist_index.search("artist 1")
+        }
+        if bundle_name
+    ][:TEXTURE_COUNT]
+    started = time.perf_counter()
+    for bundle_path in preview_bundles:
+        get_token_preview(bundle_path)
+    results.append(
+        summarize(
+            "token preview cold",
+            [time.perf_counter() - started],
+            items=len(preview_bundles),
+        )
+    )
+    results.append(
+        summarize(
+            "token preview cached",
+            time_call(
+                lambda: [
+                    get_token_preview(bundle_path) for bundle_path in preview_bundles
+                ]
+            ),
+            items=len(preview_bundles),
+        )
+    )
+
+    # Preset apply: card columns, localizations and crops of a share of the cards
+    preset_cards = install.cards[: max(1, int(len(install.cards) * PRESET_FRACTION))]
+    title_ids = dict(cursor.execute("SELECT GrpId, TitleId FROM Cards").fetchall())
+    preset_path = scale_root / "preset.json"
+
+    def write_preset(variant: int) -> None:
+        changes = {
+            str(grp_id): {
+                "ArtSize": variant,
+                "Localizations_enUS": {
+                    str(title_ids[grp_id]): f"{name} {variant}",
+                },
+            }
+            for grp_id, _, _, _, name in preset_cards
+        }
+        changes["crops"] = {
+            str(art_id): [
+                {
+                    "path": f"Assets/Core/CardArt/{str(art_id)[:3]}000/{art_id}_AIF",
+                    "format": "Normal",
+                    "x": 1.0,
+                    "y": 0.9 - variant / 100,
+                    "z": 0.0,
+                    "w": 0.05,
+                    "generated": 0,
+                }
+            ]
+            for art_id in {card[1] for card in preset_cards}
+        }
+        preset_path.write_text(json.dumps(changes))
+
+    preset_timings = []
+    for variant in range(REPEATS):
+        # Alternate values so every run really writes
+        write_preset(variant % 2 + 2)
+        started = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            change_grp_id(
+                str(preset_path),
+                cursor,
+                connection,
+                asset_bundle_path=str(install.asset_bundle_directory),
+                restore_plan=[],
+            )
+        preset_timings.append(time.perf_counter() - started)
+    results.append(summarize("preset apply", preset_timings, items=len(preset_cards)))
+
+    # Parallax unlock of every card, with the original tags put back between runs
+    unlock_grp_ids = [str(card[0]) for card in install.cards]
+    original_tags = cursor.execute("SELECT Tags, GrpId FROM Cards").fetchall()
+    unlock_changes_path = scale_root / "unlock_changes.json"
+
+    def unlock_per_card() -> None:
+        # The per-GrpId UPDATE and full save the unlock used to run
+        capture_baseline(unlock_grp_ids, cursor, unlock_changes_path, ["Tags"])
+        cursor.executemany(
+            """
+            UPDATE Cards
+            SET tags = CASE
+                WHEN tags IS NULL OR TRIM(tags) = '' THEN '1696804317'
+                ELSE tags || ',1696804317'
+            END
+            WHERE GrpId = ? AND tags NOT LIKE '%1696804317%'
+            """,
+            [(grp_id,) for grp_id in unlock_grp_ids],
+        )
+        connection.commit()
+        save_grp_id_info(
+            unlock_grp_ids,
+            str(unlock_changes_path),
+            cursor,
+            connection,
+            str(install.asset_bundle_directory),
+        )
+
+    def unlock_set_based() -> None:
+        unlock_parallax_style(
+            unlock_grp_ids, cursor, connection, str(unlock_changes_path)
+        )
+
+    def get_backup_size() -> int:
+        return sum(
+            path.stat().st_size
+            for path in BACKUP_DIRECTORY.rglob("*")
+            if path.is_file()
+        )
+
+    for name, unlock in (
+        ("parallax unlock per card", unlock_per_card),
+        ("parallax unlock", unlock_set_based),
+    ):
+        unlock_timings = []
+        backup_size = get_backup_size()
+        for _ in range(REPEATS):
+            cursor.executemany(
+                "UPDATE Cards SET Tags = ? WHERE GrpId = ?", original_tags
+            )
+            connection.commit()
+            unlock_changes_path.write_text("{}")
+            get_baseline_path(unlock_changes_path).unlink(missing_ok=True)
+            started = time.perf_counter()
+            with redirect_stdout(StringIO()):
+                unlock()
+            unlock_timings.append(time.perf_counter() - started)
+        results.append(summarize(name, unlock_timings, items=len(unlock_grp_ids)))
+    if get_backup_size() != backup_size:
+        raise RuntimeError("Parallax unlock backed up art bundles")
+    unlock_changes = json.loads(unlock_changes_path.read_text())
+    if len(unlock_changes) != len(unlock_grp_ids) or any(
+        entry != {"Tags": "1696804317", "_baseline": {"Tags": ""}}
+        for entry in unlock_changes.values()
+    ):
+        raise RuntimeError("Parallax unlock didn't record the tag changes")
+    cursor.executemany("UPDATE Cards SET Tags = ? WHERE GrpId = ?", original_tags)
+    connection.commit()
+
+    # Card details dialog: the four localized fields of a card, read and then saved
+    field_list = ", ".join(CARD_LOCALIZATION_FIELDS)
+    card_loc_ids = cursor.execute(
+        f"SELECT {field_list} FROM Cards LIMIT {LOOKUP_COUNT}"
+    ).fetchall()
+    localization_store = LocalizationStore(cursor)
+    for loc_ids in card_loc_ids:
+        texts = localization_store.get_many(loc_ids)
+        if [texts[str(loc_id)] for loc_id in loc_ids] != [
+            get_localization_from_id(cursor, loc_id) for loc_id in loc_ids
+        ]:
+            raise RuntimeError(f"Localization store doesn't match for {loc_ids}")
+    results.append(
+        summarize(
+            "localization per field",
+            time_call(
+                lambda: [
+                    get_localization_from_id(cursor, loc_id)
+                    for loc_ids in card_loc_ids
+                    for loc_id in loc_ids
+                ]
+            ),
+            items=len(card_loc_ids),
+        )
+    )
+    results.append(
+        summarize(
+            "localization batched",
+            time_call(
+                lambda: (
+                    localization_store.clear(),
+                    [localization_store.get_many(loc_ids) for loc_ids in card_loc_ids],
+                )
+            ),
+            items=len(card_loc_ids),
+        )
+    )
+    first_set = install.cards[0][2]
+    results.append(
+        summarize(
+            "localization set",
+            time_call(
+                lambda: (
+                    localization_store.clear(),
+                    localization_store.prefetch_set(first_set),
+                )
+            ),
+        )
+    )
+    results.append(
+        summarize(
+            "localization cached",
+            time_call(
+                lambda: [
+                    localization_store.get_many(loc_ids) for loc_ids in card_loc_ids
+                ]
+            ),
+            items=len(card_loc_ids),
+        )
+    )
+
+    saved_loc_ids = card_loc_ids[:LOCALIZATION_SAVE_COUNT]
+
+    def save_per_field(variant: int) -> None:
+        with redirect_stdout(StringIO()):
+            for loc_ids in saved_loc_ids:
+                for loc_id in loc_ids:
+                    set_localization_from_id(cursor, loc_id, f"Text {variant}")
+
+    def save_batched(variant: int) -> None:
+        with redirect_stdout(StringIO()):
+            for loc_ids in saved_loc_ids:
+                for loc_id in loc_ids:
+                    localization_store.set(loc_id, f"Text {variant}")
+                localization_store.flush()
+
+    for name, save in (
+        ("localization save", save_per_field),
+        ("localization flush", save_batched),
+    ):
+        save_timings = []
+        for variant in range(REPEATS):
+            started = time.perf_counter()
+            save(variant)
+            save_timings.append(time.perf_counter() - started)
+        results.append(summarize(name, save_timings, items=len(saved_loc_ids)))
+    if localization_store.get(saved_loc_ids[0][0]) != f"Text {REPEATS - 1}":
+        raise RuntimeError("Flushed localization edits weren't written")
+
+    # Localization pack replacing the text of every localization row, as a semicolon
+    # CSV in spreadsheet order rather than the table's, with one bad row
+    pack_keys = cursor.execute(
+        "SELECT LocId, Formatted FROM Localizations_enUS"
+    ).fetchall()
+    random.Random(0).shuffle(pack_keys)
+    pack_paths = []
+    for variant in range(REPEATS):
+        pack_path = scale_root / f"localization_pack_{variant}.csv"
+        with open(pack_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["LocId", "Formatted", "Loc"])
+            writer.writerows(
+                (loc_id, formatted, f"Pack {variant} text {loc_id} {formatted}")
+                for loc_id, formatted in pack_keys
+            )
+            writer.writerow(["not-a-loc-id", 1, "Bad row"])
+        pack_paths.append(pack_path)
+
+    def import_per_row(pack_path: Path) -> None:
+        # The UPDATE per row the Spider-Man import used to run, per variant
+        with open(pack_path, "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                if not row["LocId"].isdigit():
+                    continue
+                cursor.execute(
+                    "UPDATE Localizations_enUS SET Loc = ? WHERE LocId = ? AND Formatted = ?",
+                    (row["Loc"], int(row["LocId"]), int(row["Formatted"])),
+                )
+        connection.commit()
+
+    def import_pack(pack_path: Path) -> dict:
+        with redirect_stdout(StringIO()):
+            return import_localization_pack(cursor, str(pack_path))
+
+    for name, import_function in (
+        ("localization pack per row", import_per_row),
+        ("localization pack import", import_pack),
+    ):
+        import_timings = []
+        # Every run writes a new text to every row, as the first import of a pack does
+        for pack_path in pack_paths:
+            started = time.perf_counter()
+            import_function(pack_path)
+            import_timings.append(time.perf_counter() - started)
+        results.append(summarize(name, import_timings, items=len(pack_keys)))
+    # Applying the same pack again, where nothing needs to be written
+    results.append(
+        summarize(
+            "localization pack reapply",
+            time_call(lambda: import_pack(pack_paths[-1])),
+            items=len(pack_keys),
+        )
+    )
+    pack_report = import_pack(pack_paths[-1])
+    if pack_report["invalid"] != 1 or pack_report["written"] != 0:
+        raise RuntimeError(f"Localization pack reapply reported {pack_report}")
+    imported_texts = dict(
+        ((loc_id, formatted), text)
+        for loc_id, formatted, text in cursor.execute(
+            "SELECT LocId, Formatted, Loc FROM Localizations_enUS"
+        )
+    )
+    if any(
+        imported_texts[(loc_id, formatted)]
+        != f"Pack {REPEATS - 1} text {loc_id} {formatted}"
+        for loc_id, formatted in pack_keys
+    ):
+        raise RuntimeError("Localization pack didn't write every variant")
+
+    # Backing up one replaced texture of a bundle: a whole-bundle copy against the
+    # texture journal, which only stores the texture touched
+    journal_root = scale_root / "journal"
+    journal_root.mkdir(exist_ok=True)
+    journal_bundle_path = journal_root / "999999_journal.mtga"
+    write_texture_bundle(
+        journal_bundle_path,
+        [
+            (f"texture{index}", make_card_art(index, JOURNAL_TEXTURE_SIZE))
+            for index in range(JOURNAL_BUNDLE_TEXTURES)
+        ],
+    )
+    replacement_path = journal_root / "replacement.png"
+    make_card_art(JOURNAL_BUNDLE_TEXTURES, JOURNAL_TEXTURE_SIZE).save(replacement_path)
+
+    def first_texture(unity_environment):
+        return extract_textures_from_bundle(unity_environment, sort_by_colors=False)[0]
+
+    original_raw_data = first_texture(
+        load_unity_bundle(str(journal_bundle_path))
+    ).object_reader.get_raw_data()
+    whole_bundle_roots = iter(range(REPEATS))
+    results.append(
+        summarize(
+            "whole bundle backup",
+            time_call(
+                lambda: backup_bundle(
+                    journal_bundle_path,
+                    journal_root / f"bundles{next(whole_bundle_roots)}",
+                )
+            ),
+        )
+    )
+    journal_texture = first_texture(load_unity_bundle(str(journal_bundle_path)))
+
+    def journal_texture_once() -> None:
+        shutil.rmtree(get_journal_directory(), ignore_errors=True)
+        journal_original_texture(journal_texture, str(journal_bundle_path))
+
+    results.append(summarize("texture journal", time_call(journal_texture_once)))
+    journal_size = sum(
+        path.stat().st_size
+        for path in get_journal_directory().rglob("*")
+        if path.is_file()
+    )
+    bundle_backup_size = sum(
+        path.stat().st_size
+        for path in (journal_root / "bundles0").rglob("*")
+        if path.is_file()
+    )
+    print(
+        f"[{scale}] texture journal {journal_size} bytes, "
+        f"whole bundle backup {bundle_backup_size} bytes"
+    )
+    if journal_size * JOURNAL_BUNDLE_TEXTURES > bundle_backup_size * 2:
+        raise RuntimeError("Texture journal stored more than the texture touched")
+    shutil.rmtree(get_journal_directory(), ignore_errors=True)
+
+    restore_timings = []
+    for _ in range(REPEATS):
+        unity_environment = load_unity_bundle(str(journal_bundle_path))
+        replace_texture_in_bundle(
+            first_texture(unity_environment),
+            str(replacement_path),
+            str(journal_bundle_path),
+            unity_environment,
+        )
+        started = time.perf_counter()
+        restore_textures_in_bundle(str(journal_bundle_path))
+        restore_timings.append(time.perf_counter() - started)
+    results.append(summarize("texture journal restore", restore_timings))
+    restored_raw_data = first_texture(
+        load_unity_bundle(str(journal_bundle_path))
+    ).object_reader.get_raw_data()
+    if restored_raw_data != original_raw_data:
+        raise RuntimeError("Texture journal restore didn't bring back the original")
+
+    # Saving a bundle after one texture changed: UnityPy's own save, which wrote
+    # bundles uncompressed, against each block compression reusing unchanged blocks
+    original_bundle_data = journal_bundle_path.read_bytes()
+    save_environment = load_unity_bundle(str(journal_bundle_path))
+    save_texture = first_texture(save_environment)
+    save_texture.image = Image.open(replacement_path)
+    save_texture.save()
+    saved_bundle_path = journal_root / "saved.mtga"
+    for name, save in [("bundle save unitypy", save_environment.file.save)] + [
+        (
+            f"bundle save {compression}",
+            partial(
+                save_bundle_file,
+                save_environment.file,
+                compression,
+                original_bundle_data,
+            ),
+        )
+        for compression in BUNDLE_COMPRESSIONS
+    ]:
+        results.append(summarize(name, time_call(save)))
+        saved_bundle_path.write_bytes(save())
+        print(f"[{scale}] {name} wrote {saved_bundle_path.stat().st_size} bytes")
+        saved_texture = first_texture(load_unity_bundle(str(saved_bundle_path)))
+        if bytes(saved_texture.image_data) != bytes(save_texture.image_data):
+            raise RuntimeError(f"{name} didn't write the changed texture")
+
+    # Mass export of every bundle's textures
+    export_directory = scale_root / "export"
+
+    def export_all() -> None:
+        shutil.rmtree(export_directory, ignore_errors=True)
+        event_sink = EventSink()
+        export_thread, _ = start_bulk_export(
+            event_sink, install.bundle_paths, str(export_directory)
+        )
+        event_sink.done.wait()
+        export_thread.join()
+
+    results.append(
+        summarize(
+            "mass export",
+            time_call(export_all, repeats=min(REPEATS, 3)),
+            items=len(install.bundle_paths),
+        )
+    )
+
+    # Exporting 3D meshes: UnityPy's OBJ text built in memory against the
+    # streaming writers, then every pet and cosmetic bundle in parallel
+    mesh_root = scale_root / "meshes"
+    mesh_export_directory = mesh_root / "export"
+    mesh_export_directory.mkdir(parents=True, exist_ok=True)
+    mesh_bundle_paths = {}
+    for bundle_index in range(MESH_BUNDLE_COUNT):
+        mesh_bundle_path = mesh_root / f"Pet_{bundle_index}.mtga"
+        write_mesh_bundle(
+            mesh_bundle_path,
+            [
+                (f"Pet_{bundle_index}_LOD{lod}", segments)
+                for lod, segments in enumerate(MESH_SEGMENTS)
+            ],
+        )
+        mesh_bundle_paths[mesh_bundle_path.name] = str(mesh_bundle_path)
+    meshes = [
+        unity_object.read()
+        for unity_object in load_unity_bundle(
+            next(iter(mesh_bundle_paths.values()))
+        ).objects
+        if unity_object.type.name == "Mesh"
+    ]
+
+    def export_unitypy_obj() -> None:
+        for mesh in meshes:
+            with open(
+                mesh_export_directory / f"{mesh.m_Name}.obj", "wt", newline=""
+            ) as obj_file:
+                obj_file.write(mesh.export())
+
+    results.append(
+        summarize(
+            "mesh export unitypy obj", time_call(export_unitypy_obj), items=len(meshes)
+        )
+    )
+    for mesh_format in MESH_EXPORT_FORMATS:
+        results.append(
+            summarize(
+                f"mesh export {mesh_format}",
+                time_call(
+                    lambda: [
+                        export_mesh(
+                            mesh, str(mesh_export_directory / mesh.m_Name), mesh_format
+                        )
+                        for mesh in meshes
+                    ]
+                ),
+                items=len(meshes),
+            )
+        )
+        mesh_file_size = (
+            (mesh_export_directory / f"{meshes[0].m_Name}.{mesh_format}").stat().st_size
+        )
+        print(
+            f"[{scale}] mesh export {mesh_format} wrote {mesh_file_size} bytes for {meshes[0].m_Name}"
+        )
+    for mesh in meshes:
+        if (mesh_export_directory / f"{mesh.m_Name}.obj").read_text() != mesh.export():
+            raise RuntimeError(
+                f"Streaming OBJ export of {mesh.m_Name} differs from UnityPy's"
+            )
+        vertex_count = len(MeshGeometry(mesh).vertices)
+        glb_data = (mesh_export_directory / f"{mesh.m_Name}.glb").read_bytes()
+        glb_length, json_length = (
+            struct.unpack_from("<I", glb_data, 8)[0],
+            struct.unpack_from("<I", glb_data, 12)[0],
+        )
+        glb_document = json.loads(glb_data[20 : 20 + json_length])
+        if (
+            glb_length != len(glb_data)
+            or glb_document["accessors"][0]["count"] != vertex_count
+        ):
+            raise RuntimeError(f"Binary glTF export of {mesh.m_Name} is malformed")
+        ply_header = (
+            (mesh_export_directory / f"{mesh.m_Name}.ply")
+            .read_bytes()
+            .split(b"end_header\n")[0]
+        )
+        if f"element vertex {vertex_count}\n".encode() not in ply_header:
+            raise RuntimeError(
+                f"PLY export of {mesh.m_Name} has the wrong vertex count"
+            )
+
+    def export_all_meshes() -> None:
+        shutil.rmtree(mesh_export_directory, ignore_errors=True)
+        event_sink = EventSink()
+        export_thread, _ = start_bulk_export(
+            event_sink, mesh_bundle_paths, str(mesh_export_directory), mesh_format="glb"
+        )
+        event_sink.done.wait()
+        export_thread.join()
+
+    results.append(
+        summarize(
+            "mass mesh export",
+            time_call(export_all_meshes, repeats=min(REPEATS, 3)),
+            items=len(mesh_bundle_paths),
+        )
+    )
+    exported_mesh_count = len(list(mesh_export_directory.glob("*.glb")))
+    if exported_mesh_count != MESH_BUNDLE_COUNT * len(MESH_SEGMENTS):
+        raise RuntimeError(f"Mass mesh export wrote {exported_mesh_count} meshes")
+
+    # Set swap against a local stand-in for the Scryfall API; runs last as it
+    # rewrites bundles
+    site_directory = scale_root / "site"
+    site_directory.mkdir(exist_ok=True)
+    swap_cards = install.cards[:SET_SWAP_COUNT]
+    with serve_directory(site_directory) as base_url:
+        swaps = []
+        for grp_id, art_id, expansion_code, collector_number, name in swap_cards:
+            art_file = f"{grp_id}.png"
+            make_card_art(grp_id, (626, 457)).save(site_directory / art_file)
+            (site_directory / f"{grp_id}.json").write_text(
+                json.dumps(
+                    {
+                        "name": f"{name} Reprint",
+                        "type_line": "Creature",
+                        "image_uris": {
+                            "art_crop": f"{base_url}/{art_file}",
+                            "png": f"{base_url}/{art_file}",
+                        },
+                    }
+                )
+            )
+            swaps.append(
+                {
+                    "source_card_name": name,
+                    "target_card_name": f"{name} Reprint",
+                    "expansion_code": expansion_code,
+                    "collector_number": collector_number,
+                    "target_api_url": f"{base_url}/{grp_id}.json",
+                }
+            )
+        swaps_path = scale_root / "swaps.json"
+        swaps_path.write_text(json.dumps(swaps))
+        save_path = scale_root / "set_swap_changes.json"
+
+        def set_swap() -> None:
+            save_path.write_text("{}")
+            # perform_set_swap downloads into ./temp_art
+            working_directory = os.getcwd()
+            os.chdir(scale_root)
+            try:
+                with redirect_stdout(StringIO()):
+                    perform_set_swap(
+                        swaps_path,
+                        cursor,
+                        connection,
+                        install.asset_bundle_directory,
+                        scale_root / "set_swap_backups",
+                        save_path,
+                    )
+            finally:
+                os.chdir(working_directory)
+
+        results.append(
+            summarize(
+                "set swap",
+                time_call(set_swap, repeats=min(REPEATS, 3)),
+                items=len(swaps),
+            )
+        )
+
+    connection.close()
+    return results
+
+
+def run_update_download(work_root: Path) -> List[Dict]:
+    """
+    Time and verify update downloads against a local stand-in release server.
+
+    Covers a clean download, one whose connection drops several times, and one
+    resumed from a half-finished file left by an earlier run.
+
+    Args:
+        work_root: Temporary directory for the served file and downloads
+
+    Returns:
+        Summaries of every benchmark, per item times are per MB
+    """
+    from src.updater import download_file
+
+    site_directory = work_root / "update_site"
+    site_directory.mkdir()
+    update_data = os.urandom(UPDATE_SIZE_MB * 1024 * 1024)
+    (site_directory / "MTGA_Swapper.exe").write_bytes(update_data)
+    expected_checksum = hashlib.sha256(update_data).hexdigest()
+    download_path = work_root / "MTGA_Swapper.exe.part"
+
+    def download(partial_bytes: int = 0, interruptions: int = 0) -> float:
+        download_path.unlink(missing_ok=True)
+        if partial_bytes:
+            download_path.write_bytes(update_data[:partial_bytes])
+        RangeRequestHandler.interruptions = interruptions
+        RangeRequestHandler.interrupt_after = len(update_data) // (interruptions + 2)
+        RangeRequestHandler.bytes_sent = 0
+        started = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            checksum = download_file(f"{base_url}/MTGA_Swapper.exe", download_path)
+        elapsed = time.perf_counter() - started
+        if checksum != expected_checksum or download_path.read_bytes() != update_data:
+            raise RuntimeError("Update download doesn't match the served file")
+        if RangeRequestHandler.bytes_sent != len(update_data) - partial_bytes:
+            raise RuntimeError(
+                f"Served {RangeRequestHandler.bytes_sent} bytes for a download "
+                f"needing {len(update_data) - partial_bytes}"
+            )
+        return elapsed
+
+    with serve_directory(site_directory, RangeRequestHandler) as base_url:
+        results = [
+            summarize(
+                "update download",
+                [download() for _ in range(3)],
+                items=UPDATE_SIZE_MB,
+            ),
+            summarize(
+                "update interrupted",
+                [download(interruptions=UPDATE_INTERRUPTIONS)],
+                items=UPDATE_SIZE_MB,
+            ),
+            summarize(
+                "update resume",
+                [download(partial_bytes=len(update_data) // 2) for _ in range(3)],
+                items=UPDATE_SIZE_MB // 2,
+            ),
+        ]
+    return results
+
+
+def build_release_executable(modules: List[bytes]) -> bytes:
+    """Pack modules like a PyInstaller onefile executable: each compressed on its own."""
+    return b"".join(zlib.compress(module, 9) for module in modules)
+
+
+def run_update_patch(work_root: Path) -> List[Dict]:
+    """
+    Time and verify a patch update against a full download of the same release.
+
+    Args:
+        work_root: Temporary directory for the releases, patch and downloads
+
+    Returns:
+        Summaries of every benchmark, per item times are per MB of the new release
+    """
+    from src.delta_patch import apply_patch, create_patch
+    from src.updater import download_file
+
+    generator = random.Random(42)
+    words = [
+        "".join(
+            generator.choices("abcdefghijklmnopqrstuvwxyz_", k=generator.randint(2, 12))
+        )
+        for _ in range(5000)
+    ]
+    modules = [
+        " ".join(generator.choices(words, k=generator.randint(200, 4000))).encode()
+        for _ in range(PATCH_MODULE_COUNT)
+    ]
+    old_executable = work_root / "MTGA_Swapper.old.exe"
+    old_executable.write_bytes(build_release_executable(modules))
+    for module_index in generator.sample(range(len(modules)), PATCH_CHANGED_MODULES):
+        modules[module_index] = modules[module_index].replace(b" ", b"  ", 1)
+    modules.insert(len(modules) // 2, b"def added_module(): pass\n" * 100)
+    new_data = build_release_executable(modules)
+    expected_checksum = hashlib.sha256(new_data).hexdigest()
+
+    site_directory = work_root / "patch_site"
+    site_directory.mkdir()
+    (site_directory / "MTGA_Swapper.exe").write_bytes(new_data)
+    new_executable = site_directory / "MTGA_Swapper.exe"
+    patch_path = site_directory / "MTGA_Swapper.patch"
+    release_mb = max(round(len(new_data) / (1024 * 1024)), 1)
+
+    started = time.perf_counter()
+    patch_size = create_patch(str(old_executable), str(new_executable), str(patch_path))
+    create_time = time.perf_counter() - started
+    if patch_size * 10 > len(new_data):
+        raise RuntimeError(
+            f"Patch is {patch_size} bytes for a {len(new_data)} byte release"
+        )
+    print(
+        f"Patch update: {patch_size / 1024:.0f} KB instead of "
+        f"{len(new_data) / (1024 * 1024):.1f} MB "
+        f"({len(new_data) / patch_size:.0f}x smaller)"
+    )
+
+    def download(file_name: str) -> float:
+        download_path = work_root / f"{file_name}.part"
+        patched_path = work_root / "MTGA_Swapper.patched"
+        download_path.unlink(missing_ok=True)
+        RangeRequestHandler.interruptions = 0
+        RangeRequestHandler.bytes_sent = 0
+        started = time.perf_counter()
+        checksum = download_file(f"{base_url}/{file_name}", download_path)
+        if file_name.endswith(".patch"):
+            checksum = apply_patch(
+                str(old_executable), str(download_path), str(patched_path)
+            )
+            download_path = patched_path
+        elapsed = time.perf_counter() - started
+        if checksum != expected_checksum or download_path.read_bytes() != new_data:
+            raise RuntimeError(f"Update from {file_name} doesn't match the release")
+        return elapsed
+
+    with serve_directory(site_directory, RangeRequestHandler) as base_url:
+        results = [
+            summarize("patch create", [create_time], items=release_mb),
+            summarize(
+                "update full",
+                [download("MTGA_Swapper.exe") for _ in range(3)],
+                items=release_mb,
+            ),
+            summarize(
+                "update patch",
+                [download("MTGA_Swapper.patch") for _ in range(3)],
+                items=release_mb,
+            ),
+        ]
+    return results
+
+
+def print_results(results_by_scale: Dict[str, List[Dict]]) -> None:
+    """Print one table row per benchmark and scale."""
+    print()
+    print(
+        f"{'scale':<8} {'benchmark':<20} {'items':>6} {'median ms':>10} "
+        f"{'min ms':>9} {'max ms':>9} {'ms/item':>9}"
+    )
+    for scale, results in results_by_scale.items():
+        for result in results:
+            print(
+                f"{scale:<8} {result['name']:<20} {result['items']:>6} "
+                f"{result['median_ms']:>10.2f} {result['min_ms']:>9.2f} "
+                f"{result['max_ms']:>9.2f} {result['per_item_ms']:>9.3f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MTGA Swapper hot paths")
+    parser.add_argument(
+        "--scales", nargs="+", choices=SCALES, default=list(SCALES), metavar="SCALE"
+    )
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON")
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the generated installs"
+    )
+    arguments = parser.parse_args()
+
+    work_root = Path(tempfile.mkdtemp(prefix="mtga_swapper_bench_"))
+    os.environ["HOME"] = os.environ["USERPROFILE"] = str(work_root / "home")
+    (work_root / "home").mkdir()
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+    results_by_scale = {}
+    try:
+        for scale in arguments.scales:
+            card_count, bundle_count = SCALES[scale]
+            results_by_scale[scale] = run_scale(
+                scale, card_count, bundle_count, work_root
+            )
+        results_by_scale["update"] = run_update_download(work_root)
+        results_by_scale["update"] += run_update_patch(work_root)
+    finally:
+        if arguments.keep:
+            print(f"Installs kept in {work_root}")
+        else:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    print_results(results_by_scale)
+    if arguments.output:
+        arguments.output.write_text(json.dumps(results_by_scale, indent=4))
+
+
+if __name__ == "__main__":
+    main()
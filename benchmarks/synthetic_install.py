@@ -0,0 +1,654 @@
+# Synthetic MTGA install for benchmarks
+# Builds a fake Raw_CardDatabase, Raw_ArtCropDatabase and AssetBundle directory of real
+# UnityFS bundles, laid out like the game so the app's own path logic finds everything
+#
+# Layout:
+#   <root>/MTGA_Data/level0
+#   <root>/MTGA_Data/resources.assets
+#   <root>/MTGA_Data/Downloads/Raw/Raw_CardDatabase_synthetic.mtga
+#   <root>/MTGA_Data/Downloads/Raw/Raw_ArtCropDatabase_synthetic.mtga
+#   <root>/MTGA_Data/Downloads/AssetBundle/<ArtId>_CardArt_<hash>.mtga
+#
+# Usage:
+#   python -m benchmarks.synthetic_install <root> --cards 5000 --bundles 500
+
+import argparse
+import hashlib
+import math
+import random
+import sqlite3
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import UnityPy
+from PIL import Image
+from UnityPy.enums import TextureFormat
+from UnityPy.export import Texture2DConverter
+from UnityPy.helpers import TypeTreeHelper
+from UnityPy.helpers.Tpk import get_typetree_node
+from UnityPy.streams import EndianBinaryReader, EndianBinaryWriter
+
+UNITY_VERSION = "2022.3.42f1"
+UNITY_VERSION_TUPLE = (2022, 3, 42, 1)
+SERIALIZED_FILE_VERSION = 22
+BUILD_TARGET_WINDOWS_64 = 19
+TEXTURE2D_CLASS_ID = 28
+MESH_CLASS_ID = 43
+# Vertex channels of Unity 2019+: position, normal, tangent, color, eight UV sets and
+# two skinning channels; positions, normals and the first UV set are filled in
+MESH_CHANNEL_COUNT = 14
+MESH_VERTEX_LAYOUT = {0: (0, 3), 1: (12, 3), 4: (24, 2)}
+MESH_VERTEX_STRIDE = 32
+
+DEFAULT_TEXTURE_SIZE = (512, 376)
+EXPANSION_CODES = ("DMU", "BRO", "ONE", "MOM", "WOE", "LCI", "MKM", "OTJ", "BLB", "DSK")
+CROP_FORMATS = ("Normal", "Full")
+NAME_WORDS = (
+    "ancient", "blazing", "crimson", "dread", "ember", "feral", "gilded", "hollow",
+    "iron", "jade", "kindled", "lunar", "mire", "noble", "obsidian", "primal",
+    "quiet", "radiant", "storm", "thorn", "umbral", "vexing", "wild", "zealous",
+    "angel", "behemoth", "courier", "drake", "elemental", "familiar", "golem",
+    "herald", "invoker", "juggernaut", "knight", "leviathan", "mystic", "nomad",
+    "oracle", "paladin", "ranger", "sentinel", "tactician", "warden", "wurm",
+)  # fmt: skip
+
+CARDS_SCHEMA = """
+    CREATE TABLE Cards (
+        GrpId INTEGER PRIMARY KEY,
+        ArtId INTEGER,
+        ArtPath TEXT,
+        TitleId INTEGER,
+        InterchangeableTitleId INTEGER,
+        AltTitleId INTEGER,
+        FlavorTextId INTEGER,
+        TypeTextId INTEGER,
+        ArtistCredit TEXT,
+        Rarity INTEGER,
+        ExpansionCode TEXT,
+        DigitalReleaseSet TEXT,
+        IsToken INTEGER,
+        IsPrimaryCard INTEGER,
+        IsDigitalOnly INTEGER,
+        IsRebalanced INTEGER,
+        CollectorNumber TEXT,
+        CollectorMax TEXT,
+        Power TEXT,
+        Toughness TEXT,
+        Colors TEXT,
+        ColorIdentity TEXT,
+        FrameColors TEXT,
+        Types TEXT,
+        Subtypes TEXT,
+        AbilityIds TEXT,
+        LinkedFaceType INTEGER,
+        LinkedFaceGrpIds TEXT,
+        ArtSize INTEGER,
+        Tags TEXT,
+        Order_Title TEXT,
+        Order_CMCWithXLast INTEGER,
+        SubtypeTextId INTEGER
+    );
+    CREATE TABLE Localizations_enUS (
+        LocId INTEGER,
+        Formatted INTEGER,
+        Loc TEXT,
+        PRIMARY KEY (LocId, Formatted)
+    );
+"""
+
+CROPS_SCHEMA = """
+    CREATE TABLE Crops (
+        Path TEXT NOT NULL,
+        Format TEXT NOT NULL,
+        X REAL NOT NULL,
+        Y REAL NOT NULL,
+        Z REAL NOT NULL,
+        W REAL NOT NULL,
+        Generated INTEGER NOT NULL,
+        PRIMARY KEY (Path, Format)
+    );
+"""
+
+
+class SyntheticInstall:
+    """
+    Paths and ids of a generated install.
+
+    Attributes:
+        root: Directory the install was generated in
+        database_path: Raw_CardDatabase file, the path the app asks the user for
+        crop_database_path: Raw_ArtCropDatabase file
+        asset_bundle_directory: AssetBundle directory holding the card art bundles
+        cards: (GrpId, ArtId, ExpansionCode, CollectorNumber, name) of every front face
+        bundle_paths: Bundle file name -> full path
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        data_directory = self.root / "MTGA_Data"
+        self.level0_path = data_directory / "level0"
+        self.resources_path = data_directory / "resources.assets"
+        raw_directory = data_directory / "Downloads" / "Raw"
+        self.database_path = raw_directory / "Raw_CardDatabase_synthetic.mtga"
+        self.crop_database_path = raw_directory / "Raw_ArtCropDatabase_synthetic.mtga"
+        self.asset_bundle_directory = data_directory / "Downloads" / "AssetBundle"
+        self.cards: List[Tuple[int, int, str, str, str]] = []
+        self.bundle_paths: Dict[str, str] = {}
+
+
+def _default_typetree(class_id: int) -> Tuple[object, dict]:
+    """Return the type tree node of a class and a value with every field zeroed."""
+    node = get_typetree_node(class_id, UNITY_VERSION_TUPLE)
+    # Reading zeros gives 0 for numbers, "" for strings and [] for arrays
+    zero_reader = EndianBinaryReader(bytes(4096), endian="<")
+    return node, TypeTreeHelper.read_typetree(
+        node, zero_reader, as_dict=True, check_read=False
+    )
+
+
+def build_texture_object(
+    name: str, image: Image.Image, texture_format: int = TextureFormat.DXT1
+) -> bytes:
+    """
+    Serialize a Texture2D object holding an image.
+
+    Args:
+        name: The texture's m_Name
+        image: Pixels of the texture
+        texture_format: Unity TextureFormat the pixels are encoded to
+
+    Returns:
+        Object data as stored in a serialized file
+    """
+    node, texture = _default_typetree(TEXTURE2D_CLASS_ID)
+    image_data, encoded_format = Texture2DConverter.image_to_texture2d(
+        image, texture_format, BUILD_TARGET_WINDOWS_64
+    )
+    texture.update(
+        {
+            "m_Name": name,
+            "m_Width": image.width,
+            "m_Height": image.height,
+            "m_CompleteImageSize": len(image_data),
+            "m_TextureFormat": int(encoded_format),
+            "m_MipCount": 1,
+            "m_ImageCount": 1,
+            "m_TextureDimension": 2,
+            "m_ColorSpace": 1,
+            "image data": image_data,
+        }
+    )
+    writer = EndianBinaryWriter(endian="<")
+    TypeTreeHelper.write_typetree(texture, node, writer)
+    return writer.bytes
+
+
+def build_mesh_object(name: str, segments: int) -> bytes:
+    """
+    Serialize a Mesh object holding a UV sphere, like a 3D pet or cosmetic.
+
+    Args:
+        name: The mesh's m_Name
+        segments: Rings and slices of the sphere; (segments + 1) ** 2 vertices
+
+    Returns:
+        Object data as stored in a serialized file
+    """
+    node, mesh = _default_typetree(MESH_CLASS_ID)
+    vertex_data = bytearray()
+    for ring in range(segments + 1):
+        polar = math.pi * ring / segments
+        for slice_index in range(segments + 1):
+            azimuth = 2 * math.pi * slice_index / segments
+            normal = (
+                math.sin(polar) * math.cos(azimuth),
+                math.cos(polar),
+                math.sin(polar) * math.sin(azimuth),
+            )
+            vertex_data += struct.pack(
+                "<8f",
+                *normal,
+                *normal,
+                slice_index / segments,
+                1 - ring / segments,
+            )
+    vertex_count = (segments + 1) ** 2
+
+    indices = []
+    for ring in range(segments):
+        for slice_index in range(segments):
+            first = ring * (segments + 1) + slice_index
+            second = first + segments + 1
+            indices += (first, second, first + 1, second, second + 1, first + 1)
+    use_32_bit_indices = vertex_count > 0xFFFF
+    index_buffer = struct.pack(
+        f"<{len(indices)}{'I' if use_32_bit_indices else 'H'}", *indices
+    )
+
+    mesh.update(
+        {
+            "m_Name": name,
+            "m_SubMeshes": [
+                {
+                    "firstByte": 0,
+                    "indexCount": len(indices),
+                    "topology": 0,
+                    "baseVertex": 0,
+                    "firstVertex": 0,
+                    "vertexCount": vertex_count,
+                    "localAABB": {
+                        "m_Center": {"x": 0.0, "y": 0.0, "z": 0.0},
+                        "m_Extent": {"x": 1.0, "y": 1.0, "z": 1.0},
+                    },
+                }
+            ],
+            "m_IndexFormat": int(use_32_bit_indices),
+            "m_IndexBuffer": index_buffer,
+            "m_IsReadable": True,
+            "m_VertexData": {
+                "m_VertexCount": vertex_count,
+                "m_Channels": [
+                    {
+                        "stream": 0,
+                        "offset": MESH_VERTEX_LAYOUT.get(channel, (0, 0))[0],
+                        "format": 0,
+                        "dimension": MESH_VERTEX_LAYOUT.get(channel, (0, 0))[1],
+                    }
+                    for channel in range(MESH_CHANNEL_COUNT)
+                ],
+                "m_DataSize": bytes(vertex_data),
+            },
+        }
+    )
+    writer = EndianBinaryWriter(endian="<")
+    TypeTreeHelper.write_typetree(mesh, node, writer)
+    return writer.bytes
+
+
+def build_serialized_file(objects: List[Tuple[int, int, bytes]]) -> bytes:
+    """
+    Build a version 22 serialized file without embedded type trees.
+
+    UnityPy falls back to its bundled type trees for the Unity version, like it
+    does for the game's own files.
+
+    Args:
+        objects: (path_id, class_id, object data) of every object
+
+    Returns:
+        Serialized file bytes
+    """
+    class_ids = sorted({class_id for _, class_id, _ in objects})
+    metadata = EndianBinaryWriter(endian="<")
+    metadata.write_string_to_null(UNITY_VERSION)
+    metadata.write_int(BUILD_TARGET_WINDOWS_64)
+    metadata.write_boolean(False)  # no embedded type trees
+    metadata.write_int(len(class_ids))
+    for class_id in class_ids:
+        metadata.write_int(class_id)
+        metadata.write_boolean(False)  # stripped
+        metadata.write_short(-1)  # script type index
+        metadata.write_bytes(bytes(16))  # type hash
+
+    object_data = EndianBinaryWriter(endian="<")
+    metadata.write_int(len(objects))
+    for path_id, class_id, data in objects:
+        # The header is 48 bytes, so aligning the metadata aligns the file position
+        metadata.align_stream(4)
+        metadata.write_long(path_id)
+        metadata.write_long(object_data.Position)
+        metadata.write_u_int(len(data))
+        metadata.write_int(class_ids.index(class_id))
+        object_data.write_bytes(data)
+        object_data.align_stream(8)
+    metadata.write_int(0)  # script types
+    metadata.write_int(0)  # externals
+    metadata.write_int(0)  # ref types
+    metadata.write_string_to_null("")  # user information
+
+    header_size = 48
+    data_offset = header_size + metadata.Length
+    data_offset += (16 - data_offset % 16) % 16
+    writer = EndianBinaryWriter(endian=">")
+    writer.write_u_int(0)
+    writer.write_u_int(0)
+    writer.write_u_int(SERIALIZED_FILE_VERSION)
+    writer.write_u_int(0)
+    writer.write_boolean(False)  # little endian
+    writer.write_bytes(bytes(3))
+    writer.write_u_int(metadata.Length)
+    writer.write_long(data_offset + object_data.Length)
+    writer.write_long(data_offset)
+    writer.write_long(0)
+    writer.write_bytes(metadata.bytes)
+    writer.align_stream(16)
+    writer.write_bytes(object_data.bytes)
+    return writer.bytes
+
+
+def build_unity_bundle(cab_name: str, serialized_file: bytes) -> bytes:
+    """
+    Wrap a serialized file in an uncompressed UnityFS bundle.
+
+    Args:
+        cab_name: Name of the serialized file inside the bundle
+        serialized_file: Bytes from build_serialized_file
+
+    Returns:
+        Bundle bytes
+    """
+    blocks_info = EndianBinaryWriter(endian=">")
+    blocks_info.write_bytes(bytes(16))  # uncompressed data hash
+    blocks_info.write_int(1)
+    blocks_info.write_u_int(len(serialized_file))
+    blocks_info.write_u_int(len(serialized_file))
+    blocks_info.write_u_short(0)  # no compression
+    blocks_info.write_int(1)
+    blocks_info.write_long(0)
+    blocks_info.write_long(len(serialized_file))
+    blocks_info.write_u_int(4)  # serialized file node
+    blocks_info.write_string_to_null(cab_name)
+
+    writer = EndianBinaryWriter(endian=">")
+    writer.write_string_to_null("UnityFS")
+    writer.write_u_int(8)
+    writer.write_string_to_null("5.x.x")
+    writer.write_string_to_null(UNITY_VERSION)
+    size_position = writer.Position
+    writer.write_long(0)
+    writer.write_u_int(blocks_info.Length)
+    writer.write_u_int(blocks_info.Length)
+    writer.write_u_int(0x40)  # blocks info and directory combined
+    writer.align_stream(16)
+    writer.write_bytes(blocks_info.bytes)
+    writer.write_bytes(serialized_file)
+
+    bundle = bytearray(writer.bytes)
+    bundle[size_position : size_position + 8] = struct.pack(">q", len(bundle))
+    return bytes(bundle)
+
+
+def write_texture_bundle(
+    bundle_file_path: Path,
+    textures: List[Tuple[str, Image.Image]],
+    texture_format: int = TextureFormat.DXT1,
+    compress: bool = True,
+) -> None:
+    """
+    Write a bundle holding one Texture2D per image.
+
+    Args:
+        bundle_file_path: Output file
+        textures: (m_Name, image) of every texture
+        texture_format: Unity TextureFormat of the textures
+        compress: Repack with LZ4 like the game's bundles
+    """
+    objects = [
+        (path_id, TEXTURE2D_CLASS_ID, build_texture_object(name, image, texture_format))
+        for path_id, (name, image) in enumerate(textures, start=1)
+    ]
+    cab_name = "CAB-" + hashlib.md5(bundle_file_path.name.encode()).hexdigest()
+    bundle = build_unity_bundle(cab_name, build_serialized_file(objects))
+    if compress:
+        bundle = UnityPy.load(bundle).file.save(packer="lz4")
+    bundle_file_path.write_bytes(bundle)
+
+
+def write_mesh_bundle(
+    bundle_file_path: Path, meshes: List[Tuple[str, int]], compress: bool = True
+) -> None:
+    """
+    Write a bundle holding one sphere Mesh per entry.
+
+    Args:
+        bundle_file_path: Output file
+        meshes: (m_Name, segments) of every mesh
+        compress: Repack with LZ4 like the game's bundles
+    """
+    objects = [
+        (path_id, MESH_CLASS_ID, build_mesh_object(name, segments))
+        for path_id, (name, segments) in enumerate(meshes, start=1)
+    ]
+    cab_name = "CAB-" + hashlib.md5(bundle_file_path.name.encode()).hexdigest()
+    bundle = build_unity_bundle(cab_name, build_serialized_file(objects))
+    if compress:
+        bundle = UnityPy.load(bundle).file.save(packer="lz4")
+    bundle_file_path.write_bytes(bundle)
+
+
+def make_card_art(seed: int, size: Tuple[int, int]) -> Image.Image:
+    """
+    Draw a deterministic card art stand-in with gradients, so it compresses like art.
+
+    Args:
+        seed: Seed for the colors
+        size: Tuple of (width, height)
+
+    Returns:
+        RGB image
+    """
+    rng = random.Random(seed)
+    gradient = Image.radial_gradient("L").resize(size)
+    linear = Image.linear_gradient("L").resize(size)
+    colors = [
+        Image.new("L", size, rng.randrange(256)).point(
+            lambda value, bias=rng.randrange(64): (value + bias) % 256
+        )
+        for _ in range(3)
+    ]
+    return Image.merge(
+        "RGB",
+        (
+            Image.blend(gradient, colors[0], 0.5),
+            Image.blend(linear, colors[1], 0.5),
+            Image.blend(gradient.rotate(90), colors[2], 0.5),
+        ),
+    )
+
+
+def make_card_name(rng: random.Random) -> str:
+    """Return a random two or three word card name."""
+    word_count = rng.choice((2, 2, 3))
+    return " ".join(rng.choice(NAME_WORDS).capitalize() for _ in range(word_count))
+
+
+def create_card_database(
+    database_path: Path, card_count: int, art_ids: List[int], seed: int = 0
+) -> List[Tuple[int, int, str, str, str]]:
+    """
+    Create a Raw_CardDatabase with realistic columns and English localizations.
+
+    Every 25th card gets a back face, and art ids are shared round robin so some
+    cards have alternate arts.
+
+    Args:
+        database_path: Output SQLite file
+        card_count: Number of front faces
+        art_ids: ArtIds to assign
+        seed: Random seed
+
+    Returns:
+        (GrpId, ArtId, ExpansionCode, CollectorNumber, name) of every front face
+    """
+    rng = random.Random(seed)
+    database_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(database_path)
+    connection.executescript(CARDS_SCHEMA)
+
+    card_rows = []
+    localization_rows = []
+    cards = []
+    next_grp_id = 70000
+    next_loc_id = 100000
+    for card_index in range(card_count):
+        name = make_card_name(rng)
+        grp_id = next_grp_id
+        art_id = art_ids[card_index % len(art_ids)]
+        expansion_code = EXPANSION_CODES[card_index % len(EXPANSION_CODES)]
+        collector_number = str(card_index // len(EXPANSION_CODES) + 1)
+        title_id, flavor_id, type_id, subtype_id = range(next_loc_id, next_loc_id + 4)
+        next_grp_id += 1
+        next_loc_id += 4
+        has_back_face = card_index % 25 == 24
+        colors = ",".join(sorted(rng.sample("12345", rng.randint(0, 2))))
+        card_rows.append(
+            (
+                grp_id, art_id, "", title_id, 0, 0, flavor_id, type_id,
+                f"Artist {rng.randrange(400)}", rng.randrange(5), expansion_code,
+                expansion_code, 0, 1, 0, 0, collector_number, "300",
+                str(rng.randrange(8)), str(rng.randrange(8)), colors, colors,
+                colors, "2", "", ",".join(str(rng.randrange(1, 200000)) for _ in range(2)),
+                1 if has_back_face else 0, "", 1, "",
+                "".join(character for character in name.lower() if character.isalnum()),
+                rng.randrange(8), subtype_id,
+            )
+        )  # fmt: skip
+        localization_rows += [
+            (title_id, 0, name),
+            (flavor_id, 1, f"<i>{make_card_name(rng)} remembers.</i>"),
+            (type_id, 0, "Creature"),
+            (subtype_id, 0, name.split()[-1]),
+        ]
+        cards.append((grp_id, art_id, expansion_code, collector_number, name))
+
+        if has_back_face:
+            back_title_id = next_loc_id
+            next_loc_id += 1
+            back_name = make_card_name(rng)
+            card_rows.append(
+                (
+                    next_grp_id, art_id, "", back_title_id, 0, 0, 0, type_id,
+                    "", 0, expansion_code, expansion_code, 0, 0, 0, 0,
+                    collector_number, "300", "", "", colors, colors, colors, "2",
+                    "", "", 2, str(grp_id), 1, "", "", 0, 0,
+                )
+            )  # fmt: skip
+            localization_rows.append((back_title_id, 0, back_name))
+            next_grp_id += 1
+
+    placeholders = ",".join("?" * len(card_rows[0]))
+    connection.executemany(f"INSERT INTO Cards VALUES ({placeholders})", card_rows)
+    connection.executemany(
+        "INSERT INTO Localizations_enUS VALUES (?, ?, ?)", localization_rows
+    )
+    connection.commit()
+    connection.close()
+    return cards
+
+
+def create_art_crop_database(crop_database_path: Path, art_ids: List[int]) -> None:
+    """
+    Create a Raw_ArtCropDatabase with one crop per ArtId and format.
+
+    Args:
+        crop_database_path: Output SQLite file
+        art_ids: ArtIds to create crops for
+    """
+    crop_database_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(crop_database_path)
+    connection.executescript(CROPS_SCHEMA)
+    crop_rows = []
+    for art_id in art_ids:
+        art_id_padded = str(art_id).zfill(6)
+        path = f"Assets/Core/CardArt/{art_id_padded[:3]}000/{art_id_padded}_AIF"
+        for crop_format in CROP_FORMATS:
+            crop_rows.append((path, crop_format, 1.0, 0.9035433, 0.0, 0.04822835, 1))
+    connection.executemany("INSERT INTO Crops VALUES (?, ?, ?, ?, ?, ?, ?)", crop_rows)
+    connection.commit()
+    connection.close()
+
+
+def create_synthetic_install(
+    root: Path,
+    card_count: int = 2000,
+    bundle_count: int = 100,
+    texture_size: Tuple[int, int] = DEFAULT_TEXTURE_SIZE,
+    textures_per_bundle: int = 1,
+    seed: int = 0,
+) -> SyntheticInstall:
+    """
+    Generate a fake MTGA install.
+
+    Args:
+        root: Directory to create the install in
+        card_count: Number of cards in the card database
+        bundle_count: Number of card art bundles, one per ArtId
+        texture_size: Tuple of (width, height) of each card art
+        textures_per_bundle: Textures per bundle; extras are smaller variants
+        seed: Random seed, the same seed always produces the same install
+
+    Returns:
+        SyntheticInstall describing the generated files
+    """
+    install = SyntheticInstall(root)
+    for directory in (
+        install.database_path.parent,
+        install.asset_bundle_directory,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    # configure_unity_version reads the version from bytes 40-60 of level0
+    install.level0_path.write_bytes(
+        b"#" * 40 + UNITY_VERSION.encode().ljust(20, b"\x00") + bytes(1024)
+    )
+
+    art_ids = [400000 + art_index * 7 for art_index in range(bundle_count)]
+    install.cards = create_card_database(
+        install.database_path, card_count, art_ids, seed
+    )
+    create_art_crop_database(install.crop_database_path, art_ids)
+
+    for art_id in art_ids:
+        bundle_name = (
+            f"{str(art_id).zfill(6)}_CardArt_"
+            f"{hashlib.md5(f'{seed}-{art_id}'.encode()).hexdigest()}.mtga"
+        )
+        card_art = make_card_art(seed * 100003 + art_id, texture_size)
+        textures = [(f"{str(art_id).zfill(6)}_AIF", card_art)]
+        for extra_index in range(1, textures_per_bundle):
+            extra_size = (
+                max(texture_size[0] >> extra_index, 4),
+                max(texture_size[1] >> extra_index, 4),
+            )
+            textures.append(
+                (
+                    f"{str(art_id).zfill(6)}_AIF_{extra_index}",
+                    card_art.resize(extra_size),
+                )
+            )
+        bundle_file_path = install.asset_bundle_directory / bundle_name
+        write_texture_bundle(bundle_file_path, textures)
+        install.bundle_paths[bundle_name] = str(bundle_file_path)
+
+    write_texture_bundle(
+        install.resources_path,
+        [("UI_Atlas", make_card_art(seed, (256, 256)))],
+        TextureFormat.DXT5,
+    )
+    return install
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic MTGA install")
+    parser.add_argument("root", type=Path, help="Directory to create the install in")
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--bundles", type=int, default=100)
+    parser.add_argument("--textures-per-bundle", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    install = create_synthetic_install(
+        arguments.root,
+        arguments.cards,
+        arguments.bundles,
+        textures_per_bundle=arguments.textures_per_bundle,
+        seed=arguments.seed,
+    )
+    print(f"Card database: {install.database_path}")
+    print(f"Art crop database: {install.crop_database_path}")
+    print(f"{len(install.bundle_paths)} bundles in {install.asset_bundle_directory}")
+
+
+if __name__ == "__main__":
+    main()
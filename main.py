@@ -1,18 +1,30 @@
 # MTGA Swapper - A tool for swapping Magic: The Gathering Arena card arts
 # Main application module containing the GUI and core functionality
 # fmt: off
+import multiprocessing
+
+# Worker processes of the packaged exe re-enter here; let them run their task and exit
+multiprocessing.freeze_support()
+
 from pathlib import Path
 from src.sql_editor import (
+    capture_baseline,
     save_grp_id_info,
     change_grp_id,
     fetch_all_data,
     save_loc_id_info,
+    fetch_card_list,
     json,
     find_mtga_db_path
 )
+from src.backup_store import (
+    BACKUP_DIRECTORY,
+    backup_bundle,
+    describe_restore_plan,
+    plan_restore,
+)
 import sys
 import os
-import shutil
 
 def get_resource_path(relative_path: str) -> str:
     """
@@ -36,7 +48,7 @@ user_config_directory.mkdir(exist_ok=True)
 user_config_file_path = user_config_directory / "config.json"
 user_save_changes_path = user_config_directory / "changes.json"
 update_path = user_config_directory / "update.json"
-backup_directory = Path.home() / "MTGA_Swapper_Backups"
+backup_directory = BACKUP_DIRECTORY
 backup_directory.mkdir(exist_ok=True)
 
 
@@ -59,11 +71,11 @@ with open(get_resource_path("update.json"), "r") as source_config:
 
 print(f"MTGA Swapper Version: {version if version else 'v0.0.0'}")
 
-from src.updater import main as check_for_updates
-if check_for_updates(update_path):
-    sys.exit(0)
+from src.updater import get_remote_info, offer_update
 import src.sql_editor as database_manager
 from random import randint
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from src.upscaler import is_upscaling_available
 
@@ -72,7 +84,30 @@ if is_upscaling_available:
     from src.upscaler import upscale_card_image
 
 from src.decklist import create_decklist_import_window, create_search_tokens_window
-from src.card_models import MTGACard, format_card_display, sort_cards_by_attribute
+from src.localization import (
+    CARD_LOCALIZATION_FIELDS,
+    LocalizationStore,
+    get_localization_languages,
+    import_localization_pack,
+)
+from src.token_search import (
+    TOKEN_PAGE_SIZE,
+    TOKEN_PREVIEW_EVENT,
+    TOKEN_PREVIEW_SIZE,
+    TOKEN_PREVIEW_WORKERS,
+    build_artist_index,
+    find_art_bundle,
+    get_token_preview,
+    list_art_bundles,
+    queue_token_previews,
+)
+from src.card_models import (
+    MTGACard,
+    build_card_name_index,
+    filter_card_list,
+    filter_cards_by_names,
+    sort_cards_by_attribute,
+)
 from src.gui_utils import (
     open_file_dialog,
     open_directory_dialog,
@@ -82,9 +117,38 @@ from src.set_swapper import create_set_swap_window, generate_swap_file, perform_
 import io
 from src.image_utils import (
     remove_alpha_channel,
-    resize_image_to_screen,
     adjust_image_aspect_ratio,
     resize_image_for_gallery,
+    get_display_frame,
+    clear_display_frames,
+)
+from src.texture_memory import (
+    DEFAULT_TEXTURE_MEMORY_BUDGET_MB,
+    describe_texture_memory_footprint,
+    set_texture_memory_budget,
+)
+from src.bundle_export import start_bulk_export
+from src.mesh_export import DEFAULT_MESH_EXPORT_FORMAT, MESH_EXPORT_FORMATS
+from src.asset_index import (
+    ASSET_INDEX_PATH,
+    open_asset_index,
+    search_asset_index,
+    start_asset_index_update,
+)
+from src.bundle_writer import (
+    BUNDLE_COMPRESSIONS,
+    DEFAULT_BUNDLE_COMPRESSION,
+    set_bundle_compression,
+)
+from src.thumbnail_cache import (
+    GALLERY_PAGE_SIZE,
+    GALLERY_THUMBNAIL_EVENT,
+    THUMBNAIL_WORKERS,
+    get_bundle_cache_directory,
+    load_texture_order,
+    queue_gallery_thumbnails,
+    save_texture_order,
+    texture_decode_lock,
 )
 from src.unity_bundle import (
     load_unity_bundle,
@@ -93,10 +157,13 @@ from src.unity_bundle import (
     convert_texture_to_bytes,
     save_image_to_file,
     extract_textures_from_bundle,
+    get_texture_by_path_id,
     replace_texture_in_bundle,
+    restore_textures_in_bundle,
     configure_unity_version,
     export_3d_meshes,
 )
+from src.startup import load_startup_database, preload_modules, run_in_background
 from webbrowser import open as open_webbrowser
 import FreeSimpleGUI as sg
 from tkinter import Tk
@@ -115,120 +182,53 @@ sg.theme("DarkBlue3")
 
 # Initialize variables for database connection
 database_cursor = None
-get_cards_query = """
-    SELECT 
-        CASE 
-            WHEN NULLIF(c1.Order_Title, '') IS NOT NULL THEN c1.Order_Title
-            WHEN NULLIF(c1.Order_Title, '') IS NULL 
-                AND NULLIF(c2.Order_Title, '') IS NOT NULL THEN c2.Order_Title || '-flip-side'
-        END AS Order_Title,
-        c1.ExpansionCode,
-        c1.ArtSize,
-        c1.GrpId,
-        c1.ArtId
-    FROM Cards c1
-    LEFT JOIN Cards c2
-        ON c1.LinkedFaceGrpIds = c2.GrpId
-    AND NULLIF(c2.Order_Title, '') IS NOT NULL
-    WHERE NULLIF(c1.Order_Title, '') IS NOT NULL
-    OR NULLIF(c2.Order_Title, '') IS NOT NULL;
-"""
 database_connection = None
 database_file_path = None
 all_cards_formatted = ["Select a database first"]
 displayed_cards = ["Select a database first"]
 image_save_directory = None
 is_alternate = False
-database_file_path = find_mtga_db_path()
+filtered_search_results = displayed_cards
+asset_bundle_directory = None
 lands_set = ("island", "forest", "mountain", "plains", "wastes", "swamp", "snowcoveredforest", "snowcoveredisland", "snowcoveredmountain", "snowcoveredplains", "snowcoveredswamp")
-# Load configuration from file or initialize with defaults
-if (
-    database_file_path or sg.popup_yes_no(
-        "Do you want to load from config file?",
-        title="Load Config",
+# Load configuration from file; the database is found and loaded once the window is up
+with open(user_config_file_path, "r") as config_file:
+    try:
+        user_config = sg.json.loads(config_file.read())
+    except sg.json.JSONDecodeError:
+        sg.popup_error("Error loading config file", auto_close_duration=3)
+        user_config = {"SavePath": "", "DatabasePath": ""}
+
+# Limit how much decoded texture data the editors keep around
+try:
+    set_texture_memory_budget(
+        user_config.get("TextureMemoryBudgetMB") or DEFAULT_TEXTURE_MEMORY_BUDGET_MB
     )
-    == "Yes"
-):
-    # Load existing configuration
-    with open(user_config_file_path, "r") as config_file:
-        try:
-            user_config = sg.json.loads(config_file.read())
-        except sg.json.JSONDecodeError:
-            sg.popup_error("Error loading config file", auto_close_duration=3)
-            user_config = {"SavePath": "", "DatabasePath": ""}
-        image_save_directory = (
-            user_config["SavePath"] if user_config["SavePath"] else None
-        )
+except (TypeError, ValueError):
+    print("Invalid TextureMemoryBudgetMB in config, using the default")
 
-        # Validate and load database if path exists
-        if database_file_path or user_config["DatabasePath"] != "" and os.path.exists(
-            user_config["DatabasePath"]
-        ):
-            if not database_file_path:
-                database_file_path = user_config["DatabasePath"]
-            try:
-                # Initialize database connection
-                database_cursor, database_connection, database_file_path = (
-                    database_manager.create_database_connection(database_file_path)
-                )
-
-                # Query all cards from database with proper formatting
-                all_cards_formatted = list(
-                    map(
-                        format_card_display,
-                        sorted(
-                            database_cursor.execute(
-                                get_cards_query
-                            ).fetchall()
-                        ),
-                    )
-                )
-            except (
-                database_manager.sqlite3.OperationalError,
-                database_manager.sqlite3.DatabaseError,
-                TypeError,
-            ):
-                sg.popup_error(
-                    "Missing or incorrect database selected", auto_close_duration=3
-                )
-                database_file_path = None
-                all_cards_formatted = ["Select a database first"]
-
-            displayed_cards = all_cards_formatted
-            filtered_search_results = displayed_cards
-            if not image_save_directory:
-                image_save_directory = sg.popup_get_folder("Select Image Save Folder")
-            asset_bundle_directory = (
-                os.path.dirname(database_file_path)[0:-3] + "AssetBundle"
-            )
-            configure_unity_version(database_file_path, "2022.3.42f1")
-            if image_save_directory and database_file_path:
-                with open(user_config_file_path, "w") as config_file:
-                    user_config["SavePath"] = str(Path(image_save_directory).as_posix())
-                    user_config["DatabasePath"] = str(Path(database_file_path).as_posix())
-                    config_file.write(sg.json.dumps(user_config, indent=4))
-        else:
-            database_file_path = None
-            all_cards_formatted = ["Select a database first"]
-            displayed_cards = ["Select a database first"]
-            sg.popup_error(
-                "Invalid or missing database file. Please select a valid .mtga file.",
-                auto_close_duration=3,
-            )
-            
-else:
-    # Initialize with empty configuration
-    user_config = {"SavePath": None, "DatabasePath": None}
-    image_save_directory = None
-    database_file_path = None
-    all_cards_formatted = ["Select a database first"]
-    displayed_cards = ["Select a database first"]
+# Block compression of the bundles this tool writes
+try:
+    set_bundle_compression(
+        user_config.get("BundleCompression") or DEFAULT_BUNDLE_COMPRESSION
+    )
+except (TypeError, ValueError):
+    print(
+        f"Invalid BundleCompression in config, use one of {', '.join(BUNDLE_COMPRESSIONS)}"
+    )
 
 # Initialize card swap variables and deck filtering state
 first_card_to_swap, second_card_to_swap = None, None
 current_search_input = ""
 is_using_decklist_filter = False
+# Names from every loaded decklist, and how many decklists were combined into it
 cards_from_imported_deck = None
+imported_decklist_count = 0
+# Card name -> positions in all_cards_formatted, rebuilt whenever the card list loads
+card_name_index = {}
+# Token artist index and localized text of the loaded database
+artist_index = None
+localization_store = None
 
 
 # Create main GUI layout
@@ -391,12 +391,102 @@ main_window = sg.Window(
     relative_location=(0, 0),
 )
 
+# Slow startup work runs in the background and reports back through window events,
+# so the window can be used while the update check and card list load finish
+run_in_background(main_window, get_remote_info, "-UPDATE_INFO-", "-UPDATE_CHECK_FAILED-")
+run_in_background(main_window, find_mtga_db_path, "-DATABASE_DETECTED-")
+preload_modules()
+
 # Main GUI Event Loop
 while True:
     event, values = main_window.read()
     if event in (sg.WIN_CLOSED, "Exit"):
         break
 
+    if event == "-UPDATE_INFO-":
+        if offer_update(update_path, values[event]):
+            break
+        continue
+
+    if event == "-UPDATE_CHECK_FAILED-":
+        sg.popup_error(
+            f"Failed to fetch update info: {values[event]}", title="Update Check Failed"
+        )
+        continue
+
+    # Startup database: auto-detected, or taken from the config file if the user agrees.
+    # A database the user already selected by hand wins over the startup one
+    if event == "-DATABASE_DETECTED-" and database_connection is None:
+        startup_database_path = values[event]
+        if startup_database_path or sg.popup_yes_no(
+            "Do you want to load from config file?",
+            title="Load Config",
+        ) == "Yes":
+            image_save_directory = user_config.get("SavePath") or None
+            if not startup_database_path and user_config.get("DatabasePath") and os.path.exists(
+                user_config["DatabasePath"]
+            ):
+                startup_database_path = user_config["DatabasePath"]
+
+            if startup_database_path:
+                main_window["-CARD_LIST-"].update(["Loading cards..."])
+                run_in_background(
+                    main_window,
+                    partial(load_startup_database, startup_database_path, "2022.3.42f1"),
+                    "-CARD_LIST_LOADED-",
+                    "-CARD_LIST_FAILED-",
+                )
+            else:
+                sg.popup_error(
+                    "Invalid or missing database file. Please select a valid .mtga file.",
+                    auto_close_duration=3,
+                )
+        else:
+            # Start without the saved configuration
+            user_config = {"SavePath": None, "DatabasePath": None}
+            image_save_directory = None
+        continue
+
+    if event == "-CARD_LIST_FAILED-" and database_connection is None:
+        sg.popup_error(
+            "Missing or incorrect database selected", auto_close_duration=3
+        )
+        main_window["-CARD_LIST-"].update(displayed_cards)
+        continue
+
+    if event == "-CARD_LIST_LOADED-" and database_connection is None:
+        database_file_path, all_cards_formatted, card_name_index, artist_index = values[event]
+        database_cursor, database_connection, database_file_path = (
+            database_manager.create_database_connection(database_file_path)
+        )
+        localization_store = LocalizationStore(database_cursor)
+        displayed_cards = all_cards_formatted
+        filtered_search_results = displayed_cards
+        main_window["-CARD_LIST-"].update(displayed_cards)
+        # Let the search below re-apply anything typed while the cards were loading
+        current_search_input = ""
+
+        if not image_save_directory:
+            image_save_directory = sg.popup_get_folder("Select Image Save Folder")
+        asset_bundle_directory = (
+            os.path.dirname(database_file_path)[0:-3] + "AssetBundle"
+        )
+        if image_save_directory and database_file_path:
+            with open(user_config_file_path, "w") as config_file:
+                user_config["SavePath"] = str(Path(image_save_directory).as_posix())
+                user_config["DatabasePath"] = str(Path(database_file_path).as_posix())
+                config_file.write(sg.json.dumps(user_config, indent=4))
+
+        main_window["-CHANGE_ASSETS-"].update(
+            "Change Sleeves, Avatars, etc.", disabled=False
+        )
+        main_window["-SET_SWAPPER-"].update(disabled=False)
+        main_window["DATABASE_DISPLAY"].update("Database: " + database_file_path)
+        main_window["IMAGE_SAVE_DISPLAY"].update(
+            "Image Save Location: "
+            + (image_save_directory if image_save_directory else "None")
+        )
+
     if event == "-JOIN_DISCORD-":
         open_webbrowser("https://discord.gg/339qjyVc8C")
         continue
@@ -416,7 +506,15 @@ while True:
         )
         if preset_path == "" or preset_path is None:
             continue
-        change_grp_id(preset_path, database_cursor, database_connection, None, asset_bundle_directory)
+        # Dry run: show how much bundle data will be restored before touching anything
+        restore_plan = plan_restore(asset_bundle_directory)
+        if restore_plan and sg.popup_yes_no(
+            describe_restore_plan(restore_plan, max_listed=20)
+            + "\n\nContinue applying the preset?",
+            title="Restore Backups",
+        ) != "Yes":
+            continue
+        change_grp_id(preset_path, database_cursor, database_connection, None, asset_bundle_directory, restore_plan)
 
         sg.popup_auto_close("Preset loaded successfully!", auto_close_duration=1)
     if event == "-EXPORT_PRESET-":
@@ -548,6 +646,70 @@ while True:
                         )
                     except Exception as e:
                         sg.popup_error(f"Error applying localizations: {e}")
+                if swap_event == "-IMPORT_LOC_PACK-":
+                    if not database_file_path:
+                        sg.popup_error(
+                            "Please select a database first", auto_close_duration=3
+                        )
+                        continue
+                    pack_path = sg.popup_get_file(
+                        "Select a localization pack (LocId, Formatted, Loc)",
+                        file_types=(("Localization Packs", "*.csv *.json"),),
+                    )
+                    if not pack_path:
+                        continue
+                    languages = get_localization_languages(database_cursor)
+                    language = sg.popup_get_text(
+                        f"Language to import into ({', '.join(languages)})",
+                        default_text="enUS" if "enUS" in languages else languages[0],
+                        title="Localization Language",
+                    ) if languages else None
+                    if not language:
+                        continue
+                    try:
+                        # Dry run first, so the changes can be reviewed
+                        report = import_localization_pack(
+                            database_cursor, pack_path, language.strip(), dry_run=True
+                        )
+                        diff_lines = [
+                            f"{loc_id}{'' if row_formatted is None else f' (Formatted {row_formatted})'}:\n"
+                            f"- {current_text}\n+ {new_text}"
+                            for loc_id, row_formatted, current_text, new_text in report["diff"]
+                        ]
+                        if report["changed"] > len(report["diff"]):
+                            diff_lines.append(
+                                f"... and {report['changed'] - len(report['diff'])} more"
+                            )
+                        summary = (
+                            f"{report['rows']} row(s) read: {report['changed']} changed, "
+                            f"{report['unchanged']} unchanged, "
+                            f"{report['missing']} not in the database, "
+                            f"{report['invalid']} invalid row(s) skipped."
+                        )
+                        if report["errors"]:
+                            diff_lines = [*report["errors"], "", *diff_lines]
+                        if not report["changed"]:
+                            sg.popup_ok(summary, title="Nothing to Import")
+                            continue
+                        sg.popup_scrolled(
+                            summary, "", *diff_lines,
+                            title="Localization Pack Preview", size=(90, 25),
+                        )
+                        if sg.popup_yes_no(
+                            f"Write {report['changed']} localization change(s)?",
+                            title="Confirm Import",
+                        ) != "Yes":
+                            continue
+                        report = import_localization_pack(
+                            database_cursor, pack_path, language.strip()
+                        )
+                        sg.popup_ok(
+                            f"{report['written']} localization row(s) updated in "
+                            f"{report['elapsed']:.2f}s ({report['rows_per_second']:.0f} rows/s).",
+                            title="Localization Pack Imported",
+                        )
+                    except Exception as e:
+                        sg.popup_error(f"Error importing localization pack: {e}")
 
         finally:
             swap_window.close()
@@ -565,16 +727,10 @@ while True:
                 database_manager.create_database_connection(database_file_path)
             )
 
-            all_cards_formatted = list(
-                map(
-                    format_card_display,
-                    sorted(
-                        database_cursor.execute(
-                            get_cards_query
-                        ).fetchall()
-                    ),
-                )
-            )
+            all_cards_formatted = fetch_card_list(database_cursor)
+            card_name_index = build_card_name_index(all_cards_formatted)
+            artist_index = build_artist_index(database_cursor)
+            localization_store = LocalizationStore(database_cursor)
             displayed_cards = all_cards_formatted
         except (
             database_manager.sqlite3.OperationalError,
@@ -617,43 +773,107 @@ while True:
 
     if event == "-SEARCH_TOKENS-":
         if database_cursor is not None:
-            window_tokens = create_search_tokens_window(database_cursor)
+            token_placeholder_bytes = convert_pil_image_to_bytes(
+                Image.new("RGB", TOKEN_PREVIEW_SIZE, (64, 64, 64))
+            )
+            window_tokens = create_search_tokens_window(token_placeholder_bytes, TOKEN_PAGE_SIZE)
+            # Listed once per window so every preview and click finds its bundle without a directory scan
+            token_bundle_names = list_art_bundles(asset_bundle_directory)
+            token_results = []
+            token_page = 0
+            token_previews = {}
+            pending_token_previews = []
+            token_preview_executor = ThreadPoolExecutor(max_workers=TOKEN_PREVIEW_WORKERS)
             while True:
                 event_token, values_token = window_tokens.read()
                 if event_token == sg.WINDOW_CLOSED or event_token == "-CANCEL_BUTTON-":
+                    token_preview_executor.shutdown(wait=False, cancel_futures=True)
+                    window_tokens.close()
                     break
                 elif event_token == "-SEARCH_BUTTON-":
                     artist_name = values_token["-SEARCH_INPUT-"]
-                    # Perform search operation here
-                    tokens = database_manager.get_tokens_by_artist(
-                        artist_name, database_cursor
+                    tokens = (
+                        artist_index.search(artist_name)
+                        if artist_index is not None
+                        else database_manager.get_tokens_by_artist(artist_name, database_cursor)
                     )
-                    if tokens:
-                        window_tokens["-RESULT_LIST-"].update(
-                            values=[f"{name} - {art_id}" for name, art_id in tokens]
-                        )
-                    else:
-                        window_tokens["-RESULT_LIST-"].update(
-                            values=["No tokens found."]
-                        )
-                elif event_token == "-RESULT_LIST-":
-                    selected_token = values_token["-RESULT_LIST-"][0]
-                    token_card = MTGACard(
-                        "", "", "", "", selected_token.split(" - ")[1]
+                    # One grid slot per art; tokens sharing an art look the same
+                    token_results = list(
+                        {str(art_id): (name, str(art_id)) for name, art_id in tokens}.values()
+                    )
+                    token_page = 0
+                    token_previews = {}
+                    window_tokens["-RESULT_COUNT-"].update(
+                        f"{len(token_results)} tokens found" if token_results else "No tokens found."
                     )
+                    window_tokens.write_event_value("-TOKEN_SHOW_PAGE-", None)
+
+                # Show a page: reuse the slot buttons, then queue missing previews
+                elif event_token in ("-TOKEN_SHOW_PAGE-", "-TOKEN_PREV_PAGE-", "-TOKEN_NEXT_PAGE-"):
+                    token_page_count = max((len(token_results) + TOKEN_PAGE_SIZE - 1) // TOKEN_PAGE_SIZE, 1)
+                    if event_token == "-TOKEN_NEXT_PAGE-":
+                        token_page = (token_page + 1) % token_page_count
+                    elif event_token == "-TOKEN_PREV_PAGE-":
+                        token_page = (token_page - 1) % token_page_count
+
+                    for pending_token_preview in pending_token_previews:
+                        pending_token_preview.cancel()
+
+                    page_start = token_page * TOKEN_PAGE_SIZE
+                    token_previews = {
+                        result_index: preview_bytes
+                        for result_index, preview_bytes in token_previews.items()
+                        if page_start <= result_index < page_start + TOKEN_PAGE_SIZE
+                    }
+                    missing_previews = []
+                    for slot in range(TOKEN_PAGE_SIZE):
+                        result_index = page_start + slot
+                        if result_index < len(token_results):
+                            name, art_id = token_results[result_index]
+                            window_tokens[f"-TOKEN-{slot}-"].update(
+                                image_data=token_previews.get(result_index, token_placeholder_bytes),
+                                visible=True,
+                            )
+                            window_tokens[f"-TOKEN-{slot}-"].set_tooltip(f"{name} - {art_id}")
+                            token_bundle_name = find_art_bundle(token_bundle_names, art_id)
+                            if result_index not in token_previews and token_bundle_name:
+                                missing_previews.append(
+                                    (result_index, os.path.join(asset_bundle_directory, token_bundle_name))
+                                )
+                        else:
+                            window_tokens[f"-TOKEN-{slot}-"].update(visible=False)
 
-                    image_data_list, texture_data_list, matching_file = (
-                        get_card_texture_data(
-                            token_card, database_file_path, ret_matching=True
-                        )
+                    pending_token_previews = queue_token_previews(
+                        token_preview_executor, window_tokens, missing_previews
                     )
-                    if image_data_list:
-                        display_texture_bytes = convert_texture_to_bytes(
-                            image_data_list[0]
-                        )
-                        token_card.image = display_texture_bytes
-                    else:
+                    window_tokens["-TOKEN_PAGE-"].update(f"Page {token_page + 1} of {token_page_count}")
+
+                # A worker finished a preview; show it if its page is visible
+                elif event_token == TOKEN_PREVIEW_EVENT:
+                    result_index, preview_bytes = values_token[event_token]
+                    slot = result_index - token_page * TOKEN_PAGE_SIZE
+                    if 0 <= slot < TOKEN_PAGE_SIZE and result_index < len(token_results) and preview_bytes:
+                        token_previews[result_index] = preview_bytes
+                        window_tokens[f"-TOKEN-{slot}-"].update(image_data=preview_bytes)
+
+                elif event_token.startswith("-TOKEN-"):
+                    token_index = token_page * TOKEN_PAGE_SIZE + int(event_token.split("-")[2])
+                    if token_index >= len(token_results):
+                        continue
+                    token_card = MTGACard(
+                        "", "", "", "", token_results[token_index][1]
+                    )
+                    matching_file = find_art_bundle(token_bundle_names, token_card.art_id)
+                    if matching_file is None:
                         print("No texture found.")
+                        continue
+
+                    # The cached preview is shown right away; the bundle is only
+                    # parsed once the token is changed or saved
+                    image_data_list, texture_data_list = None, None
+                    token_preview_bytes = get_token_preview(
+                        os.path.join(asset_bundle_directory, matching_file), full_size=True
+                    )
                     token_editor_layout = [
                         [
                             sg.Button(
@@ -676,12 +896,7 @@ while True:
                             ),
                             sg.Button("Save", key="-SAVE_ASSET-"),
                         ],
-                        [
-                            sg.Image(
-                                source=display_texture_bytes,
-                                key="-ASSET_IMAGE-",
-                            )
-                        ],
+                        [sg.Image(key="-ASSET_IMAGE-")],
                     ]
                     # Show the token editor window
                     token_editor_window = sg.Window(
@@ -692,10 +907,26 @@ while True:
                         grab_anywhere=True,
                         relative_location=(0, 0),
                     )
+                    if token_preview_bytes:
+                        token_editor_window["-ASSET_IMAGE-"].update(
+                            data=token_preview_bytes
+                        )
                     while True:
                         event, values = token_editor_window.read()
                         if event == sg.WINDOW_CLOSED:
+                            if image_data_list:
+                                image_data_list.release()
                             break
+                        if event in ("-CHANGE_ASSET_IMAGE-", "-SAVE_ASSET-") and texture_data_list is None:
+                            image_data_list, texture_data_list, matching_file = (
+                                get_card_texture_data(
+                                    token_card, database_file_path, ret_matching=True
+                                )
+                            )
+                            if not image_data_list:
+                                print("No texture found.")
+                                continue
+                            token_card.image = image_data_list[0]
                         if event == "-CHANGE_ASSET_IMAGE-":
                             new_image_path = open_file_dialog(
                                 "Select your new image", "image files", "*.png"
@@ -710,9 +941,10 @@ while True:
                                     os.path.join(asset_bundle_directory, matching_file)
                                 )
                                 # Replace the texture with new image
-                                texture_data = extract_textures_from_bundle(
-                                    unity_environment
-                                )[0]
+                                texture_data = get_texture_by_path_id(
+                                    unity_environment,
+                                    texture_data_list[0].object_reader.path_id,
+                                )
                                 replace_texture_in_bundle(
                                     texture_data,
                                     new_image_path,
@@ -721,20 +953,17 @@ while True:
                                 )
                                 
                                 # Backup the NEW asset bundle file after changes
-                                shutil.copy(
-                                    os.path.join(asset_bundle_directory, matching_file),
-                                    backup_directory / f"MOD_{matching_file}",
+                                backup_bundle(
+                                    os.path.join(asset_bundle_directory, matching_file)
                                 )
                                 
-                                display_texture_bytes = convert_texture_to_bytes(
-                                    texture_data.image
-                                )
-
                                 # Update display with new image
+                                token_card.image = texture_data.image
                                 token_editor_window["-ASSET_IMAGE-"].update(
-                                    source=display_texture_bytes
+                                    data=get_display_frame(token_card.image)
                                 )
-                                token_card.image = texture_data.image
+                                # The bundle changed, so its grid preview is rebuilt
+                                token_previews.pop(token_index, None)
                                 sg.popup_auto_close(
                                     "Image changed successfully!", auto_close_duration=1
                                 )
@@ -751,12 +980,27 @@ while True:
                             sg.popup_auto_close(
                                 "Asset saved successfully!", auto_close_duration=1
                             )
+                    if token_index not in token_previews:
+                        window_tokens.write_event_value("-TOKEN_SHOW_PAGE-", None)
         else:
             sg.popup_error("Please select a database first", auto_close_duration=3)
 
     # Handle decklist loading
     if event == "-LOAD_DECKLIST-":
-        cards_from_imported_deck = create_decklist_import_window()
+        new_deck_cards = create_decklist_import_window()
+        if new_deck_cards and cards_from_imported_deck and (
+            sg.popup_yes_no(
+                f"Combine this decklist with the {imported_decklist_count} already loaded?"
+                "\nChoose No to replace them.",
+                title="Combine Decklists",
+            )
+            == "Yes"
+        ):
+            cards_from_imported_deck = cards_from_imported_deck | new_deck_cards
+            imported_decklist_count += 1
+        elif new_deck_cards is not None:
+            cards_from_imported_deck = new_deck_cards
+            imported_decklist_count = 1
         main_window["-USE_DECKLIST-"].update(value=True)
         event = "-USE_DECKLIST-"
         values["-USE_DECKLIST-"] = True
@@ -800,10 +1044,10 @@ while True:
                 grpid_list, database_cursor, database_connection, user_save_changes_path
             ):
                 sg.popup_auto_close("Parallax style unlocked successfully!")
-        else:
-            sg.popup_auto_close(
-                "Failed to unlock parallax style, ensure that the database is not open in another program."
-            )
+            else:
+                sg.popup_auto_close(
+                    "Failed to unlock parallax style, ensure that the database is not open in another program."
+                )
 
     if event == "-LOAD_OLD_CHANGES-":
         grpid_list = [
@@ -865,12 +1109,38 @@ while True:
             )
             asset_bundle_files.append("resources.assets")
 
+            # The object index covers the whole install, card art and sleeves included,
+            # even though the list above hides them until a search finds them
+            indexed_bundle_paths = {
+                bundle_file: os.path.join(asset_bundle_directory, bundle_file)
+                for bundle_file in os.listdir(asset_bundle_directory)
+                if bundle_file.endswith(".mtga")
+            }
+            indexed_bundle_paths["resources.assets"] = str(Path(asset_bundle_directory).parent.parent / "resources.assets")
+            object_index_thread = None
+
             # Create asset browser window
             asset_browser_layout = [
                 [sg.Text("Select a file to change/view the assets of")],
                 [sg.Text("Search for files by type")],
                 [sg.Input(size=(90, 1), enable_events=True, key="-ASSET_SEARCH-")],
-                [sg.Button("Export all images below", key="-EXPORT_ALL_ASSETS-")],
+                [sg.Text("Search inside bundles, e.g. sleeve type:Texture2D 512x512 format:ETC2")],
+                [
+                    sg.Input(size=(60, 1), key="-OBJECT_SEARCH-"),
+                    sg.Button("Search Objects", key="-OBJECT_SEARCH_BUTTON-"),
+                    sg.Button("Update Object Index", key="-UPDATE_OBJECT_INDEX-"),
+                ],
+                [sg.Text("", key="-OBJECT_INDEX_STATUS-", size=(90, 1))],
+                [
+                    sg.Button("Export all images below", key="-EXPORT_ALL_ASSETS-"),
+                    sg.Button("Export all 3D meshes below", key="-EXPORT_ALL_MESHES-"),
+                    sg.Combo(
+                        list(MESH_EXPORT_FORMATS),
+                        default_value=DEFAULT_MESH_EXPORT_FORMAT,
+                        readonly=True,
+                        key="-MESH_EXPORT_FORMAT-",
+                    ),
+                ],
                 [
                     sg.Listbox(
                         asset_bundle_files,
@@ -911,41 +1181,113 @@ while True:
                 ):
                     asset_browser_window["-ASSET_LIST-"].update(asset_bundle_files)
 
+                # Build or refresh the object index in the background; only changed bundles are rescanned
+                if asset_event == "-UPDATE_OBJECT_INDEX-":
+                    if object_index_thread and object_index_thread.is_alive():
+                        sg.popup_auto_close("The object index is already updating", auto_close_duration=2)
+                        continue
+
+                    asset_browser_window["-OBJECT_INDEX_STATUS-"].update("Checking bundles for changes...")
+                    object_index_thread = start_asset_index_update(asset_browser_window, indexed_bundle_paths)
+
+                if asset_event == "-OBJECT_INDEX_PROGRESS-":
+                    scanned_bundles, total_bundles = asset_values[asset_event]
+                    asset_browser_window["-OBJECT_INDEX_STATUS-"].update(
+                        f"Indexing bundles: {scanned_bundles} of {total_bundles}"
+                    )
+
+                if asset_event == "-OBJECT_INDEX_DONE-":
+                    scanned_bundles, removed_bundles = asset_values[asset_event]
+                    asset_browser_window["-OBJECT_INDEX_STATUS-"].update(
+                        f"Object index up to date ({scanned_bundles} bundle(s) scanned, {removed_bundles} removed)"
+                    )
+
+                # Search the object index and list only the bundles with matching objects
+                if asset_event == "-OBJECT_SEARCH_BUTTON-":
+                    object_query = asset_values["-OBJECT_SEARCH-"].strip()
+                    if not object_query:
+                        asset_browser_window["-ASSET_LIST-"].update(asset_bundle_files)
+                        asset_browser_window["-OBJECT_INDEX_STATUS-"].update("")
+                        continue
+                    if not ASSET_INDEX_PATH.exists():
+                        sg.popup_error("Click 'Update Object Index' first to build the index")
+                        continue
+                    asset_index_connection = open_asset_index()
+                    try:
+                        matching_bundles = search_asset_index(asset_index_connection, object_query)
+                    finally:
+                        asset_index_connection.close()
+                    asset_browser_window["-ASSET_LIST-"].update(
+                        [bundle for bundle, _ in matching_bundles]
+                    )
+                    asset_browser_window["-OBJECT_INDEX_STATUS-"].update(
+                        f"{sum(count for _, count in matching_bundles)} matching object(s) in {len(matching_bundles)} bundle(s)"
+                    )
+
                 # Handle export all assets
-                if asset_event == "-EXPORT_ALL_ASSETS-":
+                if asset_event in ("-EXPORT_ALL_ASSETS-", "-EXPORT_ALL_MESHES-"):
                     current_asset_list = asset_browser_window["-ASSET_LIST-"].Values
+                    export_mesh_format = (
+                        asset_values["-MESH_EXPORT_FORMAT-"] if asset_event == "-EXPORT_ALL_MESHES-" else None
+                    )
+                    exported_kind = "3D meshes" if export_mesh_format else "images"
                     if (
                         sg.popup_yes_no(
-                            f"Are you sure you want to export all images from these {len(current_asset_list)} file bundles?"
+                            f"Are you sure you want to export all {exported_kind} from these {len(current_asset_list)} file bundles?"
                         )
                         == "Yes"
                     ):
-                        if not os.path.exists(image_save_directory):
-                            os.makedirs(image_save_directory)
+                        export_bundle_paths = {
+                            asset_file_name: (
+                                str(Path(asset_bundle_directory).parent.parent / "resources.assets")
+                                if asset_file_name == "resources.assets"
+                                else os.path.join(asset_bundle_directory, asset_file_name)
+                            )
+                            for asset_file_name in current_asset_list
+                        }
+                        export_progress_window = sg.Window(
+                            f"Exporting {exported_kind}",
+                            [
+                                [sg.Text("Starting export...", key="-EXPORT_STATUS-", size=(60, 1))],
+                                [sg.ProgressBar(len(export_bundle_paths), orientation="h", size=(40, 20), key="-EXPORT_BAR-")],
+                                [sg.Button("Cancel", key="-EXPORT_CANCEL-")],
+                            ],
+                            modal=True,
+                            finalize=True,
+                        )
+                        export_thread, export_cancel_event = start_bulk_export(
+                            export_progress_window,
+                            export_bundle_paths,
+                            image_save_directory,
+                            mesh_format=export_mesh_format,
+                        )
 
-                        for asset_file_name in current_asset_list:
-                            try:
-                                unity_environment = load_unity_bundle(
-                                    os.path.join(
-                                        asset_bundle_directory, asset_file_name
-                                    )
-                                )
-                                extracted = extract_textures_from_bundle(
-                                    unity_environment
+                        while True:
+                            export_event, export_values = export_progress_window.read()
+                            if export_event in (sg.WIN_CLOSED, "-EXPORT_CANCEL-"):
+                                export_cancel_event.set()
+                                if export_event == sg.WIN_CLOSED:
+                                    break
+                                export_progress_window["-EXPORT_STATUS-"].update("Cancelling after the bundles in progress...")
+
+                            if export_event == "-EXPORT_PROGRESS-":
+                                bundles_done, bundle_count, textures_exported = export_values[export_event]
+                                export_progress_window["-EXPORT_BAR-"].update(current_count=bundles_done)
+                                export_progress_window["-EXPORT_STATUS-"].update(
+                                    f"{bundles_done} of {bundle_count} bundles, {textures_exported} {exported_kind} exported"
                                 )
-                                for texture in extracted:
-                                    texture.image.save(
-                                        os.path.join(
-                                            image_save_directory,
-                                            f"{texture.m_Name}.png",
-                                        )
-                                    )
-                            except Exception as e:
-                                print(f"Error processing {asset_file_name}: {e}")
 
-                        sg.popup_auto_close(
-                            "All images exported successfully!", auto_close_duration=2
-                        )
+                            if export_event == "-EXPORT_DONE-":
+                                bundles_done, textures_exported, failed_bundles, was_cancelled, export_seconds = export_values[export_event]
+                                export_progress_window.close()
+                                sg.popup_auto_close(
+                                    f"{'Export cancelled' if was_cancelled else f'All {exported_kind} exported successfully!'}\n"
+                                    f"{textures_exported} {exported_kind} from {bundles_done} bundles in {export_seconds:.1f}s"
+                                    + (f"\n{len(failed_bundles)} bundle(s) failed, see the console" if failed_bundles else ""),
+                                    auto_close_duration=3,
+                                )
+                                break
+                        export_progress_window.close()
 
                 # Handle individual asset selection
                 if asset_event == "-ASSET_LIST-" and asset_values["-ASSET_LIST-"]:
@@ -955,40 +1297,42 @@ while True:
                         # Load the selected asset bundle
 
                         if "resources.assets" in selected_asset_file.lower():
-                            unity_environment = load_unity_bundle(str(Path(asset_bundle_directory).parent.parent / "resources.assets"))
+                            selected_bundle_path = str(Path(asset_bundle_directory).parent.parent / "resources.assets")
                         else:
-                            unity_environment = load_unity_bundle(
-                                os.path.join(asset_bundle_directory, selected_asset_file)
-                            )
-                        # Get all textures from the bundle
+                            selected_bundle_path = os.path.join(asset_bundle_directory, selected_asset_file)
+                        unity_environment = load_unity_bundle(selected_bundle_path)
+                        # Get all textures from the bundle, reusing the cached order and thumbnails if unchanged
                         print(unity_environment)
+                        thumbnail_cache_directory = get_bundle_cache_directory(selected_bundle_path)
                         texture_data_list = extract_textures_from_bundle(
-                            unity_environment
+                            unity_environment, load_texture_order(thumbnail_cache_directory), sort_by_colors=False
+                        )
+                        save_texture_order(
+                            thumbnail_cache_directory,
+                            [texture.object_reader.path_id for texture in texture_data_list],
                         )
                         print(f"Found {len(texture_data_list)} textures in {selected_asset_file}")
 
                         if texture_data_list:
-                            # Create gallery view with thumbnails
+                            # Create gallery view with one page of placeholder buttons;
+                            # worker threads fill in the thumbnails of the visible page
                             images_per_row = 3
-                            gallery_images = []
-
-                            for i, texture in enumerate(texture_data_list):
-                                # Create thumbnail for gallery
-                                thumbnail_image = resize_image_for_gallery(
-                                    texture.image, (200, 200)
-                                )
-                                thumbnail_bytes = convert_texture_to_bytes(
-                                    thumbnail_image
-                                )
-
-                                gallery_images.append(
-                                    sg.Button(
-                                        image_data=thumbnail_bytes,
-                                        key=f"-GALLERY-IMG-{i}-",
-                                        pad=(5, 5),
-                                        tooltip=f"Click to view/edit image {i+1}",
-                                    )
+                            gallery_page = 0
+                            gallery_page_count = (len(texture_data_list) + GALLERY_PAGE_SIZE - 1) // GALLERY_PAGE_SIZE
+                            gallery_thumbnails = {}
+                            pending_thumbnails = []
+                            placeholder_bytes = convert_texture_to_bytes(
+                                Image.new("RGB", (200, 200), (64, 64, 64))
+                            )
+                            gallery_images = [
+                                sg.Button(
+                                    image_data=placeholder_bytes,
+                                    key=f"-GALLERY-IMG-{slot}-",
+                                    pad=(5, 5),
+                                    tooltip="Click to view/edit image",
                                 )
+                                for slot in range(min(GALLERY_PAGE_SIZE, len(texture_data_list)))
+                            ]
 
                             # Arrange images in rows
                             gallery_rows = [
@@ -1021,7 +1365,13 @@ while True:
                                     sg.Button(
                                         "Export all 3D meshes",
                                         key="-GALLERY_EXPORT_MESHES-",
-                                    )
+                                    ),
+                                    sg.Combo(
+                                        list(MESH_EXPORT_FORMATS),
+                                        default_value=DEFAULT_MESH_EXPORT_FORMAT,
+                                        readonly=True,
+                                        key="-GALLERY_MESH_FORMAT-",
+                                    ),
                                 ],
                                 [
                                     sg.Column(
@@ -1031,6 +1381,11 @@ while True:
                                         size=(700, 500),
                                     )
                                 ],
+                                [
+                                    sg.Button("Previous Page", key="-GALLERY_PREV_PAGE-"),
+                                    sg.Text("", key="-GALLERY_PAGE-", size=(30, 1)),
+                                    sg.Button("Next Page", key="-GALLERY_NEXT_PAGE-"),
+                                ],
                                 [sg.Button("Close Gallery", key="-GALLERY_CLOSE-")],
                             ]
 
@@ -1042,14 +1397,68 @@ while True:
                                 finalize=True,
                                 location=(0, 0),
                             )
+                            thumbnail_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+                            gallery_window.write_event_value("-GALLERY_SHOW_PAGE-", None)
 
                             # Gallery event loop
                             while True:
                                 gallery_event, gallery_values = gallery_window.read()
                                 if gallery_event in (sg.WIN_CLOSED, "-GALLERY_CLOSE-"):
+                                    thumbnail_executor.shutdown(wait=False, cancel_futures=True)
                                     gallery_window.close()
                                     break
 
+                                # Show a page: reuse the slot buttons, then queue missing thumbnails
+                                if gallery_event in ("-GALLERY_SHOW_PAGE-", "-GALLERY_PREV_PAGE-", "-GALLERY_NEXT_PAGE-"):
+                                    if gallery_event == "-GALLERY_NEXT_PAGE-":
+                                        gallery_page = (gallery_page + 1) % gallery_page_count
+                                    elif gallery_event == "-GALLERY_PREV_PAGE-":
+                                        gallery_page = (gallery_page - 1) % gallery_page_count
+
+                                    for pending_thumbnail in pending_thumbnails:
+                                        pending_thumbnail.cancel()
+
+                                    page_start = gallery_page * GALLERY_PAGE_SIZE
+                                    # Off-page thumbnails are re-read from the disk cache when needed
+                                    gallery_thumbnails = {
+                                        texture_index: thumbnail_bytes
+                                        for texture_index, thumbnail_bytes in gallery_thumbnails.items()
+                                        if page_start <= texture_index < page_start + GALLERY_PAGE_SIZE
+                                    }
+                                    missing_thumbnails = []
+                                    for slot in range(len(gallery_images)):
+                                        texture_index = page_start + slot
+                                        if texture_index < len(texture_data_list):
+                                            gallery_window[f"-GALLERY-IMG-{slot}-"].update(
+                                                image_data=gallery_thumbnails.get(texture_index, placeholder_bytes),
+                                                visible=True,
+                                            )
+                                            gallery_window[f"-GALLERY-IMG-{slot}-"].set_tooltip(
+                                                f"Click to view/edit image {texture_index + 1}"
+                                            )
+                                            if texture_index not in gallery_thumbnails:
+                                                missing_thumbnails.append((texture_index, texture_data_list[texture_index]))
+                                        else:
+                                            gallery_window[f"-GALLERY-IMG-{slot}-"].update(visible=False)
+
+                                    pending_thumbnails = queue_gallery_thumbnails(
+                                        thumbnail_executor,
+                                        gallery_window,
+                                        thumbnail_cache_directory,
+                                        missing_thumbnails,
+                                    )
+                                    gallery_window["-GALLERY_PAGE-"].update(
+                                        f"Page {gallery_page + 1} of {gallery_page_count}"
+                                    )
+
+                                # A worker finished a thumbnail; show it if its page is visible
+                                if gallery_event == GALLERY_THUMBNAIL_EVENT:
+                                    texture_index, thumbnail_bytes = gallery_values[gallery_event]
+                                    slot = texture_index - gallery_page * GALLERY_PAGE_SIZE
+                                    if 0 <= slot < len(gallery_images):
+                                        gallery_thumbnails[texture_index] = thumbnail_bytes
+                                        gallery_window[f"-GALLERY-IMG-{slot}-"].update(image_data=thumbnail_bytes)
+
                                 # Handle export all images
                                 if gallery_event == "-GALLERY_EXPORT_ALL-":
                                     if not os.path.exists(image_save_directory):
@@ -1057,8 +1466,11 @@ while True:
 
                                     for i, texture in enumerate(texture_data_list):
                                         save_path = f"{os.path.join(image_save_directory, selected_asset_file)}-{i}.png"
+                                        # Thumbnail workers may still be decoding from the same bundle reader
+                                        with texture_decode_lock:
+                                            texture_image = texture.image
                                         save_image_to_file(
-                                            texture.image,
+                                            texture_image,
                                             save_path,
                                             gallery_values["-GALLERY_REMOVE_ALPHA-"],
                                         )
@@ -1071,29 +1483,28 @@ while True:
                                 if gallery_event == "-GALLERY_EXPORT_MESHES-":
                                     if not os.path.exists(image_save_directory):
                                         os.makedirs(image_save_directory)
-                                    mesh_count = export_3d_meshes(
-                                        unity_environment, image_save_directory
-                                    )
+                                    with texture_decode_lock:
+                                        mesh_count = export_3d_meshes(
+                                            unity_environment,
+                                            image_save_directory,
+                                            gallery_values["-GALLERY_MESH_FORMAT-"],
+                                        )
                                     sg.popup_auto_close(
                                         f"{mesh_count} 3D meshes were found and exported to {image_save_directory}!",
                                         auto_close_duration=1,
                                     )
 
                                 # Handle individual image selection from gallery
-                                for i in range(len(texture_data_list)):
-                                    if gallery_event == f"-GALLERY-IMG-{i}-":
+                                page_start = gallery_page * GALLERY_PAGE_SIZE
+                                for i in range(page_start, min(page_start + GALLERY_PAGE_SIZE, len(texture_data_list))):
+                                    if gallery_event == f"-GALLERY-IMG-{i - page_start}-":
                                         texture_index = i
                                         current_texture = texture_data_list[
                                             texture_index
                                         ]
-
-                                        # Resize for display
-                                        display_image = resize_image_to_screen(
-                                            current_texture.image
-                                        )
-                                        display_texture_bytes = (
-                                            convert_texture_to_bytes(display_image)
-                                        )
+                                        # The editor decodes and saves from the same bundle reader on this
+                                        # thread, so let in-flight thumbnails finish and drop the queued ones
+                                        thumbnail_executor.shutdown(wait=True, cancel_futures=True)
 
                                         # Create individual asset editor window
                                         asset_editor_layout = [
@@ -1102,6 +1513,10 @@ while True:
                                                     "Change image",
                                                     key="-CHANGE_ASSET_IMAGE-",
                                                 ),
+                                                sg.Button(
+                                                    "Restore original",
+                                                    key="-RESTORE_ASSET_IMAGE-",
+                                                ),
                                                 (
                                                     sg.Button(
                                                         "Previous",
@@ -1143,12 +1558,7 @@ while True:
                                                 ),
                                                 sg.Button("Save", key="-SAVE_ASSET-"),
                                             ],
-                                            [
-                                                sg.Image(
-                                                    source=display_texture_bytes,
-                                                    key="-ASSET_IMAGE-",
-                                                )
-                                            ],
+                                            [sg.Image(key="-ASSET_IMAGE-")],
                                             [
                                                 sg.Text(
                                                     f"Texture {texture_index + 1} of {len(texture_data_list)} in {selected_asset_file}",
@@ -1165,6 +1575,13 @@ while True:
                                             relative_location=(0, 0),
                                             finalize=True,
                                         )
+                                        # Display frames are cached per texture, so flipping back and forth doesn't decode again
+                                        asset_editor_window["-ASSET_IMAGE-"].update(
+                                            data=get_display_frame(
+                                                lambda: current_texture.image,
+                                                (selected_bundle_path, current_texture.object_reader.path_id),
+                                            )
+                                        )
 
                                         # Asset editor event loop
                                         while True:
@@ -1202,17 +1619,14 @@ while True:
                                                 current_texture = texture_data_list[
                                                     texture_index
                                                 ]
-                                                display_image = resize_image_to_screen(
-                                                    current_texture.image
-                                                )
-                                                display_texture_bytes = (
-                                                    convert_texture_to_bytes(
-                                                        display_image
-                                                    )
-                                                )
                                                 asset_editor_window[
                                                     "-ASSET_IMAGE-"
-                                                ].update(source=display_texture_bytes)
+                                                ].update(
+                                                    data=get_display_frame(
+                                                        lambda: current_texture.image,
+                                                        (selected_bundle_path, current_texture.object_reader.path_id),
+                                                    )
+                                                )
                                                 asset_editor_window[
                                                     "-ASSET_INFO-"
                                                 ].update(
@@ -1253,9 +1667,8 @@ while True:
                                                         )
                                                         
                                                         # Backup the NEW asset bundle file after changes
-                                                        shutil.copy(
-                                                            os.path.join(str(Path(asset_bundle_directory).parent.parent), selected_asset_file),
-                                                            backup_directory / f"MOD_{selected_asset_file}",
+                                                        backup_bundle(
+                                                            os.path.join(str(Path(asset_bundle_directory).parent.parent), selected_asset_file)
                                                         )
                                                     else:
                                                         replace_texture_in_bundle(
@@ -1269,27 +1682,19 @@ while True:
                                                         )
                                                         
                                                         # Backup the NEW asset bundle file after changes
-                                                        shutil.copy(
+                                                        backup_bundle(
                                                             os.path.join(
                                                                 asset_bundle_directory,
                                                                 selected_asset_file,
-                                                            ),
-                                                            backup_directory / f"MOD_{selected_asset_file}",
+                                                            )
                                                         )
                                                     # Update displays
                                                     new_img = Image.open(new_image_path)
-                                                    display_image = (
-                                                        resize_image_to_screen(new_img)
-                                                    )
-                                                    display_texture_bytes = (
-                                                        convert_texture_to_bytes(
-                                                            display_image
-                                                        )
-                                                    )
+                                                    clear_display_frames()
                                                     asset_editor_window[
                                                         "-ASSET_IMAGE-"
                                                     ].update(
-                                                        source=display_texture_bytes
+                                                        data=get_display_frame(new_img)
                                                     )
 
                                                     # Update gallery thumbnail
@@ -1303,9 +1708,12 @@ while True:
                                                             thumbnail_image
                                                         )
                                                     )
-                                                    gallery_window[
-                                                        f"-GALLERY-IMG-{texture_index}-"
-                                                    ].update(image_data=thumbnail_bytes)
+                                                    gallery_thumbnails[texture_index] = thumbnail_bytes
+                                                    slot = texture_index - gallery_page * GALLERY_PAGE_SIZE
+                                                    if 0 <= slot < len(gallery_images):
+                                                        gallery_window[
+                                                            f"-GALLERY-IMG-{slot}-"
+                                                        ].update(image_data=thumbnail_bytes)
 
                                                     # Update texture data
                                                     texture_data_list[
@@ -1317,6 +1725,44 @@ while True:
                                                         auto_close_duration=1,
                                                     )
 
+                                            # Undo image replacement from the texture journal
+                                            if (
+                                                asset_editor_event
+                                                == "-RESTORE_ASSET_IMAGE-"
+                                            ):
+                                                if not restore_textures_in_bundle(
+                                                    selected_bundle_path,
+                                                    [current_texture.object_reader.path_id],
+                                                ):
+                                                    sg.popup_error(
+                                                        "This image hasn't been changed",
+                                                        auto_close_duration=1,
+                                                    )
+                                                else:
+                                                    # The bundle was rewritten, so it is loaded again in the same order
+                                                    unity_environment = load_unity_bundle(selected_bundle_path)
+                                                    texture_data_list = extract_textures_from_bundle(
+                                                        unity_environment,
+                                                        [texture.object_reader.path_id for texture in texture_data_list],
+                                                        sort_by_colors=False,
+                                                    )
+                                                    current_texture = texture_data_list[
+                                                        texture_index
+                                                    ]
+                                                    clear_display_frames()
+                                                    asset_editor_window[
+                                                        "-ASSET_IMAGE-"
+                                                    ].update(
+                                                        data=get_display_frame(
+                                                            current_texture.image
+                                                        )
+                                                    )
+                                                    gallery_thumbnails.pop(texture_index, None)
+                                                    sg.popup_auto_close(
+                                                        "Original image restored!",
+                                                        auto_close_duration=1,
+                                                    )
+
                                             # Handle aspect ratio adjustment
                                             if (
                                                 asset_editor_event
@@ -1342,15 +1788,12 @@ while True:
                                                             ),
                                                         ),
                                                     )
-                                                    display_texture_bytes = (
-                                                        convert_texture_to_bytes(
-                                                            resized_image
-                                                        )
-                                                    )
                                                     asset_editor_window[
                                                         "-ASSET_IMAGE-"
                                                     ].update(
-                                                        source=display_texture_bytes
+                                                        data=get_display_frame(
+                                                            resized_image
+                                                        )
                                                     )
                                                 except ValueError:
                                                     sg.popup_error(
@@ -1373,7 +1816,17 @@ while True:
                                                     auto_close_duration=1,
                                                 )
 
-                                        break  # Exit the gallery loop when returning from editor
+                                        # The editor may have rewritten the bundle, which clears its cached
+                                        # thumbnails, and the pool was shut down while it was open, so a new
+                                        # pool refills the current page
+                                        thumbnail_cache_directory = get_bundle_cache_directory(selected_bundle_path)
+                                        save_texture_order(
+                                            thumbnail_cache_directory,
+                                            [texture.object_reader.path_id for texture in texture_data_list],
+                                        )
+                                        thumbnail_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+                                        gallery_window.write_event_value("-GALLERY_SHOW_PAGE-", None)
+                                        break  # Back to the gallery's event loop
 
                         else:
                             sg.popup_error("No textures found in this asset bundle!")
@@ -1402,11 +1855,14 @@ while True:
                 continue
 
             # Filter cards based on imported decklist
-            filtered_cards_from_deck = [
-                card
-                for card in all_cards_formatted
-                if card[:15].strip() in cards_from_imported_deck
-            ]
+            filtered_cards_from_deck = filter_cards_by_names(
+                all_cards_formatted, card_name_index, cards_from_imported_deck
+            )
+            missing_card_names = sorted(
+                cards_from_imported_deck.difference(card_name_index)
+            )
+            if missing_card_names:
+                print(f"Decklist cards not found: {', '.join(missing_card_names)}")
             displayed_cards = filtered_cards_from_deck
             if filtered_cards_from_deck:
                 main_window["-CARD_LIST-"].update(filtered_cards_from_deck)
@@ -1423,9 +1879,7 @@ while True:
             search_query = current_search_input
 
             # Filter cards based on search query
-            filtered_search_results = [
-                card for card in displayed_cards if search_query in card.lower()
-            ]
+            filtered_search_results = filter_card_list(displayed_cards, search_query)
             main_window["-CARD_LIST-"].update(filtered_search_results)
     else:
         # Reset to full card list when search is cleared
@@ -1660,17 +2114,15 @@ while True:
 
             if texture_data_list:
                 card_textures = texture_data_list
-                display_texture_bytes = convert_texture_to_bytes(
-                    image_data_list[texture_index]
-                )
 
-                texture_width, texture_height = texture_data_list[
-                    texture_index
-                ].image.size
+                # Header size, so the texture isn't decoded just to read it
+                texture_width, texture_height = (
+                    texture_data_list[texture_index].m_Width,
+                    texture_data_list[texture_index].m_Height,
+                )
             else:
                 # Handle case where no textures are found
                 card_textures = None
-                display_texture_bytes = None
                 sg.popup_error("No textures found for selected card!")
                 continue
             selected_card_data.image = image_data_list[0]
@@ -1680,6 +2132,7 @@ while True:
                     [
                         [
                             sg.Button("Change image", key="-CHANGE_IMAGE-"),
+                            sg.Button("Restore original", key="-RESTORE_IMAGE-"),
                             (
                                 sg.Button("Previous in bundle", key="-PREVIOUS-")
                                 if len(card_textures) > 1
@@ -1730,10 +2183,12 @@ while True:
                             ),
                         ],
                     ],
+                    [sg.Image(key="-CARD_IMAGE-")],
                     [
-                        sg.Image(
-                            source=display_texture_bytes,
-                            key="-CARD_IMAGE-",
+                        sg.Text(
+                            "",
+                            key="-MEMORY_FOOTPRINT-",
+                            font=("Segoe UI", 8),
                         )
                     ],
                 ]
@@ -1747,11 +2202,24 @@ while True:
                     relative_location=(0, 0),
                     finalize=True,
                 )
+                # Display frames are cached per art and texture, so navigation doesn't redo any work
+                card_editor_window["-CARD_IMAGE-"].update(
+                    data=get_display_frame(
+                        selected_card_data.image,
+                        (selected_card_data.art_id, texture_index, True),
+                    )
+                )
 
                 # Card editor event loop
                 while True:
+                    card_editor_window["-MEMORY_FOOTPRINT-"].update(
+                        describe_texture_memory_footprint()
+                    )
                     editor_event, editor_values = card_editor_window.read()
                     if editor_event == "-EXIT-" or editor_event == sg.WIN_CLOSED:
+                        # Let go of this card's decoded textures right away
+                        image_data_list.release()
+                        clear_display_frames()
                         break
 
                     # Handle navigation between textures in the bundle
@@ -1761,20 +2229,23 @@ while True:
                             texture_index = 0
                         if texture_index < 0:
                             texture_index = len(card_textures) - 1
-                        1070957949
-                        display_texture_bytes = convert_texture_to_bytes(
-                            image_data_list[texture_index]
-                        )
+                        selected_card_data.image = image_data_list[texture_index]
                         card_editor_window["-CARD_IMAGE-"].update(
-                            source=display_texture_bytes
+                            data=get_display_frame(
+                                selected_card_data.image,
+                                (selected_card_data.art_id, texture_index, True),
+                            )
                         )
-                        selected_card_data.image = image_data_list[texture_index]
 
                     if editor_event == "-EDIT_DETAILS-":
                         details = fetch_all_data(
                             database_cursor, selected_card_data.grp_id
                         )
                         if details:
+                            # All of the card's localized text in one query
+                            card_localizations = localization_store.get_many(
+                                details[field] for field in CARD_LOCALIZATION_FIELDS
+                            )
                             detail_layout = []
                             for key, value in details.items():
                                 detail_layout.append(
@@ -1802,31 +2273,23 @@ while True:
                                 [
                                     sg.Text("Name", size=(15, 1)),
                                     sg.Input(
-                                        database_manager.get_localization_from_id(
-                                            database_cursor, details["TitleId"]
-                                        ),
+                                        card_localizations[str(details["TitleId"])],
                                         key=f"-Loc_DETAIL-TitleId-",
                                     ),
                                     sg.Text("Flavor Text", size=(15, 1)),
                                     sg.Input(
-                                        database_manager.get_localization_from_id(
-                                            database_cursor, details["FlavorTextId"]
-                                        ),
+                                        card_localizations[str(details["FlavorTextId"])],
                                         key=f"-Loc_DETAIL-FlavorTextId-",
                                     ),
                                 ],[
                                     sg.Text("Type", size=(15, 1)),
                                     sg.Input(
-                                        database_manager.get_localization_from_id(
-                                            database_cursor, details["TypeTextId"]
-                                        ),
+                                        card_localizations[str(details["TypeTextId"])],
                                         key=f"-Loc_DETAIL-TypeTextId-",
                                     ),
                                     sg.Text("Subtype", size=(15, 1)),
                                     sg.Input(
-                                        database_manager.get_localization_from_id(
-                                            database_cursor, details["SubtypeTextId"]
-                                        ),
+                                        card_localizations[str(details["SubtypeTextId"])],
                                         key=f"-Loc_DETAIL-SubtypeTextId-",
                                     ),
                                 ],
@@ -1857,6 +2320,11 @@ while True:
                                         for key in detail_values
                                         if key.startswith("-DETAIL-")
                                     }
+                                    capture_baseline(
+                                        [selected_card_data.grp_id],
+                                        database_cursor,
+                                        user_save_changes_path,
+                                    )
                                     change_grp_id(
                                         "",
                                         database_cursor,
@@ -1883,16 +2351,9 @@ while True:
                                         if key.startswith("-Loc_DETAIL-")
                                     }
                                     for loc_key, loc_value in new_loc_values.items():
-                                        if loc_key in (
-                                            "TitleId",
-                                            "FlavorTextId",
-                                            "TypeTextId",
-                                            "SubtypeTextId",
-                                        ):
-                                            database_manager.set_localization_from_id(
-                                                database_cursor,
-                                                details[loc_key],
-                                                loc_value,
+                                        if loc_key in CARD_LOCALIZATION_FIELDS:
+                                            localization_store.set(
+                                                details[loc_key], loc_value
                                             )
                                             save_loc_id_info(
                                                 user_save_changes_path,
@@ -1900,6 +2361,8 @@ while True:
                                                 loc_value,
                                                 selected_card_data.grp_id,
                                             )
+                                    # Every localization edit in one transaction
+                                    localization_store.flush()
 
                                     break
                             detail_window.close()
@@ -1919,6 +2382,12 @@ while True:
                             ),
                         )
                         if new_tag:
+                            capture_baseline(
+                                [selected_card_data.grp_id],
+                                database_cursor,
+                                user_save_changes_path,
+                                ["Tags"],
+                            )
                             database_cursor.execute(
                                 "UPDATE Cards SET Tags = ? WHERE GrpId = ?",
                                 (new_tag, selected_card_data.grp_id),
@@ -1975,17 +2444,14 @@ while True:
 
                             if texture_data_list:
                                 card_textures = texture_data_list
-                                display_texture_bytes = convert_texture_to_bytes(
-                                    image_data_list[texture_index]
-                                )
 
-                                texture_width, texture_height = texture_data_list[
-                                    texture_index
-                                ].image.size
+                                texture_width, texture_height = (
+                                    texture_data_list[texture_index].m_Width,
+                                    texture_data_list[texture_index].m_Height,
+                                )
                             else:
                                 # Handle case where no textures are found
                                 card_textures = None
-                                display_texture_bytes = None
                                 sg.popup_error("No textures found for selected card!")
                                 continue
                             selected_card_data.image = image_data_list[0]
@@ -1993,7 +2459,10 @@ while True:
                             sg.popup_error("Failed to load card image!")
                         selected_card_data.image = image_data_list[0]
                         card_editor_window["-CARD_IMAGE-"].update(
-                            source=convert_texture_to_bytes(selected_card_data.image)
+                            data=get_display_frame(
+                                selected_card_data.image,
+                                (selected_card_data.art_id, texture_index, True),
+                            )
                         )
 
                     # Handle image replacement
@@ -2017,9 +2486,10 @@ while True:
                                 False,
                             )
                             # Replace the texture with new image
-                            texture_data = extract_textures_from_bundle(
-                                unity_environment
-                            )[texture_index]
+                            texture_data = get_texture_by_path_id(
+                                unity_environment,
+                                texture_data_list[texture_index].object_reader.path_id,
+                            )
                             replace_texture_in_bundle(
                                 texture_data,
                                 new_image_path,
@@ -2030,37 +2500,65 @@ while True:
                             )
                             
                             # Backup the NEW asset bundle file after changes
-                            shutil.copy(
-                                os.path.join(asset_bundle_directory, matching_bundle_files),
-                                backup_directory / f"MOD_{matching_bundle_files}"
+                            backup_bundle(
+                                os.path.join(asset_bundle_directory, matching_bundle_files)
                             )
                             
-                            display_texture_bytes = convert_texture_to_bytes(
-                                texture_data.image
-                            )
-
                             # Update display with new image
+                            selected_card_data.image = texture_data.image
+                            clear_display_frames()
                             card_editor_window["-CARD_IMAGE-"].update(
-                                source=display_texture_bytes
+                                data=get_display_frame(selected_card_data.image)
                             )
-                            selected_card_data.image = texture_data.image
                             sg.popup_auto_close(
                                 "Image changed successfully!", auto_close_duration=1
                             )
                         else:
                             sg.popup_error("Invalid image file", auto_close_duration=1)
 
+                    # Undo image replacement from the texture journal
+                    if editor_event == "-RESTORE_IMAGE-":
+                        bundle_file_path = os.path.join(
+                            asset_bundle_directory, matching_bundle_files
+                        )
+                        if not restore_textures_in_bundle(
+                            bundle_file_path,
+                            [texture_data_list[texture_index].object_reader.path_id],
+                        ):
+                            sg.popup_error("This image hasn't been changed", auto_close_duration=1)
+                        else:
+                            # The bundle was rewritten, so it and its decoded images are loaded again
+                            unity_environment = load_unity_bundle(bundle_file_path)
+                            image_data_list.release()
+                            image_data_list, texture_data_list = get_card_texture_data(
+                                selected_card_data,
+                                database_file_path,
+                            )
+                            card_textures = texture_data_list
+                            selected_card_data.image = image_data_list[texture_index]
+                            clear_display_frames()
+                            card_editor_window["-CARD_IMAGE-"].update(
+                                data=get_display_frame(selected_card_data.image)
+                            )
+                            sg.popup_auto_close(
+                                "Original image restored!", auto_close_duration=1
+                            )
+
                     # Handle alpha channel removal
                     if editor_event == "-REMOVE_ALPHA-":
                         processed_image = remove_alpha_channel(
                             texture_data_list[texture_index].image,
                             editor_values["-REMOVE_ALPHA-"],
                         )
-                        display_texture_bytes = convert_texture_to_bytes(
-                            processed_image
-                        )
                         card_editor_window["-CARD_IMAGE-"].update(
-                            source=display_texture_bytes
+                            data=get_display_frame(
+                                processed_image,
+                                (
+                                    selected_card_data.art_id,
+                                    texture_index,
+                                    editor_values["-REMOVE_ALPHA-"],
+                                ),
+                            )
                         )
                         selected_card_data.image = processed_image
 
@@ -2078,20 +2576,19 @@ while True:
 
                     # Handle image upscaling
                     if editor_event == "-UPSCALE_IMAGE-" and is_upscaling_available:
-                        current_width, current_height = card_textures[
-                            texture_index
-                        ].image.size
+                        current_width, current_height = (
+                            card_textures[texture_index].m_Width,
+                            card_textures[texture_index].m_Height,
+                        )
                         upscaled_image = upscale_card_image(
-                            io.BytesIO(display_texture_bytes),
+                            selected_card_data.image,
                             current_width,
                             current_height,
                         )
 
                         # Resize for display if too large
-                        display_image = resize_image_to_screen(upscaled_image)
-                        display_texture_bytes = convert_texture_to_bytes(display_image)
                         card_editor_window["-CARD_IMAGE-"].update(
-                            source=display_texture_bytes
+                            data=get_display_frame(upscaled_image)
                         )
                         selected_card_data.image = upscaled_image
 
@@ -2103,18 +2600,15 @@ while True:
                         try:
                             resized_image, new_width, new_height = (
                                 adjust_image_aspect_ratio(
-                                    display_texture_bytes,
+                                    selected_card_data.image,
                                     (
                                         float(editor_values["-ASPECT_WIDTH-"]),
                                         float(editor_values["-ASPECT_HEIGHT-"]),
                                     ),
                                 )
                             )
-                            display_texture_bytes = convert_texture_to_bytes(
-                                resized_image
-                            )
                             card_editor_window["-CARD_IMAGE-"].update(
-                                source=display_texture_bytes
+                                data=get_display_frame(resized_image)
                             )
                             texture_width, texture_height = new_width, new_height
                             selected_card_data.image = resized_image
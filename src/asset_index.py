@@ -0,0 +1,300 @@
+# Cross-bundle object metadata index for the asset browser
+# Records type, name, dimensions, format and path_id of every object so bundles can be
+# searched by content without loading them
+
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.tracing import connect_database
+from src.unity_bundle import load_unity_bundle
+
+ASSET_INDEX_PATH = Path.home() / ".mtga_swapper" / "asset_index.db"
+INDEX_WORKERS = min(8, os.cpu_count() or 4)
+INDEX_COMMIT_INTERVAL = 50
+SEARCH_RESULT_LIMIT = 5000
+
+ASSET_INDEX_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS Bundles (
+        Bundle TEXT PRIMARY KEY,
+        MtimeNs INTEGER,
+        Size INTEGER
+    );
+    CREATE TABLE IF NOT EXISTS Objects (
+        Bundle TEXT,
+        PathId INTEGER,
+        Type TEXT,
+        Name TEXT,
+        Width INTEGER,
+        Height INTEGER,
+        Format TEXT,
+        PRIMARY KEY (Bundle, PathId)
+    );
+    CREATE INDEX IF NOT EXISTS Objects_Type ON Objects (Type);
+    CREATE INDEX IF NOT EXISTS Objects_Size ON Objects (Width, Height);
+"""
+
+
+def open_asset_index(index_path: Path = ASSET_INDEX_PATH) -> sqlite3.Connection:
+    """
+    Open the asset index database, creating its tables on first use.
+
+    Args:
+        index_path: Path to the index SQLite file
+
+    Returns:
+        Open connection to the index
+    """
+    Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+    connection = connect_database(index_path)
+    connection.executescript(ASSET_INDEX_SCHEMA)
+    return connection
+
+
+def scan_bundle_objects(bundle_file_path: str) -> List[Tuple]:
+    """
+    Read the object table of one bundle.
+
+    Only textures are parsed to get their size and format; every other object
+    just has its name peeked from the type tree.
+
+    Args:
+        bundle_file_path: Path to the bundle
+
+    Returns:
+        List of (path_id, type, name, width, height, format) tuples
+    """
+    from UnityPy.enums import TextureFormat
+
+    unity_environment = load_unity_bundle(bundle_file_path)
+    object_rows = []
+    for unity_object in unity_environment.objects:
+        type_name = unity_object.type.name
+        width = height = texture_format = None
+        try:
+            if type_name == "Texture2D":
+                texture = unity_object.read()
+                object_name = texture.m_Name
+                width, height = texture.m_Width, texture.m_Height
+                try:
+                    texture_format = TextureFormat(texture.m_TextureFormat).name
+                except ValueError:
+                    texture_format = str(texture.m_TextureFormat)
+            else:
+                object_name = unity_object.peek_name()
+        except Exception:
+            object_name = None
+        object_rows.append(
+            (
+                unity_object.path_id,
+                type_name,
+                object_name or "",
+                width,
+                height,
+                texture_format,
+            )
+        )
+    return object_rows
+
+
+def update_asset_index(
+    bundle_paths: Dict[str, str],
+    index_path: Path = ASSET_INDEX_PATH,
+    max_workers: int = INDEX_WORKERS,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
+    """
+    Bring the index up to date with the bundles on disk.
+
+    Bundles whose size and mtime match the index are skipped, so after the first
+    scan only new or patched bundles are read. Bundles are scanned in a thread
+    pool while this thread writes the results. Opens its own connection, so it
+    can run on a background thread.
+
+    Args:
+        bundle_paths: Bundle name -> full path for every bundle to index
+        index_path: Path to the index SQLite file
+        max_workers: Number of bundles scanned concurrently
+        progress_callback: Called with (bundles scanned, bundles to scan)
+
+    Returns:
+        Tuple of (bundles scanned, bundles removed from the index)
+    """
+    connection = open_asset_index(index_path)
+    try:
+        indexed_bundles = {
+            bundle: (mtime_ns, size)
+            for bundle, mtime_ns, size in connection.execute(
+                "SELECT Bundle, MtimeNs, Size FROM Bundles"
+            )
+        }
+
+        removed_bundles = [
+            (bundle,) for bundle in indexed_bundles if bundle not in bundle_paths
+        ]
+        connection.executemany("DELETE FROM Objects WHERE Bundle = ?", removed_bundles)
+        connection.executemany("DELETE FROM Bundles WHERE Bundle = ?", removed_bundles)
+
+        bundles_to_scan = {}
+        for bundle, bundle_file_path in bundle_paths.items():
+            try:
+                bundle_stat = os.stat(bundle_file_path)
+            except OSError:
+                continue
+            if indexed_bundles.get(bundle) != (
+                bundle_stat.st_mtime_ns,
+                bundle_stat.st_size,
+            ):
+                bundles_to_scan[bundle] = (bundle_file_path, bundle_stat)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending_scans = {
+                pool.submit(scan_bundle_objects, bundle_file_path): bundle
+                for bundle, (bundle_file_path, _) in bundles_to_scan.items()
+            }
+            for scanned_count, finished_scan in enumerate(
+                as_completed(pending_scans), start=1
+            ):
+                bundle = pending_scans[finished_scan]
+                try:
+                    object_rows = finished_scan.result()
+                except Exception as e:
+                    # Still record the bundle so it isn't retried until it changes
+                    print(f"Error indexing {bundle}: {e}")
+                    object_rows = []
+
+                bundle_stat = bundles_to_scan[bundle][1]
+                connection.execute("DELETE FROM Objects WHERE Bundle = ?", (bundle,))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO Objects (Bundle, PathId, Type, Name, Width, Height, Format) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(bundle, *object_row) for object_row in object_rows],
+                )
+                connection.execute(
+                    "INSERT OR REPLACE INTO Bundles (Bundle, MtimeNs, Size) VALUES (?, ?, ?)",
+                    (bundle, bundle_stat.st_mtime_ns, bundle_stat.st_size),
+                )
+                if scanned_count % INDEX_COMMIT_INTERVAL == 0:
+                    connection.commit()
+                if progress_callback:
+                    progress_callback(scanned_count, len(bundles_to_scan))
+
+        connection.commit()
+    finally:
+        connection.close()
+
+    return len(bundles_to_scan), len(removed_bundles)
+
+
+def start_asset_index_update(
+    window, bundle_paths: Dict[str, str], index_path: Path = ASSET_INDEX_PATH
+) -> threading.Thread:
+    """
+    Run update_asset_index on a background thread and report back to a window.
+
+    Progress is posted as "-OBJECT_INDEX_PROGRESS-" events with (scanned, total)
+    and completion as "-OBJECT_INDEX_DONE-" with (scanned, removed).
+
+    Args:
+        window: FreeSimpleGUI window that receives the events
+        bundle_paths: Bundle name -> full path for every bundle to index
+        index_path: Path to the index SQLite file
+
+    Returns:
+        The started thread
+    """
+
+    def post_event(event_key: str, event_value: tuple) -> None:
+        try:
+            window.write_event_value(event_key, event_value)
+        except Exception:
+            # The window was closed; keep indexing so the work isn't lost
+            pass
+
+    def run_update() -> None:
+        try:
+            update_result = update_asset_index(
+                bundle_paths,
+                index_path,
+                progress_callback=lambda scanned, total: post_event(
+                    "-OBJECT_INDEX_PROGRESS-", (scanned, total)
+                ),
+            )
+            post_event("-OBJECT_INDEX_DONE-", update_result)
+        except Exception as e:
+            print(f"Error updating object index: {e}")
+
+    index_thread = threading.Thread(target=run_update, daemon=True)
+    index_thread.start()
+    return index_thread
+
+
+def parse_object_query(query: str) -> Dict[str, object]:
+    """
+    Parse an object search such as "sleeve type:Texture2D 512x512 format:ETC2".
+
+    Args:
+        query: Words matched against object and bundle names, plus optional
+            type:<Type>, format:<Format> and <width>x<height> filters
+
+    Returns:
+        Dictionary with "terms", "type", "format", "width" and "height"
+    """
+    parsed_query = {
+        "terms": [],
+        "type": None,
+        "format": None,
+        "width": None,
+        "height": None,
+    }
+    for token in query.split():
+        size_match = re.fullmatch(r"(\d+)[xX×](\d+)", token)
+        if size_match:
+            parsed_query["width"] = int(size_match.group(1))
+            parsed_query["height"] = int(size_match.group(2))
+        elif token.lower().startswith("type:"):
+            parsed_query["type"] = token[5:]
+        elif token.lower().startswith("format:"):
+            parsed_query["format"] = token[7:]
+        else:
+            parsed_query["terms"].append(token)
+    return parsed_query
+
+
+def search_asset_index(
+    connection: sqlite3.Connection, query: str
+) -> List[Tuple[str, int]]:
+    """
+    Find the bundles containing objects that match a search.
+
+    Args:
+        connection: Connection returned by open_asset_index
+        query: Search string understood by parse_object_query
+
+    Returns:
+        List of (bundle name, matching object count), sorted by bundle name
+    """
+    parsed_query = parse_object_query(query)
+    conditions = []
+    parameters = []
+    for term in parsed_query["terms"]:
+        conditions.append("(Name LIKE ? OR Bundle LIKE ?)")
+        parameters.extend([f"%{term}%", f"%{term}%"])
+    if parsed_query["type"]:
+        conditions.append("Type = ? COLLATE NOCASE")
+        parameters.append(parsed_query["type"])
+    if parsed_query["format"]:
+        conditions.append("Format LIKE ?")
+        parameters.append(f"%{parsed_query['format']}%")
+    if parsed_query["width"] is not None:
+        conditions.append("Width = ? AND Height = ?")
+        parameters.extend([parsed_query["width"], parsed_query["height"]])
+
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return connection.execute(
+        f"SELECT Bundle, COUNT(*) FROM Objects {where_clause} GROUP BY Bundle ORDER BY Bundle LIMIT ?",
+        (*parameters, SEARCH_RESULT_LIMIT),
+    ).fetchall()
@@ -10,6 +10,9 @@ from pathlib import Path
 import io
 import os
 
+from src.mesh_export import export_mesh
+from src.unity_bundle import save_unity_bundle
+
 
 def remove_alpha_channel(image, should_remove_alpha=True) -> Image.Image:
     """
@@ -151,25 +154,33 @@ def extract_textures_from_bundle(
     )
 
 
-def export_3d_meshes(unity_environment: UnityPy.Environment, export_directory) -> int:
+def export_3d_meshes(
+    unity_environment: UnityPy.Environment, export_directory, mesh_format="obj"
+) -> int:
     """
-    Export all 3D meshes from the Unity environment to OBJ files.
+    Export all 3D meshes from the Unity environment, streaming one mesh at a time.
 
     Args:
         unity_environment: Loaded Unity environment
         export_directory: Directory to save the exported mesh files
+        mesh_format: One of mesh_export.MESH_EXPORT_FORMATS
 
     Returns:
-        Number of meshes successfully exported
+        Number of meshes successfully exported; meshes without vertices are
+        skipped and logged
     """
     mesh_counter = 0
     for unity_object in unity_environment.objects:
         if unity_object.type.name == "Mesh":
             mesh_data = unity_object.read()
-            mesh_file_path = os.path.join(export_directory, f"{mesh_data.m_Name}.obj")
-            with open(mesh_file_path, "wt", newline="") as mesh_file:
-                mesh_file.write(mesh_data.export())
-            mesh_counter += 1
+            if export_mesh(
+                mesh_data,
+                os.path.join(export_directory, mesh_data.m_Name),
+                mesh_format,
+            ):
+                mesh_counter += 1
+            else:
+                print(f"Skipped mesh {mesh_data.m_Name}: it has no vertices")
     return mesh_counter
 
 
@@ -276,8 +287,7 @@ def replace_texture_in_bundle(
     texture_data.save()
 
     # Save the modified bundle back to file
-    with open(bundle_file_path, "wb") as bundle_file:
-        bundle_file.write(unity_environment.file.save())
+    save_unity_bundle(unity_environment, bundle_file_path)
 
 
 def load_unity_bundle(bundle_file_path) -> UnityPy.Environment:
@@ -0,0 +1,379 @@
+# Content-addressed backup store for modified asset bundles
+# Keeps one blob per distinct bundle content plus a small catalog mapping bundle names to blobs
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BACKUP_DIRECTORY = Path.home() / "MTGA_Swapper_Backups"
+BLOB_DIRECTORY_NAME = "store"
+CATALOG_FILE_NAME = "catalog.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+RESTORE_WORKERS = 8
+
+# Linux FICLONE ioctl request number, used for copy-on-write reflinks (btrfs, xfs, ...)
+_FICLONE = 0x40049409
+
+
+def hash_file(file_path: str | Path) -> str:
+    """
+    Compute the sha256 hex digest of a file.
+
+    Args:
+        file_path: Path to the file to hash
+
+    Returns:
+        Hex encoded sha256 digest
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def load_catalog(backup_root: Path = BACKUP_DIRECTORY) -> Dict[str, dict]:
+    """
+    Load the catalog mapping bundle file names to their latest backup blob.
+
+    Args:
+        backup_root: Root backup directory
+
+    Returns:
+        Dictionary of bundle name -> {"sha256", "size", "mtime_ns"}
+    """
+    catalog_path = Path(backup_root) / CATALOG_FILE_NAME
+    try:
+        with open(catalog_path, "r") as catalog_file:
+            return json.load(catalog_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_catalog(
+    catalog: Dict[str, dict], backup_root: Path = BACKUP_DIRECTORY
+) -> None:
+    """
+    Atomically write the backup catalog.
+
+    Args:
+        catalog: Catalog dictionary to persist
+        backup_root: Root backup directory
+    """
+    catalog_path = Path(backup_root) / CATALOG_FILE_NAME
+    temp_path = catalog_path.with_suffix(".tmp")
+    with open(temp_path, "w") as catalog_file:
+        json.dump(catalog, catalog_file, indent=4)
+    os.replace(temp_path, catalog_path)
+
+
+def blob_path_for(sha256: str, backup_root: Path = BACKUP_DIRECTORY) -> Path:
+    """Return the on-disk location of the blob with the given hash."""
+    return Path(backup_root) / BLOB_DIRECTORY_NAME / sha256[:2] / sha256
+
+
+def clone_or_copy_file(source_path: str | Path, destination_path: str | Path) -> None:
+    """
+    Copy a file, using a copy-on-write reflink when the filesystem supports it.
+
+    Hardlinks are deliberately not used: the game and this tool rewrite bundles in
+    place, which would silently modify every linked copy as well.
+
+    Args:
+        source_path: File to copy
+        destination_path: Where to write the copy
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            import fcntl
+
+            with open(source_path, "rb") as source_file, open(
+                destination_path, "wb"
+            ) as destination_file:
+                fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+            return
+        except OSError:
+            pass
+    shutil.copyfile(source_path, destination_path)
+
+
+def backup_bundle(
+    bundle_file_path: str | Path, backup_root: Path = BACKUP_DIRECTORY
+) -> Optional[str]:
+    """
+    Store the current contents of a bundle in the backup store.
+
+    The bundle is only hashed when its size or modification time changed since the
+    last backup, and only copied when no blob with the same hash exists yet. Only the
+    latest copy of each bundle is kept; the blob it replaces is deleted once no
+    other bundle refers to it.
+
+    Args:
+        bundle_file_path: Path to the modified bundle in the game directory
+        backup_root: Root backup directory
+
+    Returns:
+        The sha256 of the stored content, or None if the bundle doesn't exist
+    """
+    bundle_file_path = Path(bundle_file_path)
+    try:
+        bundle_stat = bundle_file_path.stat()
+    except FileNotFoundError:
+        return None
+
+    catalog = load_catalog(backup_root)
+    catalog_entry = catalog.get(bundle_file_path.name)
+    if (
+        catalog_entry
+        and catalog_entry["size"] == bundle_stat.st_size
+        and catalog_entry["mtime_ns"] == bundle_stat.st_mtime_ns
+        and blob_path_for(catalog_entry["sha256"], backup_root).exists()
+    ):
+        return catalog_entry["sha256"]
+
+    content_hash = hash_file(bundle_file_path)
+    blob_path = blob_path_for(content_hash, backup_root)
+    if not blob_path.exists():
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_blob_path = blob_path.with_suffix(".tmp")
+        clone_or_copy_file(bundle_file_path, temp_blob_path)
+        os.replace(temp_blob_path, blob_path)
+
+    catalog[bundle_file_path.name] = {
+        "sha256": content_hash,
+        "size": bundle_stat.st_size,
+        "mtime_ns": bundle_stat.st_mtime_ns,
+    }
+    save_catalog(catalog, backup_root)
+
+    previous_hash = catalog_entry["sha256"] if catalog_entry else None
+    if previous_hash and all(
+        entry["sha256"] != previous_hash for entry in catalog.values()
+    ):
+        blob_path_for(previous_hash, backup_root).unlink(missing_ok=True)
+    return content_hash
+
+
+def iter_backups(backup_root: Path = BACKUP_DIRECTORY) -> Iterator[Tuple[str, Path]]:
+    """
+    Yield every backed up bundle, oldest legacy copies first and catalog entries last.
+
+    Legacy ``MOD_<bundle>`` full copies made by older versions are still honoured,
+    but a catalog entry for the same bundle always wins.
+
+    Args:
+        backup_root: Root backup directory
+
+    Yields:
+        Tuples of (bundle file name, path to the backed up content)
+    """
+    catalog = load_catalog(backup_root)
+    legacy_backups = sorted(Path(backup_root).glob("MOD_*.mtga"), key=os.path.getmtime)
+    for legacy_backup in legacy_backups:
+        bundle_name = legacy_backup.name[4:]
+        if bundle_name not in catalog:
+            yield bundle_name, legacy_backup
+
+    for bundle_name, catalog_entry in catalog.items():
+        blob_path = blob_path_for(catalog_entry["sha256"], backup_root)
+        if blob_path.exists():
+            yield bundle_name, blob_path
+
+
+def prune_unreferenced_blobs(backup_root: Path = BACKUP_DIRECTORY) -> int:
+    """
+    Delete blobs that are no longer referenced by the catalog.
+
+    Args:
+        backup_root: Root backup directory
+
+    Returns:
+        Number of bytes freed
+    """
+    referenced_hashes = {
+        entry["sha256"] for entry in load_catalog(backup_root).values()
+    }
+    freed_bytes = 0
+    blob_directory = Path(backup_root) / BLOB_DIRECTORY_NAME
+    if not blob_directory.exists():
+        return 0
+    for blob_path in blob_directory.glob("*/*"):
+        if blob_path.name not in referenced_hashes:
+            freed_bytes += blob_path.stat().st_size
+            blob_path.unlink()
+    return freed_bytes
+
+
+def fast_copy_file(source_path: str | Path, destination_path: str | Path) -> None:
+    """
+    Copy a file in-kernel with copy_file_range, falling back to shutil.copyfile
+    (which uses sendfile on Linux and fcopyfile on macOS).
+
+    Args:
+        source_path: File to copy
+        destination_path: Where to write the copy
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source_path, "rb") as source_file, open(
+                destination_path, "wb"
+            ) as destination_file:
+                remaining = os.fstat(source_file.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        source_file.fileno(), destination_file.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(source_path, destination_path)
+
+
+def _bundle_stem(bundle_name: str) -> str:
+    """Strip the trailing content hash from a bundle name (``<stem>_<hash>.mtga``)."""
+    return bundle_name.rsplit("_", 1)[0]
+
+
+def plan_restore(
+    asset_bundle_path: str | Path, backup_root: Path = BACKUP_DIRECTORY
+) -> List[Tuple[Path, Path, int]]:
+    """
+    Work out which backed up bundles need to be copied back into the game.
+
+    The AssetBundle directory is listed once and indexed by exact name and by name
+    without the trailing hash. Only legacy ``MOD_`` copies fall back to the six
+    character prefix older versions matched on; a catalog backup with no matching
+    bundle is reported as missing rather than restored over a different bundle.
+    Bundles whose current content already matches the backup are left out of the
+    plan; the catalog's recorded size and mtime avoid hashing files that are
+    untouched.
+
+    Args:
+        asset_bundle_path: Path to the MTGA AssetBundle directory
+        backup_root: Root backup directory
+
+    Returns:
+        List of (backup path, destination path, bytes to copy) tuples
+    """
+    bundles_by_name = {}
+    bundles_by_stem = {}
+    bundles_by_prefix = {}
+    for directory_entry in os.scandir(asset_bundle_path):
+        if not directory_entry.name.endswith(".mtga"):
+            continue
+        bundles_by_name[directory_entry.name] = directory_entry
+        bundles_by_stem.setdefault(_bundle_stem(directory_entry.name), directory_entry)
+        bundles_by_prefix.setdefault(directory_entry.name[:6], directory_entry)
+
+    catalog = load_catalog(backup_root)
+    planned_copies = {}
+    for bundle_name, backup_path in iter_backups(backup_root):
+        is_legacy_backup = backup_path.parent.parent.name != BLOB_DIRECTORY_NAME
+        destination_entry = bundles_by_name.get(bundle_name) or bundles_by_stem.get(
+            _bundle_stem(bundle_name)
+        )
+        if destination_entry is None and is_legacy_backup:
+            destination_entry = bundles_by_prefix.get(bundle_name[:6])
+        if destination_entry is None:
+            print(f"Backed up bundle {bundle_name} is missing from the game, skipping")
+            continue
+
+        backup_size = backup_path.stat().st_size
+        destination_stat = destination_entry.stat()
+        catalog_entry = catalog.get(destination_entry.name)
+        if destination_stat.st_size == backup_size:
+            backup_hash = (
+                hash_file(backup_path) if is_legacy_backup else backup_path.name
+            )
+            if (
+                catalog_entry
+                and catalog_entry["sha256"] == backup_hash
+                and catalog_entry["size"] == destination_stat.st_size
+                and catalog_entry["mtime_ns"] == destination_stat.st_mtime_ns
+            ) or hash_file(destination_entry.path) == backup_hash:
+                planned_copies.pop(destination_entry.path, None)
+                continue
+
+        planned_copies[destination_entry.path] = (
+            backup_path,
+            Path(destination_entry.path),
+            backup_size,
+        )
+    return list(planned_copies.values())
+
+
+def describe_restore_plan(
+    restore_plan: List[Tuple[Path, Path, int]], max_listed: Optional[int] = None
+) -> str:
+    """
+    Return a human readable dry-run summary of a restore plan.
+
+    Args:
+        restore_plan: Plan returned by plan_restore
+        max_listed: Maximum number of bundles to list individually
+
+    Returns:
+        Multi-line summary with the total number of bytes to move
+    """
+    total_bytes = sum(size for _, _, size in restore_plan)
+    lines = [
+        f"{len(restore_plan)} bundle(s) to restore, {total_bytes / (1024 * 1024):.1f} MB to copy"
+    ]
+    for _, destination_path, size in restore_plan[:max_listed]:
+        lines.append(f"  {destination_path.name} ({size / (1024 * 1024):.1f} MB)")
+    if max_listed is not None and len(restore_plan) > max_listed:
+        lines.append(f"  ... and {len(restore_plan) - max_listed} more")
+    return "\n".join(lines)
+
+
+def execute_restore_plan(
+    restore_plan: List[Tuple[Path, Path, int]],
+    backup_root: Path = BACKUP_DIRECTORY,
+    max_workers: int = RESTORE_WORKERS,
+) -> int:
+    """
+    Copy every planned backup into the game directory in parallel.
+
+    The catalog is updated with each restored bundle's new size and mtime so the
+    next plan can skip it without hashing.
+
+    Args:
+        restore_plan: Plan returned by plan_restore
+        backup_root: Root backup directory
+        max_workers: Number of concurrent copies
+
+    Returns:
+        Number of bundles restored
+    """
+    if not restore_plan:
+        return 0
+
+    def restore_one(planned_copy: Tuple[Path, Path, int]) -> Tuple[Path, Path]:
+        backup_path, destination_path, _ = planned_copy
+        fast_copy_file(backup_path, destination_path)
+        return backup_path, destination_path
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(restore_plan))) as pool:
+        restored = list(pool.map(restore_one, restore_plan))
+
+    catalog = load_catalog(backup_root)
+    for backup_path, destination_path in restored:
+        if backup_path.parent.parent.name != BLOB_DIRECTORY_NAME:
+            continue
+        destination_stat = destination_path.stat()
+        catalog[destination_path.name] = {
+            "sha256": backup_path.name,
+            "size": destination_stat.st_size,
+            "mtime_ns": destination_stat.st_mtime_ns,
+        }
+    save_catalog(catalog, backup_root)
+    return len(restored)
@@ -0,0 +1,278 @@
+# Parallel bulk export of textures or 3D meshes from many asset bundles
+# Each worker streams one decoded texture or mesh at a time so memory stays bounded per worker
+
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .mesh_export import export_mesh
+from .unity_bundle import is_gallery_texture, load_unity_bundle
+
+EXPORT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+# Characters Windows doesn't allow in file names
+_UNSAFE_FILE_NAME_CHARACTERS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def make_export_file_name(
+    bundle_name: str,
+    texture_name: str,
+    path_id: int,
+    used_names: set,
+    extension: str = ".png",
+    fallback_name: str = "texture",
+) -> str:
+    """
+    Build a file name that can't collide with objects from other bundles.
+
+    Names are "<bundle stem>-<object name><extension>"; an object whose name
+    repeats inside the same bundle also gets its path_id appended.
+
+    Args:
+        bundle_name: File name of the bundle the object comes from
+        texture_name: The texture's or mesh's m_Name
+        path_id: The object's path_id, unique within the bundle
+        used_names: Names already used for this bundle, updated in place
+        extension: Extension of the exported file, with its dot
+        fallback_name: Name used when the object has no usable m_Name
+
+    Returns:
+        File name for the exported file
+    """
+    bundle_stem = Path(bundle_name).stem
+    safe_texture_name = (
+        _UNSAFE_FILE_NAME_CHARACTERS.sub("_", texture_name) or fallback_name
+    )
+    file_name = f"{bundle_stem}-{safe_texture_name}{extension}"
+    if file_name in used_names:
+        file_name = f"{bundle_stem}-{safe_texture_name}-{path_id}{extension}"
+    used_names.add(file_name)
+    return file_name
+
+
+def export_bundle_textures(
+    bundle_file_path: str,
+    export_directory: str,
+    fallback_unity_version: Optional[str] = None,
+) -> int:
+    """
+    Save every gallery texture of one bundle as PNG, decoding one texture at a time.
+
+    Runs inside a worker process, so the Unity version has to be passed along
+    instead of relying on the parent's UnityPy configuration.
+
+    Args:
+        bundle_file_path: Path to the bundle
+        export_directory: Directory to write the PNG files to
+        fallback_unity_version: UnityPy fallback version configured in the parent
+
+    Returns:
+        Number of textures exported
+    """
+    import UnityPy.config
+
+    if fallback_unity_version:
+        UnityPy.config.FALLBACK_UNITY_VERSION = fallback_unity_version
+
+    bundle_name = os.path.basename(bundle_file_path)
+    unity_environment = load_unity_bundle(bundle_file_path)
+    used_names = set()
+    exported_count = 0
+    for unity_object in unity_environment.objects:
+        if unity_object.type.name != "Texture2D":
+            continue
+        texture = unity_object.read()
+        if not is_gallery_texture(texture.m_Name):
+            continue
+        file_name = make_export_file_name(
+            bundle_name, texture.m_Name, unity_object.path_id, used_names
+        )
+        texture_image = texture.image
+        texture_image.save(os.path.join(export_directory, file_name))
+        # Drop the decoded pixels before the next texture is read
+        del texture_image, texture
+        exported_count += 1
+    return exported_count
+
+
+def export_bundle_meshes(
+    bundle_file_path: str,
+    export_directory: str,
+    mesh_format: str,
+    fallback_unity_version: Optional[str] = None,
+) -> int:
+    """
+    Save every mesh of one bundle, reading and writing one mesh at a time.
+
+    Args:
+        bundle_file_path: Path to the bundle
+        export_directory: Directory to write the mesh files to
+        mesh_format: One of mesh_export.MESH_EXPORT_FORMATS
+        fallback_unity_version: UnityPy fallback version configured in the parent
+
+    Returns:
+        Number of meshes exported
+    """
+    import UnityPy.config
+
+    if fallback_unity_version:
+        UnityPy.config.FALLBACK_UNITY_VERSION = fallback_unity_version
+
+    bundle_name = os.path.basename(bundle_file_path)
+    unity_environment = load_unity_bundle(bundle_file_path)
+    used_names = set()
+    exported_count = 0
+    for unity_object in unity_environment.objects:
+        if unity_object.type.name != "Mesh":
+            continue
+        mesh = unity_object.read()
+        file_name = make_export_file_name(
+            bundle_name, mesh.m_Name, unity_object.path_id, used_names, "", "mesh"
+        )
+        if export_mesh(mesh, os.path.join(export_directory, file_name), mesh_format):
+            exported_count += 1
+        else:
+            print(f"Skipped mesh {file_name} of {bundle_name}: it has no vertices")
+        # Drop the decoded geometry before the next mesh is read
+        del mesh
+    return exported_count
+
+
+def create_export_executor(max_workers: int = EXPORT_WORKERS) -> Executor:
+    """
+    Create the worker pool for bulk exports.
+
+    The packaged exe uses worker processes started with "spawn": main.py calls
+    multiprocessing.freeze_support, so children run the worker instead of the GUI.
+    Forking is never used, since the pool is created from a background thread of
+    the Tk process and a fork would copy locks held by other threads. Run from
+    source, spawned workers would re-execute the GUI script, so threads are used.
+
+    Args:
+        max_workers: Number of bundles exported concurrently
+
+    Returns:
+        A process or thread pool executor
+    """
+    if getattr(sys, "frozen", False):
+        return ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def start_bulk_export(
+    window,
+    bundle_paths: Dict[str, str],
+    export_directory: str,
+    max_workers: int = EXPORT_WORKERS,
+    mesh_format: Optional[str] = None,
+) -> Tuple[threading.Thread, threading.Event]:
+    """
+    Export the textures or meshes of many bundles on a background thread.
+
+    Progress is posted to the window as "-EXPORT_PROGRESS-" events with
+    (bundles done, bundle count, files exported) and the result as an
+    "-EXPORT_DONE-" event with (bundles done, files exported, failed bundles,
+    cancelled, seconds taken). Setting the returned event cancels bundles that
+    haven't started yet.
+
+    Args:
+        window: FreeSimpleGUI window that receives the events
+        bundle_paths: Bundle name -> full path for every bundle to export
+        export_directory: Directory to write the exported files to
+        max_workers: Number of bundles exported concurrently
+        mesh_format: Export meshes in this format instead of textures as PNG
+
+    Returns:
+        Tuple of (background thread, cancel event)
+    """
+    import UnityPy.config
+
+    cancel_event = threading.Event()
+    fallback_unity_version = UnityPy.config.FALLBACK_UNITY_VERSION
+
+    def post_event(event_key: str, event_value: tuple) -> None:
+        try:
+            window.write_event_value(event_key, event_value)
+        except Exception:
+            # The window was closed; the export itself still finishes or cancels
+            pass
+
+    def run_export() -> None:
+        os.makedirs(export_directory, exist_ok=True)
+        started = time.perf_counter()
+        bundles_done = 0
+        textures_exported = 0
+        failed_bundles = []
+        with create_export_executor(max_workers) as pool:
+            pending_exports = {
+                (
+                    pool.submit(
+                        export_bundle_meshes,
+                        bundle_file_path,
+                        export_directory,
+                        mesh_format,
+                        fallback_unity_version,
+                    )
+                    if mesh_format
+                    else pool.submit(
+                        export_bundle_textures,
+                        bundle_file_path,
+                        export_directory,
+                        fallback_unity_version,
+                    )
+                ): bundle_name
+                for bundle_name, bundle_file_path in bundle_paths.items()
+            }
+            remaining_exports = set(pending_exports)
+            while remaining_exports:
+                # Wake up regularly so a cancel request is handled promptly
+                finished_exports, remaining_exports = wait(
+                    remaining_exports, timeout=0.25, return_when=FIRST_COMPLETED
+                )
+                if cancel_event.is_set():
+                    for pending_export in remaining_exports:
+                        pending_export.cancel()
+
+                for finished_export in finished_exports:
+                    if finished_export.cancelled():
+                        continue
+                    try:
+                        textures_exported += finished_export.result()
+                    except Exception as e:
+                        bundle_name = pending_exports[finished_export]
+                        print(f"Error processing {bundle_name}: {e}")
+                        failed_bundles.append(bundle_name)
+                    bundles_done += 1
+                    post_event(
+                        "-EXPORT_PROGRESS-",
+                        (bundles_done, len(bundle_paths), textures_exported),
+                    )
+
+        post_event(
+            "-EXPORT_DONE-",
+            (
+                bundles_done,
+                textures_exported,
+                failed_bundles,
+                cancel_event.is_set(),
+                time.perf_counter() - started,
+            ),
+        )
+
+    export_thread = threading.Thread(target=run_export, daemon=True)
+    export_thread.start()
+    return export_thread, cancel_event
@@ -0,0 +1,371 @@
+# UnityFS bundle writer with selectable block compression
+# Blocks of the original file whose contents didn't change are copied as they are, so saving a
+# bundle after replacing one texture only compresses the blocks around that texture
+
+import struct
+from typing import List, NamedTuple, Optional, Tuple
+
+import lz4.block
+
+BUNDLE_COMPRESSIONS = ("lz4", "lz4hc", "none")
+DEFAULT_BUNDLE_COMPRESSION = "lz4"
+# Block size Unity itself uses for chunk based LZ4 bundles
+BUNDLE_BLOCK_SIZE = 0x20000
+LZ4HC_LEVEL = 9
+
+# UnityFS compression types, stored in the low bits of block and archive flags
+COMPRESSION_TYPE_MASK = 0x3F
+COMPRESSION_NONE = 0
+COMPRESSION_LZ4 = 2
+COMPRESSION_LZ4HC = 3
+COMPRESSION_TYPES = {
+    "lz4": COMPRESSION_LZ4,
+    "lz4hc": COMPRESSION_LZ4HC,
+    "none": COMPRESSION_NONE,
+}
+# Archive flags
+BLOCKS_AND_DIRECTORY_INFO_COMBINED = 0x40
+BLOCKS_INFO_AT_THE_END = 0x80
+BLOCK_INFO_NEED_PADDING_AT_START = 0x200
+USES_ASSET_BUNDLE_ENCRYPTION = 0x1400
+# Before Unity 2020.3.34, 0x200 was the encryption flag instead of header padding
+USES_ENCRYPTION_OLD = 0x200
+
+HEADER_SIZES = struct.Struct(">qIII")
+BLOCK_INFO = struct.Struct(">IIH")
+DIRECTORY_INFO = struct.Struct(">qqI")
+
+_bundle_compression = DEFAULT_BUNDLE_COMPRESSION
+
+
+class Block(NamedTuple):
+    """A data block of a UnityFS bundle."""
+
+    uncompressed_size: int
+    flags: int
+    data: bytes
+
+
+def set_bundle_compression(compression: str) -> None:
+    """
+    Change the block compression used when bundles are saved.
+
+    Args:
+        compression: One of BUNDLE_COMPRESSIONS
+
+    Raises:
+        ValueError: If the compression isn't supported
+    """
+    global _bundle_compression
+    if compression not in COMPRESSION_TYPES:
+        raise ValueError(f"Unknown bundle compression {compression!r}")
+    _bundle_compression = compression
+
+
+def get_bundle_compression() -> str:
+    """Return the block compression used when bundles are saved."""
+    return _bundle_compression
+
+
+def compress_block(data: bytes, compression_type: int) -> Tuple[bytes, int]:
+    """
+    Compress one block, storing it uncompressed when compression doesn't help.
+
+    Args:
+        data: Uncompressed block
+        compression_type: COMPRESSION_NONE, COMPRESSION_LZ4 or COMPRESSION_LZ4HC
+
+    Returns:
+        Tuple of (stored bytes, compression type they are stored with)
+    """
+    if compression_type == COMPRESSION_LZ4:
+        compressed = lz4.block.compress(data, store_size=False)
+    elif compression_type == COMPRESSION_LZ4HC:
+        compressed = lz4.block.compress(
+            data,
+            mode="high_compression",
+            compression=LZ4HC_LEVEL,
+            store_size=False,
+        )
+    else:
+        return data, COMPRESSION_NONE
+    if len(compressed) >= len(data):
+        return data, COMPRESSION_NONE
+    return compressed, compression_type
+
+
+def decompress_block(data: bytes, uncompressed_size: int, flags: int) -> bytes:
+    """
+    Decompress one block of a bundle.
+
+    Args:
+        data: Stored block
+        uncompressed_size: Size of the block once decompressed
+        flags: Block flags
+
+    Returns:
+        Uncompressed block
+
+    Raises:
+        ValueError: If the block uses a compression this writer doesn't handle
+    """
+    compression_type = flags & COMPRESSION_TYPE_MASK
+    if compression_type == COMPRESSION_NONE:
+        return data
+    if compression_type in (COMPRESSION_LZ4, COMPRESSION_LZ4HC):
+        return lz4.block.decompress(data, uncompressed_size)
+    raise ValueError(f"Unsupported block compression {compression_type}")
+
+
+def _read_string(data: bytes, position: int) -> Tuple[bytes, int]:
+    end = data.index(b"\0", position)
+    return data[position:end], end + 1
+
+
+def _align(position: int) -> int:
+    return position + (16 - position % 16) % 16
+
+
+def read_bundle_blocks(
+    bundle_data: bytes, uses_block_alignment: bool, uses_padding_flag: bool
+) -> Optional[List[Tuple[int, Block]]]:
+    """
+    List the stored data blocks of a UnityFS bundle without decompressing them.
+
+    Args:
+        bundle_data: Contents of the bundle file
+        uses_block_alignment: Header is padded to 16 bytes, as detected by UnityPy
+        uses_padding_flag: Archive flags include BlockInfoNeedPaddingAtStart
+
+    Returns:
+        (uncompressed offset, block) of every block, or None if the bundle isn't a
+        plain LZ4 or uncompressed UnityFS file
+    """
+    signature, position = _read_string(bundle_data, 0)
+    if signature != b"UnityFS":
+        return None
+    position += 4
+    for _ in range(2):
+        _, position = _read_string(bundle_data, position)
+    _, info_compressed_size, info_uncompressed_size, archive_flags = (
+        HEADER_SIZES.unpack_from(bundle_data, position)
+    )
+    position += HEADER_SIZES.size
+    if uses_block_alignment:
+        position = _align(position)
+
+    if archive_flags & BLOCKS_INFO_AT_THE_END:
+        info_position = len(bundle_data) - info_compressed_size
+    else:
+        info_position = position
+        position += info_compressed_size
+    if uses_padding_flag and archive_flags & BLOCK_INFO_NEED_PADDING_AT_START:
+        position = _align(position)
+
+    try:
+        block_info = decompress_block(
+            bundle_data[info_position : info_position + info_compressed_size],
+            info_uncompressed_size,
+            archive_flags,
+        )
+    except ValueError:
+        return None
+    (block_count,) = struct.unpack_from(">i", block_info, 16)
+    blocks = []
+    uncompressed_offset = 0
+    for block_index in range(block_count):
+        uncompressed_size, compressed_size, flags = BLOCK_INFO.unpack_from(
+            block_info, 20 + block_index * BLOCK_INFO.size
+        )
+        if flags & COMPRESSION_TYPE_MASK not in COMPRESSION_TYPES.values():
+            return None
+        blocks.append(
+            (
+                uncompressed_offset,
+                Block(
+                    uncompressed_size,
+                    flags,
+                    bundle_data[position : position + compressed_size],
+                ),
+            )
+        )
+        position += compressed_size
+        uncompressed_offset += uncompressed_size
+    return blocks
+
+
+def build_blocks(
+    file_data: bytes,
+    compression: str,
+    original_blocks: Optional[List[Tuple[int, Block]]] = None,
+) -> List[Block]:
+    """
+    Split serialized bundle contents into compressed blocks.
+
+    Leading and trailing blocks of the original file are reused when they hold the
+    same bytes, shifted by however much the changed part grew or shrank, and are
+    stored with a compression of the same kind as the one asked for.
+
+    Args:
+        file_data: Every file of the bundle, concatenated
+        compression: One of BUNDLE_COMPRESSIONS
+        original_blocks: Blocks from read_bundle_blocks, if the file existed
+
+    Returns:
+        Blocks covering file_data in order
+    """
+    compression_type = COMPRESSION_TYPES[compression]
+    # Compressed bundles also keep blocks that were stored raw as incompressible
+    reusable_types = (
+        {COMPRESSION_NONE, COMPRESSION_LZ4, COMPRESSION_LZ4HC}
+        if compression_type != COMPRESSION_NONE
+        else {COMPRESSION_NONE}
+    )
+    original_blocks = original_blocks or []
+    original_size = sum(block.uncompressed_size for _, block in original_blocks)
+
+    def block_matches(offset: int, block: Block) -> bool:
+        if offset < 0 or offset + block.uncompressed_size > len(file_data):
+            return False
+        if block.flags & COMPRESSION_TYPE_MASK not in reusable_types:
+            return False
+        # Slicing bytes and comparing is a memcmp; comparing a memoryview isn't
+        return file_data[offset : offset + block.uncompressed_size] == decompress_block(
+            block.data, block.uncompressed_size, block.flags
+        )
+
+    # Reuse blocks from the start up to the first change, and from the end back to
+    # the last change, as long as the original blocks cover the file seamlessly
+    leading_blocks = []
+    changed_start = 0
+    for offset, block in original_blocks:
+        if offset != changed_start or not block_matches(offset, block):
+            break
+        leading_blocks.append(block)
+        changed_start += block.uncompressed_size
+
+    trailing_blocks = []
+    changed_end = len(file_data)
+    shift = len(file_data) - original_size
+    for offset, block in reversed(original_blocks[len(leading_blocks) :]):
+        new_offset = offset + shift
+        if (
+            new_offset + block.uncompressed_size != changed_end
+            or new_offset < changed_start
+            or not block_matches(new_offset, block)
+        ):
+            break
+        trailing_blocks.append(block)
+        changed_end = new_offset
+    trailing_blocks.reverse()
+
+    block_size = (
+        BUNDLE_BLOCK_SIZE
+        if compression_type != COMPRESSION_NONE
+        else max(changed_end - changed_start, 1)
+    )
+    changed_blocks = []
+    for block_start in range(changed_start, changed_end, block_size):
+        block_data = file_data[block_start : min(block_start + block_size, changed_end)]
+        stored_data, stored_type = compress_block(block_data, compression_type)
+        changed_blocks.append(Block(len(block_data), stored_type, stored_data))
+    return leading_blocks + changed_blocks + trailing_blocks
+
+
+def save_bundle_file(
+    bundle_file,
+    compression: Optional[str] = None,
+    original_data: Optional[bytes] = None,
+) -> bytes:
+    """
+    Serialize a UnityPy BundleFile like BundleFile.save, with a choice of compression.
+
+    Args:
+        bundle_file: UnityPy BundleFile to write
+        compression: One of BUNDLE_COMPRESSIONS; the configured one if None
+        original_data: Contents of the file the bundle was loaded from, whose
+            unchanged blocks are reused
+
+    Returns:
+        Contents of the new bundle file
+    """
+    compression = compression or _bundle_compression
+    compression_type = COMPRESSION_TYPES[compression]
+    uses_block_alignment = getattr(bundle_file, "_uses_block_alignment", False)
+    # The newer flag layout is the one where 0x200 means header padding
+    uses_padding_flag = (
+        "BlockInfoNeedPaddingAtStart" in type(bundle_file.dataflags).__members__
+    )
+
+    from UnityPy.streams import EndianBinaryReader, EndianBinaryWriter
+
+    files = []
+    file_parts = []
+    for name, contained_file in bundle_file.files.items():
+        contained_data = (
+            contained_file.bytes
+            if isinstance(contained_file, (EndianBinaryReader, EndianBinaryWriter))
+            else contained_file.save()
+        )
+        files.append((name, contained_file.flags, len(contained_data)))
+        file_parts.append(contained_data)
+    file_data = b"".join(file_parts)
+
+    encryption_flag = (
+        USES_ASSET_BUNDLE_ENCRYPTION if uses_padding_flag else USES_ENCRYPTION_OLD
+    )
+    original_blocks = None
+    if original_data is not None and not bundle_file.dataflags & encryption_flag:
+        try:
+            original_blocks = read_bundle_blocks(
+                original_data, uses_block_alignment, uses_padding_flag
+            )
+        except (struct.error, ValueError, lz4.block.LZ4BlockError):
+            original_blocks = None
+    blocks = build_blocks(file_data, compression, original_blocks)
+
+    # Block and directory info, with the unused uncompressed data hash left empty
+    block_info = bytearray(16)
+    block_info += struct.pack(">i", len(blocks))
+    for block in blocks:
+        block_info += BLOCK_INFO.pack(
+            block.uncompressed_size, len(block.data), block.flags
+        )
+    block_info += struct.pack(">i", len(files))
+    offset = 0
+    for name, flags, size in files:
+        block_info += DIRECTORY_INFO.pack(offset, size, flags)
+        block_info += name.encode("utf-8") + b"\0"
+        offset += size
+    stored_info, info_type = compress_block(bytes(block_info), compression_type)
+
+    archive_flags = int(bundle_file.dataflags) & BLOCKS_INFO_AT_THE_END
+    if uses_padding_flag:
+        archive_flags |= int(bundle_file.dataflags) & BLOCK_INFO_NEED_PADDING_AT_START
+    archive_flags |= BLOCKS_AND_DIRECTORY_INFO_COMBINED | info_type
+
+    output = bytearray()
+    output += bundle_file.signature.encode("utf-8") + b"\0"
+    output += struct.pack(">I", bundle_file.version)
+    output += bundle_file.version_player.encode("utf-8") + b"\0"
+    output += bundle_file.version_engine.encode("utf-8") + b"\0"
+    header_position = len(output)
+    output += HEADER_SIZES.pack(0, len(stored_info), len(block_info), archive_flags)
+    if uses_block_alignment:
+        output += bytes(_align(len(output)) - len(output))
+
+    if archive_flags & BLOCKS_INFO_AT_THE_END:
+        if archive_flags & BLOCK_INFO_NEED_PADDING_AT_START:
+            output += bytes(_align(len(output)) - len(output))
+        for block in blocks:
+            output += block.data
+        output += stored_info
+    else:
+        output += stored_info
+        if archive_flags & BLOCK_INFO_NEED_PADDING_AT_START:
+            output += bytes(_align(len(output)) - len(output))
+        for block in blocks:
+            output += block.data
+
+    struct.pack_into(">q", output, header_position, len(output))
+    return bytes(output)
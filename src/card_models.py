@@ -1,7 +1,10 @@
 # Card data models and utilities for MTGA Swapper
 # Contains card representation classes and card-related utility functions
 
-from typing import Tuple, List
+from typing import Dict, Iterable, List, Tuple
+
+# Appended to the name of back faces that have no title of their own
+FLIP_SIDE_SUFFIX = "-flip-side"
 
 
 class MTGACard:
@@ -45,6 +48,72 @@ def format_card_display(card_tuple: Tuple[str, str, str, str, str]) -> str:
     return f"{name:<30} {set_code:<10} {art_type:<9} {grp_id:<8} {art_id:<8}"
 
 
+def filter_card_list(cards: List[str], search_query: str) -> List[str]:
+    """
+    Filter formatted card strings by a lowercase search query.
+
+    Args:
+        cards: List of formatted card strings
+        search_query: Lowercase text to look for anywhere in the card string
+
+    Returns:
+        Cards containing the query, in their original order
+    """
+    return [card for card in cards if search_query in card.lower()]
+
+
+def card_name_key(card: str) -> str:
+    """
+    Get the decklist lookup key of a formatted card string.
+
+    Args:
+        card: Formatted card string
+
+    Returns:
+        Normalized card name; back faces share the key of their front face
+    """
+    name = card.split(maxsplit=1)[0]
+    if name.endswith(FLIP_SIDE_SUFFIX):
+        name = name[: -len(FLIP_SIDE_SUFFIX)]
+    return name
+
+
+def build_card_name_index(cards: List[str]) -> Dict[str, List[int]]:
+    """
+    Index formatted card strings by normalized name for decklist filtering.
+
+    Args:
+        cards: List of formatted card strings
+
+    Returns:
+        Dictionary mapping each name key to the positions of its cards in the list
+    """
+    card_name_index: Dict[str, List[int]] = {}
+    for position, card in enumerate(cards):
+        card_name_index.setdefault(card_name_key(card), []).append(position)
+    return card_name_index
+
+
+def filter_cards_by_names(
+    cards: List[str], card_name_index: Dict[str, List[int]], card_names: Iterable[str]
+) -> List[str]:
+    """
+    Get every card with one of the given names, using an index of the card list.
+
+    Args:
+        cards: List of formatted card strings the index was built from
+        card_name_index: Index from build_card_name_index
+        card_names: Normalized card names, e.g. from one or more decklists
+
+    Returns:
+        Matching cards in their original order
+    """
+    positions = []
+    for card_name in set(card_names):
+        positions.extend(card_name_index.get(card_name, ()))
+    return [cards[position] for position in sorted(positions)]
+
+
 def sort_cards_by_attribute(cards: List[str], sort_key: str) -> List[str]:
     """
     Sort a list of formatted card strings by the specified attribute.
@@ -0,0 +1,248 @@
+# Bulk operations for the Raw_ArtCropDatabase Crops table
+# Imports, exports and templates are written as batched UPSERTs in a single transaction
+
+import csv
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# Field names used by changes.json and by crop import/export files
+CROP_FIELDS = ("path", "format", "x", "y", "z", "w", "generated")
+CROP_PATH_ROOT = "Assets/Core/CardArt/"
+DEFAULT_CROP_SUFFIX = "_AIF"
+# Largest start-end range parse_art_id_list expands, so a typo can't build millions of ids
+MAX_ART_ID_RANGE = 10000
+
+UPSERT_CROP_SQL = """
+    INSERT INTO Crops (Path, Format, X, Y, Z, W, Generated)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(Path, Format) DO UPDATE SET
+        X = excluded.X,
+        Y = excluded.Y,
+        Z = excluded.Z,
+        W = excluded.W,
+        Generated = excluded.Generated
+"""
+
+
+def get_crop_path_prefix(art_id: str) -> str:
+    """
+    Build the Crops.Path prefix shared by every crop entry of an ArtId.
+    Path format: Assets/Core/CardArt/001000/001155_AIF
+
+    Args:
+        art_id: ArtId, with or without leading zeros
+
+    Returns:
+        Path prefix such as "Assets/Core/CardArt/001000/001155"
+    """
+    art_id_padded = str(art_id).zfill(6)
+    folder = art_id_padded[:3] + "000"
+    return f"{CROP_PATH_ROOT}{folder}/{art_id_padded}"
+
+
+def get_crop_path_range(art_id: str) -> Tuple[str, str]:
+    """
+    Return the (inclusive, exclusive) Path bounds of an ArtId's crop entries.
+
+    Querying with ``Path >= ? AND Path < ?`` lets SQLite seek on the
+    (Path, Format) PRIMARY KEY instead of scanning the table.
+    """
+    path_prefix = get_crop_path_prefix(art_id)
+    # Smallest string greater than every string starting with the prefix
+    return path_prefix, path_prefix[:-1] + chr(ord(path_prefix[-1]) + 1)
+
+
+def parse_art_id_list(text: str) -> List[str]:
+    """
+    Parse a list of ArtIds such as "1155, 1160-1170 2001".
+
+    Args:
+        text: ArtIds separated by commas or whitespace, ranges written as start-end
+
+    Returns:
+        List of ArtIds without leading zeros, in input order and without duplicates
+
+    Raises:
+        ValueError: If a token isn't a number or a range is reversed or too large
+    """
+    art_ids = {}
+    for token in text.replace(",", " ").split():
+        if "-" in token:
+            start, end = (int(part) for part in token.split("-", 1))
+            if not 0 <= end - start < MAX_ART_ID_RANGE:
+                raise ValueError(
+                    f"range {token} must be ascending and span at most "
+                    f"{MAX_ART_ID_RANGE} ArtIds"
+                )
+            for art_id in range(start, end + 1):
+                art_ids[str(art_id)] = None
+        else:
+            art_ids[str(int(token))] = None
+    return list(art_ids)
+
+
+def validate_crop_record(record: dict) -> Tuple:
+    """
+    Validate a crop record and convert it to a Crops row tuple.
+
+    Args:
+        record: Dictionary with the CROP_FIELDS keys
+
+    Returns:
+        Tuple of (Path, Format, X, Y, Z, W, Generated)
+
+    Raises:
+        ValueError: If a field is missing or has an invalid value
+    """
+    missing_fields = [field for field in CROP_FIELDS if record.get(field) in (None, "")]
+    if missing_fields:
+        raise ValueError(f"missing {', '.join(missing_fields)}")
+
+    path = str(record["path"]).strip()
+    if not path.startswith(CROP_PATH_ROOT):
+        raise ValueError(f"path must start with {CROP_PATH_ROOT}")
+
+    x, y, z, w = (float(record[field]) for field in ("x", "y", "z", "w"))
+    generated = int(float(record["generated"]))
+    return (path, str(record["format"]).strip(), x, y, z, w, generated)
+
+
+def upsert_crop_records(
+    cursor: sqlite3.Cursor, records: Iterable[dict]
+) -> Tuple[List[Tuple], List[str]]:
+    """
+    Insert or update crop records with one executemany UPSERT.
+
+    Invalid records are skipped and reported. The statement joins the connection's
+    current transaction; committing is left to the caller so a bulk operation is
+    applied or discarded as a whole.
+
+    Args:
+        cursor: Crop database cursor
+        records: Crop records keyed by CROP_FIELDS
+
+    Returns:
+        Tuple of (rows written, validation error messages)
+    """
+    started = time.perf_counter()
+    rows_by_key = {}
+    errors = []
+    for index, record in enumerate(records, start=1):
+        try:
+            row = validate_crop_record(record)
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append(f"Record {index}: {e}")
+            continue
+        # Last record wins when a file lists the same Path and Format twice
+        rows_by_key[row[:2]] = row
+
+    rows = list(rows_by_key.values())
+    if rows:
+        cursor.executemany(UPSERT_CROP_SQL, rows)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Upserted {len(rows)} crop row(s) in {elapsed:.2f}s "
+        f"({len(rows) / elapsed if elapsed else 0:.0f} rows/s), "
+        f"{len(errors)} invalid record(s) skipped"
+    )
+    return rows, errors
+
+
+def fetch_crop_records(cursor: sqlite3.Cursor, art_ids: Iterable[str]) -> List[dict]:
+    """
+    Read the crop entries of every given ArtId.
+
+    Args:
+        cursor: Crop database cursor
+        art_ids: ArtIds to export
+
+    Returns:
+        List of crop records keyed by CROP_FIELDS
+    """
+    records = []
+    for art_id in art_ids:
+        cursor.execute(
+            "SELECT Path, Format, X, Y, Z, W, Generated FROM Crops WHERE Path >= ? AND Path < ?",
+            get_crop_path_range(art_id),
+        )
+        records.extend(dict(zip(CROP_FIELDS, row)) for row in cursor.fetchall())
+    return records
+
+
+def build_template_records(
+    template: dict, art_ids: Iterable[str], suffix: str = DEFAULT_CROP_SUFFIX
+) -> List[dict]:
+    """
+    Create one crop record per ArtId from a single crop template.
+
+    Args:
+        template: Dictionary with format, x, y, z, w and generated
+        art_ids: ArtIds to apply the template to
+        suffix: Path suffix after the ArtId
+
+    Returns:
+        List of crop records keyed by CROP_FIELDS
+    """
+    return [
+        {**template, "path": f"{get_crop_path_prefix(art_id)}{suffix}"}
+        for art_id in art_ids
+    ]
+
+
+def read_crop_file(file_path: str) -> List[dict]:
+    """
+    Read crop records from a CSV or JSON file.
+
+    CSV files need a header row with the CROP_FIELDS columns. JSON files may hold a
+    list of records, the changes.json "crops" mapping of ArtId -> records, or a
+    whole changes.json file.
+
+    Args:
+        file_path: Path to the .csv or .json file
+
+    Returns:
+        List of crop records
+    """
+    if Path(file_path).suffix.lower() == ".csv":
+        with open(file_path, "r", newline="", encoding="utf-8") as f:
+            return [
+                {key.strip().lower(): value for key, value in row.items() if key}
+                for row in csv.DictReader(f)
+            ]
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("crops", data)
+        return [record for records in data.values() for record in records]
+    return data
+
+
+def write_crop_file(records: List[dict], file_path: str) -> None:
+    """
+    Write crop records to a CSV or JSON file.
+
+    JSON exports use the changes.json "crops" layout so they can be merged into a
+    preset by hand.
+
+    Args:
+        records: Crop records keyed by CROP_FIELDS
+        file_path: Path to the .csv or .json file
+    """
+    if Path(file_path).suffix.lower() == ".csv":
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CROP_FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        return
+
+    crops_by_art_id: Dict[str, List[dict]] = {}
+    for record in records:
+        art_id = record["path"].split("/")[-1].split("_")[0].lstrip("0")
+        crops_by_art_id.setdefault(art_id, []).append(record)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump({"crops": crops_by_art_id}, f, indent=4)
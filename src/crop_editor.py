@@ -24,6 +24,7 @@
 # - Edit crop values (X, Y, Z, W), format type, and generated flag
 # - Changes are saved directly to the SQLite database
 # - Commit or rollback changes as needed
+# - Bulk import/export crops as CSV or JSON and apply one crop to many ArtIds
 #
 # Usage:
 #   from src.crop_editor import create_crop_editor_window
@@ -31,15 +32,41 @@
 
 import os
 import sqlite3
+import time
 import FreeSimpleGUI as sg
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import json
 
+from src.crop_bulk import (
+    build_template_records,
+    fetch_crop_records,
+    get_crop_path_prefix,
+    get_crop_path_range,
+    parse_art_id_list,
+    read_crop_file,
+    upsert_crop_records,
+    write_crop_file,
+)
+from src.tracing import connect_database
+
 
 class ArtCropData:
     """Represents a single art crop entry from the Crops table."""
 
+    __slots__ = (
+        "path",
+        "format_type",
+        "x",
+        "y",
+        "z",
+        "w",
+        "generated",
+        "row_id",
+        "original_path",
+        "original_format",
+    )
+
     def __init__(
         self,
         path: str,
@@ -78,46 +105,33 @@ class ArtCropData:
         return f"ArtCropData({self.path}, {self.format_type}, {self.x}, {self.y}, {self.z}, {self.w}, {self.generated})"
 
 
-def load_art_crop_database(
+def open_art_crop_database(
     crop_db_path: str,
-) -> Tuple[List[ArtCropData], sqlite3.Connection, sqlite3.Cursor]:
+) -> Tuple[Optional[sqlite3.Connection], Optional[sqlite3.Cursor]]:
     """
-    Load the Raw_ArtCropDatabase SQLite file and return all crop entries.
+    Open the Raw_ArtCropDatabase SQLite file without reading any crop rows.
+
+    Rows are loaded per ArtId with load_crops_by_art_id, so opening the editor
+    costs the same regardless of the table size.
 
     Args:
         crop_db_path: Path to the Raw_ArtCropDatabase SQLite file
 
     Returns:
-        Tuple of (List of ArtCropData objects, connection, cursor)
+        Tuple of (connection, cursor), or (None, None) if the file is not a crop database
     """
-    crop_data = []
-
     try:
-        conn = sqlite3.connect(crop_db_path)
+        conn = connect_database(crop_db_path)
         cursor = conn.cursor()
 
-        # Query all rows from the Crops table
-        cursor.execute("SELECT Path, Format, X, Y, Z, W, Generated FROM Crops")
-        rows = cursor.fetchall()
-
-        for row in rows:
-            crop_entry = ArtCropData(
-                path=row[0],
-                format_type=row[1],
-                x=row[2],
-                y=row[3],
-                z=row[4],
-                w=row[5],
-                generated=row[6],
-            )
-            crop_data.append(crop_entry)
-
-        return crop_data, conn, cursor
+        # Fail early on a wrong or corrupt file
+        cursor.execute("SELECT 1 FROM Crops LIMIT 1")
+        return conn, cursor
 
     except Exception as e:
         print(f"Error loading art crop database: {e}")
         sg.popup_error(f"Failed to load art crop database: {e}", title="Load Error")
-        return [], None, None
+        return None, None
 
 
 def update_crop_entry(
@@ -214,20 +228,67 @@ def find_art_id_by_card_name(
         return []
 
 
-def filter_crops_by_art_id(
-    crop_data: List[ArtCropData], art_id: str
-) -> List[ArtCropData]:
+def list_expansion_codes(database_cursor: sqlite3.Cursor) -> List[str]:
     """
-    Filter crop entries that contain the given ArtId in their path.
+    Return every set code in the card database, for the set selector.
 
     Args:
-        crop_data: List of all crop data
-        art_id: ArtId to search for
+        database_cursor: SQLite cursor for the card database
 
     Returns:
-        Filtered list of crop entries
+        Sorted list of ExpansionCodes
+    """
+    try:
+        database_cursor.execute(
+            "SELECT DISTINCT ExpansionCode FROM Cards WHERE ExpansionCode != '' "
+            "ORDER BY ExpansionCode"
+        )
+        return [expansion_code for (expansion_code,) in database_cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Error listing sets: {e}")
+        return []
+
+
+def find_art_ids_by_expansion_code(
+    expansion_code: str, database_cursor: sqlite3.Cursor
+) -> List[str]:
     """
-    return [entry for entry in crop_data if art_id.zfill(6) in entry.path]
+    Return the ArtIds of every card in a set.
+
+    Args:
+        expansion_code: ExpansionCode of the set
+        database_cursor: SQLite cursor for the card database
+
+    Returns:
+        Sorted list of ArtIds without leading zeros
+    """
+    database_cursor.execute(
+        "SELECT DISTINCT ArtId FROM Cards WHERE ExpansionCode = ? AND ArtId "
+        "ORDER BY ArtId",
+        (expansion_code,),
+    )
+    return [str(art_id) for (art_id,) in database_cursor.fetchall()]
+
+
+def load_crops_by_art_id(cursor: sqlite3.Cursor, art_id: str) -> List[ArtCropData]:
+    """
+    Load the crop entries of a single ArtId.
+
+    Uses a Path range scan so SQLite can seek on the (Path, Format) PRIMARY KEY
+    instead of reading the whole table.
+
+    Args:
+        cursor: Crop database cursor
+        art_id: ArtId to load
+
+    Returns:
+        List of crop entries for the ArtId
+    """
+    cursor.execute(
+        "SELECT Path, Format, X, Y, Z, W, Generated FROM Crops WHERE Path >= ? AND Path < ?",
+        get_crop_path_range(art_id),
+    )
+    return [ArtCropData(*row) for row in cursor.fetchall()]
 
 
 def extract_art_id_from_path(path: str) -> Optional[str]:
@@ -262,13 +323,23 @@ def save_crop_change_to_json(entry: ArtCropData, changes_file_path: str) -> bool
     Returns:
         True if successful, False otherwise
     """
-    try:
-        # Extract ArtId from path
-        art_id = extract_art_id_from_path(entry.path)
-        if not art_id:
-            print(f"Could not extract ArtId from path: {entry.path}")
-            return False
+    return save_crop_changes_to_json([entry], changes_file_path)
+
+
+def save_crop_changes_to_json(
+    entries: List[ArtCropData], changes_file_path: str
+) -> bool:
+    """
+    Save several crop changes to the changes.json file with one read and one write.
 
+    Args:
+        entries: The crop entries that were modified
+        changes_file_path: Path to the changes.json file
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
         # Load existing changes
         if os.path.exists(changes_file_path):
             with open(changes_file_path, "r") as f:
@@ -280,35 +351,43 @@ def save_crop_change_to_json(entry: ArtCropData, changes_file_path: str) -> bool
         if "crops" not in changes_data:
             changes_data["crops"] = {}
 
-        # Store crop change under ArtId
-        if art_id not in changes_data["crops"]:
-            changes_data["crops"][art_id] = []
-
-        # Create crop entry dict
-        crop_dict = {
-            "path": entry.path,
-            "format": entry.format_type,
-            "x": entry.x,
-            "y": entry.y,
-            "z": entry.z,
-            "w": entry.w,
-            "generated": entry.generated,
-        }
-
-        # Check if this crop already exists (by path and format)
-        existing_crops = changes_data["crops"][art_id]
-        existing_index = None
-        for i, crop in enumerate(existing_crops):
-            if crop["path"] == entry.path and crop["format"] == entry.format_type:
-                existing_index = i
-                break
-
-        if existing_index is not None:
-            # Update existing
-            existing_crops[existing_index] = crop_dict
-        else:
-            # Add new
-            existing_crops.append(crop_dict)
+        # Index existing crops by (path, format) so each entry is an O(1) lookup
+        crop_positions = {}
+        for art_id, crops in changes_data["crops"].items():
+            for i, crop in enumerate(crops):
+                crop_positions[(crop["path"], crop["format"])] = (art_id, i)
+
+        for entry in entries:
+            # Extract ArtId from path
+            art_id = extract_art_id_from_path(entry.path)
+            if not art_id:
+                print(f"Could not extract ArtId from path: {entry.path}")
+                continue
+
+            # Create crop entry dict
+            crop_dict = {
+                "path": entry.path,
+                "format": entry.format_type,
+                "x": entry.x,
+                "y": entry.y,
+                "z": entry.z,
+                "w": entry.w,
+                "generated": entry.generated,
+            }
+
+            # Check if this crop already exists (by path and format)
+            position = crop_positions.get((entry.path, entry.format_type))
+            if position is not None:
+                # Update existing
+                changes_data["crops"][position[0]][position[1]] = crop_dict
+            else:
+                # Add new
+                existing_crops = changes_data["crops"].setdefault(art_id, [])
+                crop_positions[(entry.path, entry.format_type)] = (
+                    art_id,
+                    len(existing_crops),
+                )
+                existing_crops.append(crop_dict)
 
         # Save back to file
         with open(changes_file_path, "w") as f:
@@ -409,18 +488,18 @@ def create_crop_editor_window(
         )
         return
 
-    # Load the crop database
-    crop_data, crop_conn, crop_cursor = load_art_crop_database(crop_db_path)
+    # Open the crop database; rows are only loaded for the selected ArtId
+    crop_conn, crop_cursor = open_art_crop_database(crop_db_path)
 
-    if not crop_data or crop_conn is None:
+    if crop_conn is None:
         sg.popup_error(
             "No crop data loaded. The database might be empty or corrupt.",
             title="Load Error",
         )
         return
 
-    # Keep track of filtered results
-    filtered_crops = crop_data.copy()
+    # Crop entries of the currently selected ArtId
+    filtered_crops = []
     current_art_id = None
 
     # Define the layout
@@ -457,7 +536,7 @@ def create_crop_editor_window(
             )
         ],
         [
-            sg.Text(f"Total Entries: {len(crop_data)}", key="-TOTAL_COUNT-"),
+            sg.Text("Select a card to view its crop entries", key="-TOTAL_COUNT-"),
             sg.Text("", key="-FILTERED_COUNT-", size=(30, 1)),
         ],
     ]
@@ -485,10 +564,29 @@ def create_crop_editor_window(
         ],
     ]
 
+    bulk_frame = [
+        [
+            sg.Button("Import Crops", key="-BULK_IMPORT-"),
+            sg.Button("Export Crops", key="-BULK_EXPORT-"),
+            sg.Button("Apply Edit Fields to ArtIds", key="-BULK_TEMPLATE-"),
+        ],
+        [
+            sg.Text("Set:"),
+            sg.Combo(
+                list_expansion_codes(database_cursor),
+                key="-BULK_SET-",
+                size=(10, 1),
+                readonly=True,
+            ),
+            sg.Button("Apply Edit Fields to Set", key="-BULK_TEMPLATE_SET-"),
+        ],
+    ]
+
     layout = [
         [sg.Frame("Search", search_frame, expand_x=True)],
         [sg.Frame("Crop Entries", crop_frame, expand_x=True)],
         [sg.Frame("Edit Entry", edit_frame, expand_x=True)],
+        [sg.Frame("Bulk Operations", bulk_frame, expand_x=True)],
         [
             sg.Button("Apply Changes to Database", key="-SAVE_DB-"),
             sg.Button("Reload Database", key="-RELOAD_DB-"),
@@ -531,7 +629,7 @@ def create_crop_editor_window(
         window["-EDIT_W-"].update(str(entry.w))
         window["-EDIT_GENERATED-"].update(str(entry.generated))
 
-    # Initial display of all entries
+    # Nothing is shown until a card is selected
     update_crop_table(filtered_crops)
 
     # Event loop
@@ -567,10 +665,12 @@ def create_crop_editor_window(
                 art_id = selected.split("(ArtId: ")[1].rstrip(")")
                 current_art_id = art_id
 
-                # Filter crop data by this ArtId
-                filtered_crops = filter_crops_by_art_id(crop_data, art_id)
+                # Load only this ArtId's crop entries
+                filtered_crops = load_crops_by_art_id(crop_cursor, art_id)
                 update_crop_table(filtered_crops)
+                window["-TOTAL_COUNT-"].update(f"ArtId: {art_id}")
                 clear_edit_fields()
+                selected_entry_index = None
 
         if event == "-CROP_TABLE-":
             # User selected a row in the crop table
@@ -605,7 +705,7 @@ def create_crop_editor_window(
                         update_crop_table(filtered_crops)
 
                         sg.popup_ok(
-                            "Entry updated! Click 'Save Database' to commit changes to file.",
+                            "Entry updated! Click 'Apply Changes to Database' to commit changes to file.",
                             auto_close=True,
                             auto_close_duration=2,
                         )
@@ -641,9 +741,7 @@ def create_crop_editor_window(
                 duplicate_path = filtered_crops[selected_entry_index].path
             elif current_art_id:
                 # Build the path from the current ArtId
-                art_id_padded = current_art_id.zfill(6)
-                folder = art_id_padded[:3] + "000"
-                duplicate_path = f"Assets/Core/CardArt/{folder}/{art_id_padded}_AIF"
+                duplicate_path = f"{get_crop_path_prefix(current_art_id)}_AIF"
             else:
                 sg.popup_error(
                     "Please select a card or a crop entry first", title="No Selection"
@@ -749,19 +847,15 @@ def create_crop_editor_window(
                                 # Save to changes.json
                                 save_crop_change_to_json(new_entry, changes_file_path)
 
-                                # Add to our data structures
-                                crop_data.append(new_entry)
+                                # Add to the visible entries
                                 filtered_crops.append(new_entry)
 
                                 # Update the display
                                 update_crop_table(filtered_crops)
-                                window["-TOTAL_COUNT-"].update(
-                                    f"Total Entries: {len(crop_data)}"
-                                )
 
                                 sg.popup_ok(
                                     f"New entry created with Path '{duplicate_path}' and Format '{new_format}'.\n"
-                                    "Click 'Save Database' to commit changes to file.",
+                                    "Click 'Apply Changes to Database' to commit changes to file.",
                                     auto_close=True,
                                     auto_close_duration=3,
                                 )
@@ -810,21 +904,17 @@ def create_crop_editor_window(
                         # Remove from changes.json
                         remove_crop_change_from_json(entry, changes_file_path)
 
-                        # Remove from our data structures
-                        crop_data.remove(entry)
+                        # Remove from the visible entries
                         filtered_crops.remove(entry)
 
                         # Clear edit fields and update display
                         clear_edit_fields()
                         selected_entry_index = None
                         update_crop_table(filtered_crops)
-                        window["-TOTAL_COUNT-"].update(
-                            f"Total Entries: {len(crop_data)}"
-                        )
 
                         sg.popup_ok(
                             "Entry deleted.\n"
-                            "Click 'Save Database' to commit changes to file.",
+                            "Click 'Apply Changes to Database' to commit changes to file.",
                             auto_close=True,
                             auto_close_duration=2,
                         )
@@ -838,6 +928,109 @@ def create_crop_editor_window(
                     "Please select an entry from the table first", title="No Selection"
                 )
 
+        if event in ("-BULK_IMPORT-", "-BULK_TEMPLATE-", "-BULK_TEMPLATE_SET-"):
+            try:
+                if event == "-BULK_IMPORT-":
+                    import_path = sg.popup_get_file(
+                        "Select a crop file to import",
+                        file_types=(("Crop Files", "*.csv *.json"),),
+                    )
+                    if not import_path:
+                        continue
+                    crop_records = read_crop_file(import_path)
+                else:
+                    template = {
+                        "format": values["-EDIT_FORMAT-"],
+                        "x": values["-EDIT_X-"],
+                        "y": values["-EDIT_Y-"],
+                        "z": values["-EDIT_Z-"],
+                        "w": values["-EDIT_W-"],
+                        "generated": values["-EDIT_GENERATED-"],
+                    }
+                    if event == "-BULK_TEMPLATE_SET-":
+                        expansion_code = values["-BULK_SET-"]
+                        if not expansion_code:
+                            sg.popup_error("Select a set first", title="No Set")
+                            continue
+                        template_art_ids = find_art_ids_by_expansion_code(
+                            expansion_code, database_cursor
+                        )
+                        if (
+                            sg.popup_yes_no(
+                                f"Apply the edit fields to all {len(template_art_ids)} "
+                                f"ArtIds of {expansion_code}?",
+                                title="Apply Template",
+                            )
+                            != "Yes"
+                        ):
+                            continue
+                    else:
+                        art_id_text = sg.popup_get_text(
+                            "ArtIds to apply the edit fields to (e.g. 1155, 1160-1170)",
+                            title="Apply Template",
+                        )
+                        if not art_id_text:
+                            continue
+                        template_art_ids = parse_art_id_list(art_id_text)
+                    crop_records = build_template_records(template, template_art_ids)
+
+                started = time.perf_counter()
+                applied_rows, errors = upsert_crop_records(crop_cursor, crop_records)
+                save_crop_changes_to_json(
+                    [ArtCropData(*row) for row in applied_rows], changes_file_path
+                )
+                elapsed = time.perf_counter() - started
+
+                # Refresh the visible ArtId in case it was part of the batch
+                if current_art_id:
+                    filtered_crops = load_crops_by_art_id(crop_cursor, current_art_id)
+                    update_crop_table(filtered_crops)
+                    clear_edit_fields()
+                    selected_entry_index = None
+
+                report = (
+                    f"{len(applied_rows)} crop row(s) written in {elapsed:.2f}s "
+                    f"({len(applied_rows) / elapsed if elapsed else 0:.0f} rows/s).\n"
+                    f"{len(errors)} invalid record(s) skipped."
+                )
+                if errors:
+                    report += "\n\n" + "\n".join(errors[:10])
+                sg.popup_ok(
+                    report
+                    + "\n\nClick 'Apply Changes to Database' to commit changes to file.",
+                    title="Bulk Crop Update",
+                )
+            except (OSError, ValueError, sqlite3.Error) as e:
+                sg.popup_error(f"Bulk crop update failed: {e}", title="Bulk Error")
+
+        if event == "-BULK_EXPORT-":
+            art_id_text = sg.popup_get_text(
+                "ArtIds to export (e.g. 1155, 1160-1170)",
+                default_text=current_art_id or "",
+                title="Export Crops",
+            )
+            if not art_id_text:
+                continue
+            export_path = sg.popup_get_file(
+                "Save crops as",
+                save_as=True,
+                default_extension=".csv",
+                file_types=(("CSV", "*.csv"), ("JSON", "*.json")),
+            )
+            if not export_path:
+                continue
+            try:
+                crop_records = fetch_crop_records(
+                    crop_cursor, parse_art_id_list(art_id_text)
+                )
+                write_crop_file(crop_records, export_path)
+                sg.popup_ok(
+                    f"Exported {len(crop_records)} crop row(s) to {export_path}",
+                    title="Export Crops",
+                )
+            except (OSError, ValueError, sqlite3.Error) as e:
+                sg.popup_error(f"Failed to export crops: {e}", title="Export Error")
+
         if event == "-SAVE_DB-":
             # Commit all changes to the database file
             if (
@@ -866,16 +1059,17 @@ def create_crop_editor_window(
                 )
                 == "Yes"
             ):
-                # Close current connection and reload
-                crop_conn.rollback()  # Discard any uncommitted changes
-                crop_conn.close()
+                # Discard any uncommitted changes and refresh only the visible ArtId
+                crop_conn.rollback()
 
-                crop_data, crop_conn, crop_cursor = load_art_crop_database(crop_db_path)
-                filtered_crops = crop_data.copy()
+                filtered_crops = (
+                    load_crops_by_art_id(crop_cursor, current_art_id)
+                    if current_art_id
+                    else []
+                )
                 update_crop_table(filtered_crops)
                 clear_edit_fields()
                 selected_entry_index = None
-                window["-TOTAL_COUNT-"].update(f"Total Entries: {len(crop_data)}")
                 sg.popup_ok("Database reloaded", auto_close=True, auto_close_duration=1)
 
     # Clean up: close database connection
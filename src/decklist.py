@@ -70,9 +70,7 @@ def create_decklist_import_window() -> Optional[Set[str]]:
                     map(
                         lambda line: normalize_card_name_for_database(
                             "".join(line.split("(")[0].split(" ")[1:]).strip().lower()
-                        )[
-                            :15
-                        ],  # Take first 15 characters for matching
+                        ),
                         numbered_card_lines,
                     )
                 )
@@ -86,7 +84,7 @@ def create_decklist_import_window() -> Optional[Set[str]]:
                     map(
                         lambda line: normalize_card_name_for_database(
                             line.strip().lower()
-                        )[:15],
+                        ),
                         filter(lambda line: line != "", raw_card_lines),
                     )
                 )
@@ -134,23 +132,57 @@ def normalize_card_name_for_database(card_name_text: str) -> str:
     """
     return re.sub(r"[^a-zA-Z0-9/]", "", card_name_text)
 
-def create_search_tokens_window(database_cursor) -> sg.Window:
+
+def create_search_tokens_window(
+    placeholder_image_data: bytes, page_size: int, images_per_row: int = 6
+) -> sg.Window:
     """
-    Create the search tokens window.
+    Create the search tokens window with a grid of token previews.
+
+    Args:
+        placeholder_image_data: PNG shown in a grid slot until its preview loads
+        page_size: Number of grid slots
+        images_per_row: Grid slots per row
 
     Returns:
         The search tokens window instance.
     """
+    token_buttons = [
+        sg.pin(
+            sg.Button(
+                image_data=placeholder_image_data,
+                key=f"-TOKEN-{slot}-",
+                pad=(5, 5),
+                visible=False,
+            )
+        )
+        for slot in range(page_size)
+    ]
     layout = [
         [sg.Text("Search Tokens by Artist Name", font=("Segoe UI", 12))],
-        [sg.InputText(key="-SEARCH_INPUT-", size=(40, 1))],
-        [sg.Button("Search", key="-SEARCH_BUTTON-")],
-        [sg.Listbox(values=[], key="-RESULT_LIST-", size=(40, 10), enable_events=True)],
+        [
+            sg.InputText(key="-SEARCH_INPUT-", size=(40, 1)),
+            sg.Button("Search", key="-SEARCH_BUTTON-", bind_return_key=True),
+        ],
+        [sg.Text("", key="-RESULT_COUNT-", size=(60, 1))],
+        [
+            sg.Column(
+                [
+                    token_buttons[i : i + images_per_row]
+                    for i in range(0, len(token_buttons), images_per_row)
+                ],
+                scrollable=True,
+                vertical_scroll_only=True,
+                size=(1000, 500),
+            )
+        ],
+        [
+            sg.Button("Previous Page", key="-TOKEN_PREV_PAGE-"),
+            sg.Text("", key="-TOKEN_PAGE-", size=(30, 1)),
+            sg.Button("Next Page", key="-TOKEN_NEXT_PAGE-"),
+        ],
         [sg.Button("Cancel", key="-CANCEL_BUTTON-")],
-
     ]
-    window = sg.Window("Search Tokens", layout, modal=True)
-    
+    window = sg.Window("Search Tokens", layout, modal=True, finalize=True)
 
     return window
-
@@ -0,0 +1,309 @@
+# Binary delta patches between two releases of the executable
+# A patch is a list of "copy bytes from the old file" and "insert new bytes" instructions,
+# compressed with LZMA; only the parts that changed between releases are shipped
+#
+# Usage:
+#   python -m src.delta_patch create <old exe> <new exe> <patch file>
+#   python -m src.delta_patch apply <old exe> <patch file> <output file>
+
+import argparse
+import hashlib
+import lzma
+import re
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+PATCH_MAGIC = b"MTGAPTCH"
+PATCH_FORMAT_VERSION = 1
+# Magic, format version, old size, old sha256, new size, new sha256
+PATCH_HEADER = struct.Struct(">8sBQ32sQ32s")
+COPY_RECORD = struct.Struct(">QQ")
+INSERT_RECORD = struct.Struct(">I")
+COPY_OPCODE = b"C"
+INSERT_OPCODE = b"I"
+END_OPCODE = b"E"
+
+# Content-defined chunking: a chunk ends at the first boundary pattern found at least
+# MIN_CHUNK_SIZE bytes in. Boundaries depend only on nearby bytes, so data that moved
+# between releases is still cut the same way and found again in the old file
+CHUNK_BOUNDARY = re.compile(rb"[\x00-\x0f][\xf0-\xff]")
+MIN_CHUNK_SIZE = 256
+MAX_CHUNK_SIZE = 16 * 1024
+# Bytes read or written at a time while applying a patch
+APPLY_BUFFER_SIZE = 1024 * 1024
+
+
+class PatchError(ValueError):
+    """Raised when a patch is malformed or doesn't belong to the given file."""
+
+
+def split_chunks(data: bytes) -> Iterator[Tuple[int, int]]:
+    """
+    Cut data into content-defined chunks.
+
+    Args:
+        data: Bytes to split
+
+    Yields:
+        (start, end) of every chunk, covering the data without gaps
+    """
+    chunk_start = 0
+    data_size = len(data)
+    while chunk_start < data_size:
+        boundary = CHUNK_BOUNDARY.search(
+            data,
+            chunk_start + MIN_CHUNK_SIZE,
+            min(chunk_start + MAX_CHUNK_SIZE, data_size),
+        )
+        chunk_end = boundary.end() if boundary else chunk_start + MAX_CHUNK_SIZE
+        chunk_end = min(chunk_end, data_size)
+        yield chunk_start, chunk_end
+        chunk_start = chunk_end
+
+
+def _common_prefix_size(first: memoryview, second: memoryview) -> int:
+    """Length of the common prefix of two buffers, found by halving."""
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def diff_bytes(old_data: bytes, new_data: bytes) -> List[Tuple]:
+    """
+    Describe new_data as copies from old_data and inserted bytes.
+
+    Args:
+        old_data: Contents of the installed release
+        new_data: Contents of the new release
+
+    Returns:
+        List of ("copy", old offset, size) and ("insert", new offset, size) tuples
+        in new_data order
+    """
+    old_chunks: Dict[bytes, int] = {}
+    for chunk_start, chunk_end in split_chunks(old_data):
+        old_chunks.setdefault(old_data[chunk_start:chunk_end], chunk_start)
+
+    old_view = memoryview(old_data)
+    new_view = memoryview(new_data)
+    operations = []
+    # Bytes up to here are covered by the operations
+    covered = 0
+    for chunk_start, chunk_end in split_chunks(new_data):
+        if chunk_end <= covered:
+            continue
+        old_offset = old_chunks.get(new_data[chunk_start:chunk_end])
+        if old_offset is None:
+            continue
+        if chunk_start < covered:
+            # A previous copy already ran into this chunk
+            old_offset += covered - chunk_start
+            chunk_start = covered
+
+        # Grow the match backwards over bytes that would otherwise be inserted
+        backward_size = min(chunk_start - covered, old_offset)
+        while backward_size and (old_data[old_offset - 1] == new_data[chunk_start - 1]):
+            old_offset -= 1
+            chunk_start -= 1
+            backward_size -= 1
+        # and forwards past the chunk
+        match_end = chunk_end + _common_prefix_size(
+            new_view[chunk_end:],
+            old_view[old_offset + chunk_end - chunk_start :],
+        )
+
+        if chunk_start > covered:
+            operations.append(("insert", covered, chunk_start - covered))
+        previous = operations[-1] if operations else None
+        if (
+            previous
+            and previous[0] == "copy"
+            and previous[1] + previous[2] == old_offset
+        ):
+            operations[-1] = (
+                "copy",
+                previous[1],
+                previous[2] + match_end - chunk_start,
+            )
+        else:
+            operations.append(("copy", old_offset, match_end - chunk_start))
+        covered = match_end
+
+    if covered < len(new_data):
+        operations.append(("insert", covered, len(new_data) - covered))
+    return operations
+
+
+def create_patch(old_path: str, new_path: str, patch_path: str) -> int:
+    """
+    Write a patch that turns the old file into the new one.
+
+    Args:
+        old_path: Executable of the previous release
+        new_path: Executable of the new release
+        patch_path: Output patch file
+
+    Returns:
+        Size of the patch file in bytes
+    """
+    with open(old_path, "rb") as old_file:
+        old_data = old_file.read()
+    with open(new_path, "rb") as new_file:
+        new_data = new_file.read()
+
+    with open(patch_path, "wb") as patch_file:
+        patch_file.write(
+            PATCH_HEADER.pack(
+                PATCH_MAGIC,
+                PATCH_FORMAT_VERSION,
+                len(old_data),
+                hashlib.sha256(old_data).digest(),
+                len(new_data),
+                hashlib.sha256(new_data).digest(),
+            )
+        )
+        with lzma.open(patch_file, "wb", preset=9 | lzma.PRESET_EXTREME) as records:
+            for operation, offset, size in diff_bytes(old_data, new_data):
+                if operation == "copy":
+                    records.write(COPY_OPCODE + COPY_RECORD.pack(offset, size))
+                else:
+                    records.write(INSERT_OPCODE + INSERT_RECORD.pack(size))
+                    records.write(new_data[offset : offset + size])
+            records.write(END_OPCODE)
+        return patch_file.tell()
+
+
+def read_patch_header(patch_file: BinaryIO) -> Tuple[int, str, int, str]:
+    """
+    Read and check the header of a patch.
+
+    Args:
+        patch_file: Patch opened in binary mode, positioned at the start
+
+    Returns:
+        Tuple of (old size, old sha256, new size, new sha256)
+
+    Raises:
+        PatchError: If the file isn't a patch this version can apply
+    """
+    header = patch_file.read(PATCH_HEADER.size)
+    if len(header) != PATCH_HEADER.size:
+        raise PatchError("Patch file is truncated")
+    magic, format_version, old_size, old_sha256, new_size, new_sha256 = (
+        PATCH_HEADER.unpack(header)
+    )
+    if magic != PATCH_MAGIC or format_version != PATCH_FORMAT_VERSION:
+        raise PatchError("Not a supported patch file")
+    return old_size, old_sha256.hex(), new_size, new_sha256.hex()
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise PatchError("Patch file is truncated")
+    return data
+
+
+def apply_patch(
+    old_path: str, patch_path: str, output_path: str, old_sha256: Optional[str] = None
+) -> str:
+    """
+    Rebuild the new release from the installed one and a patch.
+
+    The output is hashed while it is written; the caller compares the result with
+    the expected checksum.
+
+    Args:
+        old_path: Installed executable the patch was made from
+        patch_path: Patch file
+        output_path: Where the new executable is written
+        old_sha256: Hash of old_path if already known, to skip hashing it again
+
+    Returns:
+        SHA-256 hex digest of the written file
+
+    Raises:
+        PatchError: If the patch is malformed or was made for a different file
+    """
+    with open(patch_path, "rb") as patch_file:
+        expected_old_size, expected_old_sha256, new_size, _ = read_patch_header(
+            patch_file
+        )
+        with open(old_path, "rb") as old_file:
+            if old_sha256 is None:
+                old_hasher = hashlib.sha256()
+                for buffer in iter(lambda: old_file.read(APPLY_BUFFER_SIZE), b""):
+                    old_hasher.update(buffer)
+                old_sha256 = old_hasher.hexdigest()
+            if old_sha256.lower() != expected_old_sha256:
+                raise PatchError("Patch was made for a different version of the file")
+
+            output_hasher = hashlib.sha256()
+            written = 0
+            with lzma.open(patch_file, "rb") as records, open(
+                output_path, "wb"
+            ) as output_file:
+                while True:
+                    opcode = _read_exactly(records, 1)
+                    if opcode == END_OPCODE:
+                        break
+                    if opcode == COPY_OPCODE:
+                        offset, size = COPY_RECORD.unpack(
+                            _read_exactly(records, COPY_RECORD.size)
+                        )
+                        if offset + size > expected_old_size:
+                            raise PatchError("Patch copies past the end of the file")
+                        old_file.seek(offset)
+                        source = old_file
+                    elif opcode == INSERT_OPCODE:
+                        (size,) = INSERT_RECORD.unpack(
+                            _read_exactly(records, INSERT_RECORD.size)
+                        )
+                        source = records
+                    else:
+                        raise PatchError(f"Unknown patch instruction {opcode!r}")
+
+                    while size:
+                        buffer = _read_exactly(source, min(size, APPLY_BUFFER_SIZE))
+                        output_file.write(buffer)
+                        output_hasher.update(buffer)
+                        size -= len(buffer)
+                        written += len(buffer)
+
+    if written != new_size:
+        raise PatchError(f"Patch produced {written} bytes instead of {new_size}")
+    return output_hasher.hexdigest()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Create or apply executable patches")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser("create", help="Create a patch")
+    create_parser.add_argument("old_path")
+    create_parser.add_argument("new_path")
+    create_parser.add_argument("patch_path")
+    apply_parser = subparsers.add_parser("apply", help="Apply a patch")
+    apply_parser.add_argument("old_path")
+    apply_parser.add_argument("patch_path")
+    apply_parser.add_argument("output_path")
+    arguments = parser.parse_args()
+
+    if arguments.command == "create":
+        patch_size = create_patch(
+            arguments.old_path, arguments.new_path, arguments.patch_path
+        )
+        print(f"Wrote {arguments.patch_path} ({patch_size} bytes)")
+    else:
+        sha256 = apply_patch(
+            arguments.old_path, arguments.patch_path, arguments.output_path
+        )
+        print(f"Wrote {arguments.output_path} (sha256 {sha256})")
+
+
+if __name__ == "__main__":
+    main()
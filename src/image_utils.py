@@ -1,9 +1,19 @@
 # Image processing utilities for MTGA Swapper
 # Contains image manipulation, resizing, and format conversion functions
 
-from PIL import Image
+from PIL import Image, ImageTk
 import io
-from typing import Union, Tuple, Optional
+from collections import OrderedDict
+from typing import Callable, Hashable, Union, Tuple, Optional
+
+# Downscale with Image.reduce until within this factor of the thumbnail size
+GALLERY_REDUCING_GAP = 2.0
+
+# Largest size an editor shows an image at, and how many display frames to keep
+DISPLAY_MAX_SIZE = (1920, 1080)
+DISPLAY_FRAME_CACHE_SIZE = 8
+
+_display_frame_cache: "OrderedDict[Hashable, ImageTk.PhotoImage]" = OrderedDict()
 
 
 def remove_alpha_channel(
@@ -47,17 +57,73 @@ def resize_image_to_screen(
 
     # Calculate the scaling factor to fit within target dimensions
     scale_factor = min(target_width / current_width, target_height / current_height, 1)
+    if scale_factor == 1:
+        return image
 
     # Calculate new dimensions
     new_width = int(current_width * scale_factor)
     new_height = int(current_height * scale_factor)
 
-    # Resize the image using high-quality resampling
-    resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # Resize the image using high-quality resampling, shrinking with Image.reduce first
+    resized_image = image.resize(
+        (new_width, new_height),
+        Image.Resampling.LANCZOS,
+        reducing_gap=GALLERY_REDUCING_GAP,
+    )
 
     return resized_image
 
 
+def get_display_frame(
+    image: Union[Image.Image, Callable[[], Image.Image]],
+    cache_key: Optional[Hashable] = None,
+    max_size: Tuple[int, int] = DISPLAY_MAX_SIZE,
+) -> ImageTk.PhotoImage:
+    """
+    Build a Tk photo for an editor's sg.Image without a PNG round trip.
+
+    The image is downscaled to fit the screen and handed to Tk as raw pixels;
+    pass the result as ``data=`` to sg.Image.update. Frames with a cache_key are
+    kept in a small LRU so flipping back to a texture costs nothing.
+
+    Args:
+        image: PIL Image, or a function returning one that is only called on a cache miss
+        cache_key: Hashable identifying the image content, or None to skip caching
+        max_size: Tuple of (width, height) the frame must fit in
+
+    Returns:
+        Tk photo image ready for display
+    """
+    if cache_key is not None and cache_key in _display_frame_cache:
+        _display_frame_cache.move_to_end(cache_key)
+        return _display_frame_cache[cache_key]
+
+    if callable(image):
+        image = image()
+    display_frame = ImageTk.PhotoImage(
+        resize_image_to_screen(image, max_size[0], max_size[1])
+    )
+
+    if cache_key is not None:
+        _display_frame_cache[cache_key] = display_frame
+        while len(_display_frame_cache) > DISPLAY_FRAME_CACHE_SIZE:
+            _display_frame_cache.popitem(last=False)
+    return display_frame
+
+
+def clear_display_frames() -> None:
+    """Forget every cached display frame, e.g. after a texture was replaced."""
+    _display_frame_cache.clear()
+
+
+def get_display_frame_footprint() -> int:
+    """Return the pixel bytes held by cached display frames."""
+    return sum(
+        display_frame.width() * display_frame.height() * 4
+        for display_frame in _display_frame_cache.values()
+    )
+
+
 def adjust_image_aspect_ratio(
     image: Union[bytes, Image.Image],
     target_aspect_ratio: Tuple[int, int] = (11, 8),
@@ -145,8 +211,13 @@ def resize_image_for_gallery(
     new_width = int(current_width * scale_factor)
     new_height = int(current_height * scale_factor)
 
-    # Resize the image using high-quality resampling
-    resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    # Shrink by an integer factor with Image.reduce first, then LANCZOS the rest;
+    # much cheaper than a full LANCZOS pass on large textures and visually identical
+    resized_image = image.resize(
+        (max(new_width, 1), max(new_height, 1)),
+        Image.Resampling.LANCZOS,
+        reducing_gap=GALLERY_REDUCING_GAP,
+    )
 
     return resized_image
 
@@ -3,7 +3,22 @@ import platform
 import sqlite3
 from pathlib import Path
 import os
-import shutil
+import time
+
+from src.backup_store import (
+    backup_bundle,
+    describe_restore_plan,
+    execute_restore_plan,
+    plan_restore,
+)
+from src.crop_bulk import upsert_crop_records
+from src.tracing import connect_database, traced
+
+# Stay below SQLite's default host parameter limit in older builds
+SQLITE_VARIABLE_LIMIT = 900
+
+BASELINE_FILE_NAME = "baseline.json"
+BASELINE_KEY = "_baseline"
 
 
 def apply_crop_changes(crop_changes: dict, asset_bundle_path: str) -> None:
@@ -30,57 +45,129 @@ def apply_crop_changes(crop_changes: dict, asset_bundle_path: str) -> None:
             return
 
         # Connect to the crop database
-        conn = sqlite3.connect(crop_db_path)
+        conn = connect_database(crop_db_path)
         cursor = conn.cursor()
 
-        # Apply each crop change
-        for art_id, crops in crop_changes.items():
-            for crop in crops:
-                try:
-                    path = crop["path"]
-                    format_type = crop["format"]
-                    x = crop["x"]
-                    y = crop["y"]
-                    z = crop["z"]
-                    w = crop["w"]
-                    generated = crop["generated"]
-
-                    # Check if entry exists
-                    cursor.execute(
-                        "SELECT COUNT(*) FROM Crops WHERE Path = ? AND Format = ?",
-                        (path, format_type),
-                    )
-                    exists = cursor.fetchone()[0] > 0
-
-                    if exists:
-                        # Update existing entry
-                        cursor.execute(
-                            "UPDATE Crops SET X = ?, Y = ?, Z = ?, W = ?, Generated = ? WHERE Path = ? AND Format = ?",
-                            (x, y, z, w, generated, path, format_type),
-                        )
-                    else:
-                        # Insert new entry
-                        cursor.execute(
-                            "INSERT INTO Crops (Path, Format, X, Y, Z, W, Generated) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                            (path, format_type, x, y, z, w, generated),
-                        )
-
-                    print(
-                        f"Applied crop change for ArtId {art_id}: {path} ({format_type})"
-                    )
-
-                except Exception as e:
-                    print(f"Error applying crop change for ArtId {art_id}: {e}")
-
-        # Commit all changes
-        conn.commit()
-        conn.close()
-        print(f"Successfully applied {len(crop_changes)} crop change(s)")
+        # Apply every crop change in one UPSERT batch and one transaction
+        crop_records = [crop for crops in crop_changes.values() for crop in crops]
+        try:
+            applied_rows, errors = upsert_crop_records(cursor, crop_records)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        for error in errors:
+            print(f"Error applying crop change: {error}")
+        print(
+            f"Successfully applied {len(applied_rows)} crop change(s) "
+            f"for {len(crop_changes)} ArtId(s)"
+        )
 
     except Exception as e:
         print(f"Error applying crop changes: {e}")
 
 
+def _chunked(values: list, size: int = SQLITE_VARIABLE_LIMIT):
+    """Yield successive slices of at most ``size`` items."""
+    for index in range(0, len(values), size):
+        yield values[index : index + size]
+
+
+def _values_differ(current_value, new_value) -> bool:
+    """
+    Compare a stored value with a preset value the way SQLite column affinity would.
+
+    Values typed into the details editor arrive as strings, so "12" must match 12.
+    """
+    return current_value != new_value and str(current_value) != str(new_value)
+
+
+def get_baseline_path(user_save_changes_path: str | Path) -> Path:
+    """Return the path of the pristine baseline file stored next to changes.json."""
+    return Path(user_save_changes_path).with_name(BASELINE_FILE_NAME)
+
+
+def load_baseline(user_save_changes_path: str | Path) -> dict:
+    """
+    Load the captured original Cards values.
+
+    Args:
+        user_save_changes_path: Path to the user's save changes JSON file
+
+    Returns:
+        Dictionary of GrpId -> {column: original value}
+    """
+    try:
+        with open(get_baseline_path(user_save_changes_path), "r") as baseline_file:
+            return json.load(baseline_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def capture_baseline(
+    grp_ids: list[str],
+    cursor,
+    user_save_changes_path: str | Path,
+    columns: list[str] | None = None,
+) -> None:
+    """
+    Remember the original values of Cards columns before the app modifies them.
+
+    Must be called before the edit. Only the first capture of a column is kept,
+    so repeated edits are always compared against the pristine game value.
+
+    Args:
+        grp_ids: GrpIds that are about to be modified
+        cursor: SQLite database cursor
+        user_save_changes_path: Path to the user's save changes JSON file
+        columns: Columns about to change, or None for the whole row
+    """
+    if not grp_ids or not user_save_changes_path:
+        return
+    baseline = load_baseline(user_save_changes_path)
+    if columns is None:
+        select_columns = "*"
+    else:
+        # Use the schema's spelling so keys line up with SELECT * in save_grp_id_info
+        schema_columns = {
+            column_info[1].lower(): column_info[1]
+            for column_info in cursor.execute("PRAGMA table_info(Cards)")
+        }
+        select_columns = ", ".join(
+            [
+                "GrpId",
+                *(schema_columns.get(column.lower(), column) for column in columns),
+            ]
+        )
+
+    for grp_id_chunk in _chunked(list(grp_ids)):
+        placeholders = ",".join("?" * len(grp_id_chunk))
+        cursor.execute(
+            f"SELECT {select_columns} FROM Cards WHERE GrpId IN ({placeholders})",
+            grp_id_chunk,
+        )
+        column_names = [description[0] for description in cursor.description]
+        for row in cursor.fetchall():
+            row_dict = dict(zip(column_names, row))
+            baseline_entry = baseline.setdefault(str(row_dict.pop("GrpId")), {})
+            for column, value in row_dict.items():
+                baseline_entry.setdefault(column, value)
+
+    with open(get_baseline_path(user_save_changes_path), "w") as baseline_file:
+        json.dump(baseline, baseline_file)
+
+
+def _is_full_row_entry(card_entry: dict) -> bool:
+    """Return True for a changes entry that stores a whole Cards row, as older versions did."""
+    return BASELINE_KEY not in card_entry and any(
+        column != "Localizations_enUS" for column in card_entry
+    )
+
+
+@traced
 def save_grp_id_info(
     grp_id: list[str],
     user_save_changes_path: str,
@@ -89,7 +176,12 @@ def save_grp_id_info(
     asset_bundle_path: str,
 ) -> None:
     """
-    Save the information of a list of GrpIds to a JSON file.
+    Save the changes made to a list of GrpIds to a JSON file.
+
+    Cards with a captured baseline are stored as column deltas, together with the
+    original values of those columns under "_baseline". Cards without one, and
+    full-row entries saved by older versions, keep storing the whole row. An entry
+    is only dropped when its delta against a captured baseline is empty.
 
     Args:
         grp_id: The Group ID of the card to load changes for
@@ -102,70 +194,244 @@ def save_grp_id_info(
     with open(user_save_changes_path, "r") as changes_file:
         changes_data = json.load(changes_file)
     changes_file.close()
-    # Use IN clause with placeholders for multiple GrpIds
-    placeholders = ",".join("?" * len(grp_id))
-    cursor.execute(f"SELECT * FROM Cards WHERE GrpId IN ({placeholders})", grp_id)
+    baseline = load_baseline(user_save_changes_path)
+    art_ids = set()
 
-    # Get column names
-    column_names = [description[0] for description in cursor.description]
+    for grp_id_chunk in _chunked(list(grp_id)):
+        # Use IN clause with placeholders for multiple GrpIds
+        placeholders = ",".join("?" * len(grp_id_chunk))
+        cursor.execute(
+            f"SELECT * FROM Cards WHERE GrpId IN ({placeholders})", grp_id_chunk
+        )
 
-    # Fetch all results and format with column names
-    rows = cursor.fetchall()
+        # Get column names
+        column_names = [description[0] for description in cursor.description]
+
+        for row in cursor.fetchall():
+            # Create a dictionary for this row with column names as keys
+            row_dict = {col_name: value for col_name, value in zip(column_names, row)}
+            grp_id_value = str(row_dict.pop("GrpId"))
+            art_ids.add(str(row_dict.get("ArtId")).zfill(6))
+
+            previous_entry = changes_data.get(grp_id_value, {})
+            baseline_entry = baseline.get(grp_id_value)
+            if not baseline_entry or _is_full_row_entry(previous_entry):
+                card_entry = row_dict
+            else:
+                card_entry = {
+                    column: row_dict[column]
+                    for column, original_value in baseline_entry.items()
+                    if column in row_dict
+                    and _values_differ(original_value, row_dict[column])
+                }
+                if card_entry:
+                    card_entry[BASELINE_KEY] = {
+                        column: baseline_entry[column] for column in card_entry
+                    }
+
+            # Keep localization edits recorded by save_loc_id_info
+            if "Localizations_enUS" in previous_entry:
+                card_entry["Localizations_enUS"] = previous_entry["Localizations_enUS"]
+
+            if card_entry:
+                changes_data[grp_id_value] = card_entry
+            else:
+                # Every column is back to its original value
+                changes_data.pop(grp_id_value, None)
+
+    # Back up each touched art bundle once; unchanged bundles are skipped by the store
+    if art_ids and asset_bundle_path:
+        for filename in os.listdir(asset_bundle_path):
+            bundle_art_id = filename.split("_")[0]
+            if bundle_art_id in art_ids and filename.endswith(".mtga"):
+                art_ids.discard(bundle_art_id)
+                backup_bundle(os.path.join(asset_bundle_path, filename))
 
-    for row in rows:
-        # Create a dictionary for this row with column names as keys
-        row_dict = {col_name: value for col_name, value in zip(column_names, row)}
+    connection.commit()
+    with open(user_save_changes_path, "w") as output_file:
+        json.dump(changes_data, output_file, indent=4)
+    output_file.close()
 
-        # Extract GrpId as the main key
-        grp_id_value = row_dict.pop(
-            "GrpId"
-        )  # Remove GrpId from the dict and get its value
 
-        # Use GrpId as the key, and the remaining columns as the value
-        changes_data[grp_id_value] = row_dict
+def save_column_changes(
+    user_save_changes_path: str | Path,
+    column: str,
+    column_changes: dict,
+) -> None:
+    """
+    Record a change to one Cards column without reading the rest of the rows.
 
-        artid = row_dict.get("ArtId")
-        matching_files = [
-            filename
-            for filename in os.listdir(asset_bundle_path)
-            if filename.startswith(str(artid)) and filename.endswith(".mtga")
-        ]
-        if matching_files:
-            shutil.copy(
-                os.path.join(asset_bundle_path, matching_files[0]),
-                Path.home() / "MTGA_Swapper_Backups" / f"MOD_{matching_files[0]}",
-            )
+    For edits that only touch the database, such as tags, so no art bundle is
+    backed up. The original value is captured into the baseline the first time
+    the column changes, like capture_baseline does.
 
-    connection.commit()
+    Args:
+        user_save_changes_path: Path to the user's save changes JSON file
+        column: Column that changed, spelled as in the Cards schema
+        column_changes: Dictionary of GrpId -> (original value, new value)
+    """
+    if not column_changes or not user_save_changes_path:
+        return
+    with open(user_save_changes_path, "r") as changes_file:
+        changes_data = json.load(changes_file)
+    baseline = load_baseline(user_save_changes_path)
+
+    for grp_id, (original_value, new_value) in column_changes.items():
+        baseline_entry = baseline.setdefault(str(grp_id), {})
+        original_value = baseline_entry.setdefault(column, original_value)
+        card_entry = changes_data.setdefault(str(grp_id), {})
+        if _values_differ(original_value, new_value):
+            card_entry[column] = new_value
+            card_entry.setdefault(BASELINE_KEY, {})[column] = original_value
+        else:
+            card_entry.pop(column, None)
+            card_entry.get(BASELINE_KEY, {}).pop(column, None)
+            if card_entry.get(BASELINE_KEY) == {}:
+                del card_entry[BASELINE_KEY]
+        if not card_entry:
+            changes_data.pop(str(grp_id))
+
+    # dumps rather than dump, so the compact baseline goes through the C encoder
+    with open(get_baseline_path(user_save_changes_path), "w") as baseline_file:
+        baseline_file.write(json.dumps(baseline))
     with open(user_save_changes_path, "w") as output_file:
         json.dump(changes_data, output_file, indent=4)
-    output_file.close()
 
 
+def apply_card_changes(cursor, card_changes: dict) -> int:
+    """
+    Write the differences between a set of Cards rows and their desired values.
+
+    Current values are fetched with chunked IN queries, unchanged columns are
+    dropped, and the remaining updates are grouped by column set so each group
+    is a single executemany call. Delta entries carry the original values under
+    "_baseline"; columns whose current value matches neither the baseline nor
+    the preset were changed by a game patch and are reported before being written.
+
+    Args:
+        cursor: SQLite database cursor (the caller owns the transaction)
+        card_changes: Dictionary of GrpId -> {column: new value}
+
+    Returns:
+        Number of card rows that were actually modified
+    """
+    known_columns = {
+        column_info[1] for column_info in cursor.execute("PRAGMA table_info(Cards)")
+    }
+    baselines = {
+        grp_id: new_values.pop(BASELINE_KEY, {})
+        for grp_id, new_values in card_changes.items()
+    }
+    requested_columns = set()
+    for new_values in card_changes.values():
+        requested_columns.update(new_values.keys())
+    unknown_columns = requested_columns - known_columns
+    if unknown_columns:
+        print(f"Warning: skipping unknown Cards column(s): {sorted(unknown_columns)}")
+    columns = sorted((requested_columns & known_columns) - {"GrpId"})
+    if not columns or not card_changes:
+        return 0
+
+    current_rows = {}
+    select_columns = ", ".join(columns)
+    for grp_id_chunk in _chunked(list(card_changes.keys())):
+        placeholders = ",".join("?" * len(grp_id_chunk))
+        for row in cursor.execute(
+            f"SELECT GrpId, {select_columns} FROM Cards WHERE GrpId IN ({placeholders})",
+            grp_id_chunk,
+        ):
+            current_rows[str(row[0])] = dict(zip(columns, row[1:]))
+
+    updates_by_columns = {}
+    drifted_columns = 0
+    for grp_id, new_values in card_changes.items():
+        current_values = current_rows.get(str(grp_id))
+        if current_values is None:
+            continue
+        changed_columns = tuple(
+            column
+            for column in columns
+            if column in new_values
+            and _values_differ(current_values[column], new_values[column])
+        )
+        baseline_values = baselines[grp_id]
+        drifted_columns += sum(
+            1
+            for column in changed_columns
+            if column in baseline_values
+            and _values_differ(current_values[column], baseline_values[column])
+        )
+        if changed_columns:
+            updates_by_columns.setdefault(changed_columns, []).append(
+                [new_values[column] for column in changed_columns] + [grp_id]
+            )
+
+    updated_rows = 0
+    for changed_columns, parameter_rows in updates_by_columns.items():
+        set_values = ", ".join(f"{column} = ?" for column in changed_columns)
+        cursor.executemany(
+            f"UPDATE Cards SET {set_values} WHERE GrpId = ?", parameter_rows
+        )
+        updated_rows += len(parameter_rows)
+    if drifted_columns:
+        print(
+            f"Warning: {drifted_columns} column(s) no longer matched their original value "
+            "(changed by a game update) and were overwritten by the preset"
+        )
+    return updated_rows
+
+
+def apply_localization_changes(
+    cursor, localization_changes: dict, language: str = "enUS"
+) -> int:
+    """
+    Write only the localizations whose text differs from the database.
+
+    Args:
+        cursor: SQLite database cursor (the caller owns the transaction)
+        localization_changes: Dictionary of LocId -> new text
+        language: Language suffix of the Localizations table
+
+    Returns:
+        Number of LocIds that were actually modified
+    """
+    if not localization_changes:
+        return 0
+
+    current_texts = {}
+    for loc_id_chunk in _chunked(list(localization_changes.keys())):
+        placeholders = ",".join("?" * len(loc_id_chunk))
+        for loc_id, text in cursor.execute(
+            f"SELECT LocId, Loc FROM Localizations_{language} WHERE LocId IN ({placeholders})",
+            loc_id_chunk,
+        ):
+            current_texts.setdefault(str(loc_id), set()).add(text)
+
+    changed_rows = [
+        (text, loc_id)
+        for loc_id, text in localization_changes.items()
+        if str(loc_id) in current_texts and current_texts[str(loc_id)] != {text}
+    ]
+    cursor.executemany(
+        f"UPDATE Localizations_{language} SET Loc = ? WHERE LocId = ?", changed_rows
+    )
+    return len(changed_rows)
+
+
+@traced
 def change_grp_id(
     change_path: str,
     cursor,
     connection,
     json_manual: dict | None = None,
     asset_bundle_path: str | None = None,
+    restore_plan: list | None = None,
 ) -> None:
     print("Applying changes to the database...")
-    total_localizations = 0
     if json_manual:
         grp_id = json_manual.pop("GrpId")
-        localizations = json_manual.pop("Localizations_enUS", None)
-        set_values = ", ".join([f"{col} = ?" for col in json_manual.keys()])
-        if localizations:
-            cursor.executemany(
-                f"UPDATE Localizations_enUS SET Loc = ? WHERE LocId = ?",
-                [(text, loc_id) for loc_id, text in localizations.items()],
-            )
-            total_localizations += len(localizations)
-
-        cursor.execute(
-            f"UPDATE Cards SET {set_values} WHERE GrpId = ?",
-            list(json_manual.values()) + [grp_id],
-        )
+        localizations = json_manual.pop("Localizations_enUS", None) or {}
+        card_changes = {grp_id: json_manual}
     else:
         print(f"Loading changes from: {change_path}")
         with open(change_path, "r") as changes_file:
@@ -182,46 +448,41 @@ def change_grp_id(
                 "Warning: Crop changes found but asset_bundle_path not provided, skipping crop changes"
             )
 
-        available_backups = Path.home() / "MTGA_Swapper_Backups"
-        backups = list(available_backups.glob("MOD_*.mtga"))
-        backups.sort(key=os.path.getmtime)
         restored_count = 0
-        for art in backups:
-            matching_files = [
-                filename
-                for filename in os.listdir(asset_bundle_path)
-                if filename.startswith(str(art.name)[4:10])
-                and filename.endswith(".mtga")
-            ]
-            if matching_files:
-                shutil.copy(
-                    art,
-                    os.path.join(asset_bundle_path, matching_files[0]),
-                )
-                restored_count += 1
+        if asset_bundle_path:
+            if restore_plan is None:
+                restore_plan = plan_restore(asset_bundle_path)
+            print(describe_restore_plan(restore_plan))
+            restored_count = execute_restore_plan(restore_plan)
         if restored_count > 0:
             print(f"Restored {restored_count} backup file(s)")
 
-        card_count = len(changes_data)
-        total_localizations = 0
-        print(f"Applying changes to {card_count} card(s)...")
+        localizations = {}
+        card_changes = {}
         for grp_id, new_values in changes_data.items():
-
-            localizations = new_values.pop("Localizations_enUS", None)
-            # Update the database with the new values for the specified GrpId
-            set_values = ", ".join([f"{col} = ?" for col in new_values.keys()])
-            cursor.execute(
-                f"UPDATE Cards SET {set_values} WHERE GrpId = ?",
-                list(new_values.values()) + [grp_id],
-            )
-            if localizations:
-                cursor.executemany(
-                    f"UPDATE Localizations_enUS SET Loc = ? WHERE LocId = ?",
-                    [(text, loc_id) for loc_id, text in localizations.items()],
-                )
-                total_localizations += len(localizations)
-
-    connection.commit()
+            localizations.update(new_values.pop("Localizations_enUS", None) or {})
+            card_changes[grp_id] = new_values
+        print(f"Applying changes to {len(card_changes)} card(s)...")
+
+    # Apply everything in one explicit transaction so a failure leaves the database untouched
+    if connection.in_transaction:
+        connection.commit()
+    start_time = time.perf_counter()
+    cursor.execute("BEGIN")
+    try:
+        updated_cards = apply_card_changes(cursor, card_changes)
+        total_localizations = apply_localization_changes(cursor, localizations)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    elapsed_time = max(time.perf_counter() - start_time, 1e-9)
+
+    processed_rows = len(card_changes) + len(localizations)
+    print(
+        f"Updated {updated_cards} of {len(card_changes)} card(s) in {elapsed_time:.2f}s "
+        f"({processed_rows / elapsed_time:.0f} rows/s)"
+    )
     if total_localizations > 0:
         print(f"Updated {total_localizations} localization(s)")
     print("Changes applied successfully!")
@@ -237,9 +498,10 @@ def save_loc_id_info(
     with open(user_save_changes_path, "r") as changes_file:
         changes_data = json.load(changes_file)
     changes_file.close()
-    changes_data[grp_id].setdefault("Localizations_enUS", {})
+    card_entry = changes_data.setdefault(str(grp_id), {})
+    card_entry.setdefault("Localizations_enUS", {})
 
-    changes_data[grp_id]["Localizations_enUS"][loc_id] = new_loc
+    card_entry["Localizations_enUS"][str(loc_id)] = new_loc
 
     with open(user_save_changes_path, "w") as output_file:
         json.dump(changes_data, output_file, indent=4)
@@ -0,0 +1,526 @@
+# Batched, cached access to the card database's localized text
+# LocIds are read with one IN query per batch and kept in an LRU; edits are buffered and
+# written together in a single transaction, as are localization packs
+
+import csv
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.load_preset import SQLITE_VARIABLE_LIMIT
+
+# Localized text columns of a card, as shown in the card details dialog
+CARD_LOCALIZATION_FIELDS = ("TitleId", "FlavorTextId", "TypeTextId", "SubtypeTextId")
+LOCALIZATION_CACHE_SIZE = 4096
+# Pack rows per executemany or IN lookup while importing
+LOCALIZATION_PACK_BATCH_SIZE = 5000
+# Changed rows kept in a dry-run report for the preview
+LOCALIZATION_DIFF_SAMPLE_SIZE = 20
+LOCALIZATION_PACK_DELIMITERS = (";", ",", "\t")
+# Formatted key of pack rows written to every variant of their LocId; sorts first
+ALL_VARIANTS = -1
+
+
+class LocalizationStore:
+    """
+    Localized text of one card database connection.
+
+    Cached text is dropped whenever the database changes behind the store's back,
+    through another connection or another write on this one (a preset, a set
+    swap), so reads never return outdated text.
+
+    Attributes:
+        database_cursor: SQLite cursor of the card database
+        language: Language suffix of the Localizations table
+    """
+
+    def __init__(
+        self,
+        database_cursor: sqlite3.Cursor,
+        language: str = "enUS",
+        cache_size: int = LOCALIZATION_CACHE_SIZE,
+    ) -> None:
+        # A cursor of its own, so lookups never reset a result the caller is reading
+        self.database_cursor = database_cursor.connection.cursor()
+        self.language = language
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._pending_edits: Dict[str, str] = {}
+        self._database_state = self._get_database_state()
+
+    def _get_database_state(self) -> Tuple[int, int]:
+        """Return values that change whenever the database is written to."""
+        data_version = self.database_cursor.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.database_cursor.connection.total_changes
+
+    def _check_cache(self) -> None:
+        database_state = self._get_database_state()
+        if database_state != self._database_state:
+            self._cache.clear()
+            self._database_state = database_state
+
+    def _remember(self, loc_id: str, text: str) -> None:
+        self._cache[loc_id] = text
+        self._cache.move_to_end(loc_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def get_many(self, loc_ids: Iterable) -> Dict[str, str]:
+        """
+        Get the text of several LocIds, querying only the ones not cached.
+
+        Args:
+            loc_ids: LocIds to look up
+
+        Returns:
+            Dictionary of LocId (as a string) -> text, empty for unknown LocIds
+        """
+        self._check_cache()
+        texts = {}
+        missing_loc_ids = []
+        for loc_id in dict.fromkeys(str(loc_id) for loc_id in loc_ids):
+            if loc_id in self._pending_edits:
+                texts[loc_id] = self._pending_edits[loc_id]
+            elif loc_id in self._cache:
+                self._cache.move_to_end(loc_id)
+                texts[loc_id] = self._cache[loc_id]
+            else:
+                missing_loc_ids.append(loc_id)
+
+        for start in range(0, len(missing_loc_ids), SQLITE_VARIABLE_LIMIT):
+            loc_id_chunk = missing_loc_ids[start : start + SQLITE_VARIABLE_LIMIT]
+            placeholders = ",".join("?" * len(loc_id_chunk))
+            found_texts = {}
+            for loc_id, text in self.database_cursor.execute(
+                f"SELECT LocId, Loc FROM Localizations_{self.language} "
+                f"WHERE LocId IN ({placeholders})",
+                loc_id_chunk,
+            ):
+                # Like get_localization_from_id, the first row of a LocId wins
+                found_texts.setdefault(str(loc_id), text)
+            for loc_id in loc_id_chunk:
+                texts[loc_id] = found_texts.get(loc_id, "")
+                self._remember(loc_id, texts[loc_id])
+        return texts
+
+    def get(self, loc_id) -> str:
+        """
+        Get the text of one LocId.
+
+        Args:
+            loc_id: LocId to look up
+
+        Returns:
+            The localized text, or an empty string if the LocId doesn't exist
+        """
+        return self.get_many([loc_id])[str(loc_id)]
+
+    def prefetch_set(self, expansion_code: str) -> int:
+        """
+        Cache the localized text of every card of a set with one query.
+
+        Args:
+            expansion_code: ExpansionCode of the set
+
+        Returns:
+            Number of LocIds cached
+        """
+        self._check_cache()
+        # A subquery per field keeps the lookup on the Localizations primary key
+        set_loc_ids = " UNION ".join(
+            f"SELECT {field} FROM Cards WHERE ExpansionCode = ?"
+            for field in CARD_LOCALIZATION_FIELDS
+        )
+        rows = self.database_cursor.execute(
+            f"SELECT LocId, Loc FROM Localizations_{self.language} "
+            f"WHERE LocId IN ({set_loc_ids})",
+            (expansion_code,) * len(CARD_LOCALIZATION_FIELDS),
+        ).fetchall()
+        set_texts = {}
+        for loc_id, text in rows:
+            set_texts.setdefault(str(loc_id), text)
+        # Larger sets than the cache keep their last LocIds
+        for loc_id, text in list(set_texts.items())[-self.cache_size :]:
+            self._remember(loc_id, text)
+        return len(set_texts)
+
+    def clear(self) -> None:
+        """Forget every cached text; buffered edits are kept."""
+        self._cache.clear()
+
+    def set(self, loc_id, text: str) -> None:
+        """
+        Buffer a new text for a LocId until flush is called.
+
+        Args:
+            loc_id: LocId to change
+            text: New localized text
+        """
+        self._pending_edits[str(loc_id)] = text
+
+    def flush(self) -> int:
+        """
+        Write every buffered edit in one transaction.
+
+        Returns:
+            Number of LocIds written
+
+        Raises:
+            sqlite3.Error: If the write fails; the database is left unchanged and
+                the edits stay buffered
+        """
+        if not self._pending_edits:
+            return 0
+        self._check_cache()
+        connection = self.database_cursor.connection
+        if connection.in_transaction:
+            connection.commit()
+        self.database_cursor.execute("BEGIN")
+        try:
+            self.database_cursor.executemany(
+                f"UPDATE Localizations_{self.language} SET Loc = ? WHERE LocId = ?",
+                [(text, loc_id) for loc_id, text in self._pending_edits.items()],
+            )
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+
+        # The store's own write leaves the rest of the cache valid
+        self._database_state = self._get_database_state()
+        for loc_id, text in self._pending_edits.items():
+            self._remember(loc_id, text)
+            print(f"Updated LocId {loc_id} with new text: {text}")
+        written_count = len(self._pending_edits)
+        self._pending_edits.clear()
+        return written_count
+
+
+def get_localization_languages(database_cursor: sqlite3.Cursor) -> List[str]:
+    """
+    List the languages of the card database's Localizations tables.
+
+    Args:
+        database_cursor: SQLite cursor of the card database
+
+    Returns:
+        Sorted language suffixes such as "enUS"
+    """
+    database_cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'Localizations%'"
+    )
+    return sorted(
+        name.split("_", 1)[1]
+        for (name,) in database_cursor.fetchall()
+        if name.startswith("Localizations_")
+    )
+
+
+def read_localization_pack(
+    pack_path: str,
+    formatted: Optional[int] = None,
+    invalid_rows: Optional[List[str]] = None,
+) -> Iterator[Tuple[int, Optional[int], str]]:
+    """
+    Stream the rows of a localization pack.
+
+    CSV packs need a header row with LocId and Loc columns and an optional Formatted
+    column, separated by semicolons, commas or tabs. JSON packs hold either a
+    mapping of LocId -> text or a list of {"LocId", "Formatted", "Loc"} objects.
+    Rows without a LocId or text are skipped, as are rows whose LocId or
+    Formatted value isn't a number.
+
+    Args:
+        pack_path: Path to the .csv or .json pack
+        formatted: Only read rows with this Formatted value; rows without one are
+            always read
+        invalid_rows: Gets a description of every skipped invalid row
+
+    Yields:
+        (LocId, Formatted or None if the row has none, text) of every row, in file order
+
+    Raises:
+        ValueError: If the pack has no LocId and Loc columns
+    """
+    for row_number, (loc_id, row_formatted, text) in enumerate(
+        _read_pack_fields(pack_path), start=1
+    ):
+        text = str(text or "").strip()
+        if not text or loc_id in (None, ""):
+            continue
+        try:
+            # int() ignores surrounding whitespace, so valid rows need no stripping
+            loc_id = int(loc_id)
+            row_formatted = (
+                None
+                if row_formatted is None or not str(row_formatted).strip()
+                else int(row_formatted)
+            )
+        except ValueError:
+            if invalid_rows is not None:
+                invalid_rows.append(
+                    f"Row {row_number}: invalid LocId {loc_id!r} or Formatted "
+                    f"{row_formatted!r}"
+                )
+            continue
+        if formatted is not None and row_formatted not in (None, formatted):
+            continue
+        yield loc_id, row_formatted, text
+
+
+def _read_pack_fields(pack_path: str) -> Iterator[Tuple]:
+    """Yield the raw (LocId, Formatted, Loc) fields of every pack row."""
+    if Path(pack_path).suffix.lower() == ".json":
+        with open(pack_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            yield from ((loc_id, None, text) for loc_id, text in data.items())
+        else:
+            yield from (
+                (row.get("LocId", ""), row.get("Formatted"), row.get("Loc"))
+                for row in data
+            )
+        return
+
+    with open(pack_path, "r", newline="", encoding="utf-8-sig") as f:
+        header = f.readline()
+        delimiter = max(LOCALIZATION_PACK_DELIMITERS, key=header.count)
+        field_names = [
+            name.strip() for name in next(csv.reader([header], delimiter=delimiter), [])
+        ]
+        if "LocId" not in field_names or "Loc" not in field_names:
+            raise ValueError("Localization pack must have 'LocId' and 'Loc' columns")
+        loc_id_column = field_names.index("LocId")
+        text_column = field_names.index("Loc")
+        formatted_column = (
+            field_names.index("Formatted") if "Formatted" in field_names else None
+        )
+        field_count = len(field_names)
+        for row in csv.reader(f, delimiter=delimiter):
+            if len(row) < field_count:
+                # Blank or short lines carry no localization
+                continue
+            yield (
+                row[loc_id_column],
+                None if formatted_column is None else row[formatted_column],
+                row[text_column],
+            )
+
+
+def import_localization_pack(
+    database_cursor: sqlite3.Cursor,
+    pack_path: str,
+    language: str = "enUS",
+    formatted: Optional[int] = None,
+    dry_run: bool = False,
+    keep_listed_variants: bool = False,
+) -> Dict:
+    """
+    Replace localized text with the rows of a localization pack.
+
+    A row with a Formatted value replaces only that variant of its LocId, so packs
+    listing the plain and <nobr> variants separately keep each one's markup. A row
+    without one, or every row when a formatted filter is given, is written to all
+    variants of its LocId. With keep_listed_variants, the rows of the formatted
+    variant only fill the variants the pack doesn't list separately, and the other
+    rows write their own variant, all in the same transaction. When a pack lists
+    the same variant twice, the last row wins. Invalid rows are skipped and listed
+    in the report.
+
+    The pack is streamed in batches sorted by primary key, each written with one
+    executemany inside a single transaction, so the updates walk the table in order
+    however the pack is ordered. The UPDATE skips rows that already hold the new
+    text, so applying a pack twice writes nothing.
+
+    A dry run compares the pack with the database instead, using IN queries, and
+    reports what would change.
+
+    Args:
+        database_cursor: SQLite cursor of the card database
+        pack_path: Path to the .csv or .json pack, see read_localization_pack
+        language: Language suffix of the Localizations table to write
+        formatted: Only use pack rows with this Formatted value, written to every
+            variant of their LocId
+        dry_run: Compare without writing anything
+        keep_listed_variants: With formatted, read every row and leave the variants
+            the pack lists separately to their own rows; the pack is read twice
+
+    Returns:
+        Report dictionary with the pack "rows" read, the "invalid" row count with up
+        to LOCALIZATION_DIFF_SAMPLE_SIZE "errors", "elapsed" seconds and
+        "rows_per_second". An import adds the Localizations rows "written"; a dry
+        run adds the "changed", "unchanged" and "missing" row counts and a "diff"
+        of up to LOCALIZATION_DIFF_SAMPLE_SIZE (LocId, Formatted or None, current
+        text, new text)
+
+    Raises:
+        ValueError: If the language has no Localizations table or the pack has no
+            LocId and Loc columns
+        sqlite3.Error: If the write fails; the database is left unchanged
+    """
+    if language not in get_localization_languages(database_cursor):
+        raise ValueError(f"The database has no Localizations_{language} table")
+
+    started = time.perf_counter()
+    # Variants the pack lists separately, per LocId, which the formatted rows skip
+    listed_variants: Dict[int, Tuple[int, ...]] = {}
+    if formatted is not None and keep_listed_variants:
+        listed_variant_sets: Dict[int, set] = {}
+        for loc_id, row_formatted, _ in read_localization_pack(pack_path):
+            if row_formatted not in (None, formatted):
+                listed_variant_sets.setdefault(loc_id, set()).add(row_formatted)
+        listed_variants = {
+            loc_id: tuple(sorted(variants))
+            for loc_id, variants in listed_variant_sets.items()
+        }
+
+    report = {"rows": 0}
+    if dry_run:
+        report.update(changed=0, unchanged=0, missing=0, diff=[])
+    else:
+        report["written"] = 0
+        connection = database_cursor.connection
+        if connection.in_transaction:
+            connection.commit()
+        database_cursor.execute("BEGIN")
+
+    invalid_rows = []
+    try:
+        # Keyed by (LocId, Formatted), with ALL_VARIANTS for rows written to every variant
+        batch: Dict[Tuple[int, int], str] = {}
+        for loc_id, row_formatted, text in read_localization_pack(
+            pack_path, None if keep_listed_variants else formatted, invalid_rows
+        ):
+            report["rows"] += 1
+            if row_formatted is None or row_formatted == formatted:
+                row_formatted = ALL_VARIANTS
+            batch[(loc_id, row_formatted)] = text
+            if len(batch) >= LOCALIZATION_PACK_BATCH_SIZE:
+                _apply_pack_batch(
+                    database_cursor, language, batch, listed_variants, report, dry_run
+                )
+                batch = {}
+        _apply_pack_batch(
+            database_cursor, language, batch, listed_variants, report, dry_run
+        )
+        if not dry_run:
+            connection.commit()
+    except (sqlite3.Error, ValueError, OSError):
+        if not dry_run:
+            connection.rollback()
+        raise
+
+    report["invalid"] = len(invalid_rows)
+    report["errors"] = invalid_rows[:LOCALIZATION_DIFF_SAMPLE_SIZE]
+    elapsed = time.perf_counter() - started
+    report["elapsed"] = elapsed
+    report["rows_per_second"] = report["rows"] / elapsed if elapsed else 0.0
+    if dry_run:
+        outcome = (
+            f"{report['changed']} changed, {report['unchanged']} unchanged, "
+            f"{report['missing']} not in Localizations_{language}"
+        )
+    else:
+        outcome = f"{report['written']} Localizations_{language} row(s) written"
+    if invalid_rows:
+        outcome += f", {len(invalid_rows)} invalid row(s) skipped"
+    print(
+        f"{'Compared' if dry_run else 'Imported'} {report['rows']} localization row(s) "
+        f"in {elapsed:.2f}s ({report['rows_per_second']:.0f} rows/s): {outcome}"
+    )
+    return report
+
+
+def _apply_pack_batch(
+    database_cursor: sqlite3.Cursor,
+    language: str,
+    batch: Dict[Tuple[int, int], str],
+    listed_variants: Dict[int, Tuple[int, ...]],
+    report: Dict,
+    dry_run: bool,
+) -> None:
+    """Write one batch of pack rows, or compare it with the database on a dry run."""
+    # In primary key order, so the statements walk the table instead of jumping around it
+    pack_keys = sorted(batch)
+    if not dry_run:
+        changes_before = database_cursor.connection.total_changes
+        # One executemany per set of skipped variants; without any that's all of them
+        all_variant_rows: Dict[Tuple[int, ...], List[Tuple]] = {}
+        for loc_id, row_formatted in pack_keys:
+            if row_formatted == ALL_VARIANTS:
+                skipped_variants = listed_variants.get(loc_id, ())
+                text = batch[(loc_id, row_formatted)]
+                all_variant_rows.setdefault(skipped_variants, []).append(
+                    (text, loc_id, *skipped_variants, text)
+                )
+        for skipped_variants, rows in all_variant_rows.items():
+            skipped_condition = (
+                f"AND Formatted NOT IN ({','.join('?' * len(skipped_variants))}) "
+                if skipped_variants
+                else ""
+            )
+            database_cursor.executemany(
+                f"UPDATE Localizations_{language} SET Loc = ? "
+                f"WHERE LocId = ? {skipped_condition}AND Loc IS NOT ?",
+                rows,
+            )
+        database_cursor.executemany(
+            f"UPDATE Localizations_{language} SET Loc = ? "
+            "WHERE LocId = ? AND Formatted = ? AND Loc IS NOT ?",
+            [
+                (batch[key], key[0], key[1], batch[key])
+                for key in pack_keys
+                if key[1] != ALL_VARIANTS
+            ],
+        )
+        report["written"] += database_cursor.connection.total_changes - changes_before
+        return
+
+    # Current text of every variant of the batch's LocIds
+    loc_ids = sorted({loc_id for loc_id, _ in pack_keys})
+    current_texts: Dict[Tuple[int, int], str] = {}
+    for start in range(0, len(loc_ids), SQLITE_VARIABLE_LIMIT):
+        loc_id_chunk = loc_ids[start : start + SQLITE_VARIABLE_LIMIT]
+        placeholders = ",".join("?" * len(loc_id_chunk))
+        for loc_id, row_formatted, text in database_cursor.execute(
+            f"SELECT LocId, Formatted, Loc FROM Localizations_{language} "
+            f"WHERE LocId IN ({placeholders})",
+            loc_id_chunk,
+        ):
+            current_texts[(loc_id, row_formatted)] = text
+    variant_texts: Dict[int, List[Tuple[int, str]]] = {}
+    for (loc_id, row_formatted), text in current_texts.items():
+        variant_texts.setdefault(loc_id, []).append((row_formatted, text))
+
+    for variant_key in pack_keys:
+        loc_id, row_formatted = variant_key
+        text = batch[variant_key]
+        if row_formatted == ALL_VARIANTS:
+            skipped_variants = listed_variants.get(loc_id, ())
+            current_variant_texts = [
+                current_text
+                for variant, current_text in variant_texts.get(loc_id, [])
+                if variant not in skipped_variants
+            ]
+        elif variant_key in current_texts:
+            current_variant_texts = [current_texts[variant_key]]
+        else:
+            current_variant_texts = []
+        if not current_variant_texts:
+            report["missing"] += 1
+        elif all(current_text == text for current_text in current_variant_texts):
+            report["unchanged"] += 1
+        else:
+            report["changed"] += 1
+            if len(report["diff"]) < LOCALIZATION_DIFF_SAMPLE_SIZE:
+                report["diff"].append(
+                    (
+                        loc_id,
+                        None if row_formatted == ALL_VARIANTS else row_formatted,
+                        current_variant_texts[0],
+                        text,
+                    )
+                )
@@ -0,0 +1,378 @@
+# Streaming 3D mesh export to OBJ, binary glTF and binary PLY
+# Vertices and faces are written in fixed size batches, so a mesh is never held as one big string
+
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterable, List, Optional, Sequence
+
+MESH_EXPORT_FORMATS = ("obj", "glb", "ply")
+DEFAULT_MESH_EXPORT_FORMAT = "obj"
+# Vertices or triangles converted and written at a time
+MESH_WRITE_BATCH = 4096
+
+GLB_MAGIC = 0x46546C67
+GLB_VERSION = 2
+GLB_JSON_CHUNK = 0x4E4F534A
+GLB_BIN_CHUNK = 0x004E4942
+GLTF_FLOAT = 5126
+GLTF_UNSIGNED_INT = 5125
+GLTF_ARRAY_BUFFER = 34962
+GLTF_ELEMENT_ARRAY_BUFFER = 34963
+GLTF_POINTS = 0
+GLTF_TRIANGLES = 4
+
+
+class MeshGeometry:
+    """
+    Geometry of one Unity mesh, converted to right-handed coordinates on export.
+
+    Unity is left-handed: X is mirrored and triangle winding is reversed, the same
+    conversion UnityPy's OBJ export makes.
+
+    Attributes:
+        name: The mesh's m_Name
+        vertices: (x, y, z) positions
+        normals: (x, y, z) normals, or None if the mesh has none for every vertex
+        uvs: (u, v) coordinates of the first UV set, or None
+        submeshes: Triangles of every submesh as vertex index triples
+    """
+
+    def __init__(self, mesh) -> None:
+        from UnityPy.helpers.MeshHelper import MeshHandler
+
+        handler = MeshHandler(mesh)
+        handler.process()
+        self.name: str = mesh.m_Name
+        self.vertices: List[Sequence[float]] = handler.m_Vertices or []
+        vertex_count = len(self.vertices)
+        self.normals = (
+            handler.m_Normals
+            if handler.m_Normals and len(handler.m_Normals) == vertex_count
+            else None
+        )
+        self.uvs = (
+            handler.m_UV0
+            if handler.m_UV0 and len(handler.m_UV0) == vertex_count
+            else None
+        )
+        self.submeshes: List[List[Sequence[int]]] = (
+            handler.get_triangles() if vertex_count else []
+        )
+
+
+def _finite(value: float) -> float:
+    # NaN components are written as 0, like UnityPy's OBJ export
+    return value if value == value else 0.0
+
+
+def _batches(items: Sequence, batch_size: int = MESH_WRITE_BATCH) -> Iterable[Sequence]:
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def _float_bytes(values: List[float]) -> bytes:
+    """Pack floats as little-endian float32."""
+    packed = array("f", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _uint_bytes(values: List[int]) -> bytes:
+    """Pack integers as little-endian uint32."""
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _mirrored_vectors(vectors: Sequence[Sequence[float]]) -> Iterable[List[float]]:
+    """Yield batches of flattened vectors with X mirrored."""
+    for batch in _batches(vectors):
+        yield [
+            component
+            for vector in batch
+            for component in (
+                -_finite(vector[0]),
+                _finite(vector[1]),
+                _finite(vector[2]),
+            )
+        ]
+
+
+def _finite_values(values: List[float]) -> List[float]:
+    """Replace NaN components with 0, scanning in C when there are none."""
+    if any(map(math.isnan, values)):
+        return [_finite(value) for value in values]
+    return values
+
+
+def _format_lines(line_format: str, values: Sequence, values_per_line: int) -> bytes:
+    """Format a batch of flattened values into lines with a single %-format."""
+    line_count = len(values) // values_per_line
+    return ((line_format * line_count) % tuple(values)).encode("ascii")
+
+
+def write_obj(geometry: MeshGeometry, mesh_file: BinaryIO) -> None:
+    """
+    Stream a mesh as Wavefront OBJ, with one group per submesh.
+
+    Every batch is flattened and formatted with one %-format. Face corners are
+    looked up from per-vertex "i/i/i" strings built once per mesh, instead of
+    formatting each index again for every triangle that uses it.
+
+    Args:
+        geometry: Mesh to write
+        mesh_file: File opened in binary mode
+    """
+    mesh_file.write(f"g {geometry.name}\n".encode("utf-8"))
+    for batch in _batches(geometry.vertices):
+        values = [component for x, y, z, *_ in batch for component in (-x, y, z)]
+        mesh_file.write(_format_lines("v %.9G %.9G %.9G\n", _finite_values(values), 3))
+    if geometry.uvs:
+        for batch in _batches(geometry.uvs):
+            values = [component for u, v, *_ in batch for component in (u, v)]
+            mesh_file.write(_format_lines("vt %.9G %.9G\n", _finite_values(values), 2))
+    if geometry.normals:
+        for batch in _batches(geometry.normals):
+            values = [component for x, y, z, *_ in batch for component in (-x, y, z)]
+            mesh_file.write(
+                _format_lines("vn %.9G %.9G %.9G\n", _finite_values(values), 3)
+            )
+
+    if geometry.uvs and geometry.normals:
+        corner_format = "{0}/{0}/{0}"
+    elif geometry.uvs:
+        corner_format = "{0}/{0}"
+    elif geometry.normals:
+        corner_format = "{0}//{0}"
+    else:
+        corner_format = "{0}"
+    corners = [
+        corner_format.format(index) for index in range(1, len(geometry.vertices) + 1)
+    ]
+    for submesh_index, triangles in enumerate(geometry.submeshes):
+        mesh_file.write(f"g {geometry.name}_{submesh_index}\n".encode("utf-8"))
+        for batch in _batches(triangles):
+            values = [
+                corner
+                for a, b, c in batch
+                for corner in (corners[c], corners[b], corners[a])
+            ]
+            mesh_file.write(_format_lines("f %s %s %s\n", values, 3))
+
+
+def write_ply(geometry: MeshGeometry, mesh_file: BinaryIO) -> None:
+    """
+    Stream a mesh as little-endian binary PLY; submeshes are merged.
+
+    Args:
+        geometry: Mesh to write
+        mesh_file: File opened in binary mode
+    """
+    face_count = sum(len(triangles) for triangles in geometry.submeshes)
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        f"comment {geometry.name}",
+        f"element vertex {len(geometry.vertices)}",
+        "property float x",
+        "property float y",
+        "property float z",
+    ]
+    if geometry.normals:
+        header += ["property float nx", "property float ny", "property float nz"]
+    if geometry.uvs:
+        header += ["property float s", "property float t"]
+    header += [
+        f"element face {face_count}",
+        "property list uchar uint vertex_indices",
+        "end_header",
+    ]
+    mesh_file.write(("\n".join(header) + "\n").encode("utf-8"))
+
+    for start in range(0, len(geometry.vertices), MESH_WRITE_BATCH):
+        end = start + MESH_WRITE_BATCH
+        vertex_values = []
+        for vertex_index, (x, y, z, *_) in enumerate(
+            geometry.vertices[start:end], start
+        ):
+            vertex_values += (-_finite(x), _finite(y), _finite(z))
+            if geometry.normals:
+                nx, ny, nz, *_ = geometry.normals[vertex_index]
+                vertex_values += (-_finite(nx), _finite(ny), _finite(nz))
+            if geometry.uvs:
+                u, v, *_ = geometry.uvs[vertex_index]
+                vertex_values += (_finite(u), _finite(v))
+        mesh_file.write(_float_bytes(vertex_values))
+
+    for triangles in geometry.submeshes:
+        for batch in _batches(triangles):
+            face_values = [index for a, b, c in batch for index in (3, c, b, a)]
+            mesh_file.write(struct.pack("<" + "B3I" * len(batch), *face_values))
+
+
+def write_glb(geometry: MeshGeometry, mesh_file: BinaryIO) -> None:
+    """
+    Stream a mesh as binary glTF 2.0, with one primitive per submesh.
+
+    Buffer sizes only depend on the vertex and triangle counts, so the JSON chunk
+    is written first and the binary chunk is streamed after it.
+
+    Args:
+        geometry: Mesh to write
+        mesh_file: File opened in binary mode
+    """
+    vertex_count = len(geometry.vertices)
+    buffer_views = []
+    accessors = []
+
+    def add_view(byte_length: int, target: int) -> int:
+        byte_offset = sum(view["byteLength"] for view in buffer_views)
+        buffer_views.append(
+            {
+                "buffer": 0,
+                "byteOffset": byte_offset,
+                "byteLength": byte_length,
+                "target": target,
+            }
+        )
+        return len(buffer_views) - 1
+
+    def add_accessor(view: int, component_type: int, count: int, kind: str) -> int:
+        accessors.append(
+            {
+                "bufferView": view,
+                "componentType": component_type,
+                "count": count,
+                "type": kind,
+            }
+        )
+        return len(accessors) - 1
+
+    # POSITION needs its bounds, found with a pass over the vertices
+    minimum = [float("inf")] * 3
+    maximum = [float("-inf")] * 3
+    for values in _mirrored_vectors(geometry.vertices):
+        for axis in range(3):
+            axis_values = values[axis::3]
+            minimum[axis] = min(minimum[axis], min(axis_values))
+            maximum[axis] = max(maximum[axis], max(axis_values))
+
+    attributes = {
+        "POSITION": add_accessor(
+            add_view(vertex_count * 12, GLTF_ARRAY_BUFFER),
+            GLTF_FLOAT,
+            vertex_count,
+            "VEC3",
+        )
+    }
+    accessors[attributes["POSITION"]].update(min=minimum, max=maximum)
+    if geometry.normals:
+        attributes["NORMAL"] = add_accessor(
+            add_view(vertex_count * 12, GLTF_ARRAY_BUFFER),
+            GLTF_FLOAT,
+            vertex_count,
+            "VEC3",
+        )
+    if geometry.uvs:
+        attributes["TEXCOORD_0"] = add_accessor(
+            add_view(vertex_count * 8, GLTF_ARRAY_BUFFER),
+            GLTF_FLOAT,
+            vertex_count,
+            "VEC2",
+        )
+    primitives = [
+        {
+            "attributes": attributes,
+            "indices": add_accessor(
+                add_view(len(triangles) * 12, GLTF_ELEMENT_ARRAY_BUFFER),
+                GLTF_UNSIGNED_INT,
+                len(triangles) * 3,
+                "SCALAR",
+            ),
+            "mode": GLTF_TRIANGLES,
+        }
+        for triangles in geometry.submeshes
+        if triangles
+    ]
+    if not primitives:
+        # A mesh without triangles is still valid glTF as a point cloud
+        primitives.append({"attributes": attributes, "mode": GLTF_POINTS})
+    binary_length = sum(view["byteLength"] for view in buffer_views)
+
+    document = {
+        "asset": {"version": "2.0", "generator": "MTGA Swapper"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": geometry.name}],
+        "meshes": [{"name": geometry.name, "primitives": primitives}],
+        "buffers": [{"byteLength": binary_length}],
+        "bufferViews": buffer_views,
+        "accessors": accessors,
+    }
+    json_chunk = json.dumps(document, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+
+    mesh_file.write(
+        struct.pack(
+            "<III", GLB_MAGIC, GLB_VERSION, 12 + 8 + len(json_chunk) + 8 + binary_length
+        )
+    )
+    mesh_file.write(struct.pack("<II", len(json_chunk), GLB_JSON_CHUNK))
+    mesh_file.write(json_chunk)
+    mesh_file.write(struct.pack("<II", binary_length, GLB_BIN_CHUNK))
+    # Every view holds 4 byte components, so the chunk needs no padding
+    for values in _mirrored_vectors(geometry.vertices):
+        mesh_file.write(_float_bytes(values))
+    if geometry.normals:
+        for values in _mirrored_vectors(geometry.normals):
+            mesh_file.write(_float_bytes(values))
+    if geometry.uvs:
+        # glTF puts the UV origin at the top left, Unity at the bottom left
+        for batch in _batches(geometry.uvs):
+            mesh_file.write(
+                _float_bytes(
+                    [
+                        component
+                        for u, v, *_ in batch
+                        for component in (_finite(u), 1.0 - _finite(v))
+                    ]
+                )
+            )
+    for triangles in geometry.submeshes:
+        for batch in _batches(triangles):
+            mesh_file.write(
+                _uint_bytes([index for a, b, c in batch for index in (c, b, a)])
+            )
+
+
+MESH_WRITERS = {"obj": write_obj, "glb": write_glb, "ply": write_ply}
+
+
+def export_mesh(
+    mesh,
+    file_path_without_extension: str,
+    mesh_format: str = DEFAULT_MESH_EXPORT_FORMAT,
+) -> Optional[str]:
+    """
+    Write one mesh to a file in the given format.
+
+    Args:
+        mesh: UnityPy Mesh object
+        file_path_without_extension: Output path; the format's extension is added
+        mesh_format: One of MESH_EXPORT_FORMATS
+
+    Returns:
+        Path of the written file, or None if the mesh has no vertices
+    """
+    geometry = MeshGeometry(mesh)
+    if not geometry.vertices:
+        return None
+    mesh_file_path = f"{file_path_without_extension}.{mesh_format}"
+    with open(mesh_file_path, "wb") as mesh_file:
+        MESH_WRITERS[mesh_format](geometry, mesh_file)
+    return mesh_file_path
@@ -5,18 +5,24 @@ import time
 import json
 import shutil
 import os
-import csv
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import requests
-import UnityPy
 from PIL import Image
 import FreeSimpleGUI as sg
-from src.load_preset import save_grp_id_info
+from src.load_preset import capture_baseline, save_grp_id_info
+from src.localization import import_localization_pack
+from src.backup_store import backup_bundle
+from src.tracing import trace_span
+from src.unity_bundle import save_unity_bundle
+
+# Cards columns of a swapped card, captured so its preset entry is a real delta
+SET_SWAP_COLUMNS = ["ArtId", "TitleId", "InterchangeableTitleId"]
 
 
 def fetch_scryfall_set_data(set_code: str) -> List[Dict]:
     """Fetches all card data for a given set from Scryfall."""
+    import requests
+
     all_cards = []
     next_page_url = f"https://api.scryfall.com/cards/search?q=set:{set_code}"
     while next_page_url:
@@ -106,6 +112,8 @@ def generate_swap_file(
 
 def get_card_data_from_url(url: str) -> Optional[Dict]:
     """Fetches card data from a Scryfall URL."""
+    import requests
+
     api_url = url
     if "scryfall.com/card" in api_url:
         parts = api_url.split("/")
@@ -122,6 +130,8 @@ def get_card_data_from_url(url: str) -> Optional[Dict]:
 
 def download_image(url: str, dest_path: Path) -> bool:
     """Downloads an image from a URL to a destination path."""
+    import requests
+
     try:
         response = requests.get(url, stream=True)
         response.raise_for_status()
@@ -215,6 +225,8 @@ def perform_image_swap( image_uris, target_type_line, temp_dir,
     )
 
     # Replace art
+    import UnityPy
+
     env_art = UnityPy.load(str(art_bundle_path))
     all_textures = [
         obj for obj in env_art.objects if obj.type.name == "Texture2D"
@@ -255,10 +267,10 @@ def perform_image_swap( image_uris, target_type_line, temp_dir,
             img = img.resize((256, 512), Image.LANCZOS)
 
         main_art_texture.image = img
-        main_art_texture.save()
+        with trace_span("Texture2D.save", texture=main_art_texture.m_Name):
+            main_art_texture.save()
 
-        with open(art_bundle_path, "wb") as f:
-            f.write(env_art.file.save())
+        save_unity_bundle(env_art, str(art_bundle_path))
 
     return art_bundle_path, env_art
 
@@ -295,6 +307,14 @@ def perform_set_swap(
     if not card_data_map:
         return False
 
+    # The swap rewrites the art and names these columns point at
+    capture_baseline(
+        [ids[0] for ids in card_data_map.values()],
+        db_cursor,
+        save_path,
+        SET_SWAP_COLUMNS,
+    )
+
     temp_dir = Path("./temp_art")
     temp_dir.mkdir(exist_ok=True)
     backup_dir.mkdir(exist_ok=True)
@@ -351,11 +371,10 @@ def perform_set_swap(
 
             # Replace name in TextAsset
 
-            with open(art_bundle_path, "wb") as f:
-                f.write(env_art.file.save())
+            save_unity_bundle(env_art, str(art_bundle_path))
 
             # Backup the NEW asset file after changes
-            shutil.copy(art_bundle_path, backup_dir / f"MOD_{art_bundle_path.name}")
+            backup_bundle(art_bundle_path, backup_dir)
 
             # Update name in database localizations
             try:
@@ -430,7 +449,10 @@ def create_set_swap_window():
             sg.Button("Apply Swaps", key="-APPLY_SWAPS-"),
             sg.Button("Close", key="-CLOSE-"),
         ],
-        [sg.Button("Swap Spiderman descriptions", key="-SPIDERMAN-")],
+        [
+            sg.Button("Swap Spiderman descriptions", key="-SPIDERMAN-"),
+            sg.Button("Import Localization Pack", key="-IMPORT_LOC_PACK-"),
+        ],
     ]
 
     return sg.Window("Set Swapper", layout, modal=True, finalize=True)
@@ -447,6 +469,11 @@ def spiderman_localizations(
     12345;1;Spider-Man Card Name
     67890;0;Another Card Name
 
+    The Formatted == 1 rows are written to every variant of their LocId that the
+    CSV doesn't list separately, and listed variants get their own text, so plain
+    variants don't pick up the <nobr> markup. import_localization_pack does this in
+    one transaction.
+
     Args:
         db_cursor: SQLite cursor for the MTGA database
         db_connection: SQLite connection for the MTGA database
@@ -465,80 +492,24 @@ def spiderman_localizations(
         return False
 
     try:
-        updated_count = 0
-
-        with open(csv_file_path, "r", encoding="utf-8") as csvfile:
-            # Use semicolon as delimiter
-            csv_reader = csv.DictReader(csvfile, delimiter=";")
-
-            # Validate headers
-            if (
-                "LocId" not in csv_reader.fieldnames
-                or "Loc" not in csv_reader.fieldnames
-            ):
-                sg.popup_error(
-                    "CSV file must have 'LocId', 'Formatted', and 'Loc' columns",
-                    title="Invalid CSV Format",
-                )
-                return False
-
-            for row in csv_reader:
-                loc_id = row.get("LocId", "").strip()
-                formatted = row.get("Formatted", "").strip()
-                new_text = row.get("Loc", "").strip()
-
-                if not loc_id or not new_text:
-                    continue
-
-                # Only use formatted text (Formatted == 1)
-                if formatted != "1":
-                    continue
-
-                try:
-                    # Convert LocId to integer
-                    loc_id_int = int(loc_id)
-
-                    # Update the localization in the database
-                    db_cursor.execute(
-                        "UPDATE Localizations_enUS SET Loc = ? WHERE LocId = ?",
-                        (new_text, loc_id_int),
-                    )
-
-                    if db_cursor.rowcount > 0:
-                        updated_count += 1
-
-                except (ValueError, Exception) as e:
-                    # Skip invalid entries
-                    print("invalid")
-                    continue
-        db_cursor.execute(
-            """
-            UPDATE Localizations_enUS
-            SET Loc = 'When Flash Thompson enters, choose one or both — 
-            • Tap target creature. 
-            • Untap target creature.'
-            WHERE LocId = 1086483
-            """
+        report = import_localization_pack(
+            db_cursor, str(csv_file_path), formatted=1, keep_listed_variants=True
         )
-
-        # Commit all changes
-        db_connection.commit()
-
-        if updated_count > 0:
-            sg.popup_ok(
-                f"Successfully updated {updated_count} localization entries!",
-                title="Localization Complete",
-            )
-            return True
-        else:
-            sg.popup_warning(
-                "No localization entries were updated. Check your CSV file.",
-                title="No Updates",
-            )
-            return False
-
     except Exception as e:
         sg.popup_error(
             f"Error processing localizations: {e}", title="Localization Error"
         )
         return False
+
+    if report["written"] > 0:
+        sg.popup_ok(
+            f"Successfully updated {report['written']} localization entries!",
+            title="Localization Complete",
+        )
+        return True
+    sg.popup_warning(
+        "No localization entries were updated. They may already be applied, "
+        "or your CSV file doesn't match this database.",
+        title="No Updates",
+    )
+    return False
@@ -2,14 +2,43 @@
 # Handles SQLite operations for card swapping and data retrieval
 
 import sqlite3
+import time
 from typing import List, Tuple
 from src.load_preset import (
+    capture_baseline,
     save_grp_id_info,
+    save_column_changes,
     change_grp_id,
     save_loc_id_info,
     json,
     find_mtga_db_path,
 )
+from src.card_models import format_card_display
+from src.tracing import connect_database
+
+# Every card with a title; back faces without one are listed under their front's title
+CARD_LIST_QUERY = """
+    SELECT 
+        CASE 
+            WHEN NULLIF(c1.Order_Title, '') IS NOT NULL THEN c1.Order_Title
+            WHEN NULLIF(c1.Order_Title, '') IS NULL 
+                AND NULLIF(c2.Order_Title, '') IS NOT NULL THEN c2.Order_Title || '-flip-side'
+        END AS Order_Title,
+        c1.ExpansionCode,
+        c1.ArtSize,
+        c1.GrpId,
+        c1.ArtId
+    FROM Cards c1
+    LEFT JOIN Cards c2
+        ON c1.LinkedFaceGrpIds = c2.GrpId
+    AND NULLIF(c2.Order_Title, '') IS NOT NULL
+    WHERE NULLIF(c1.Order_Title, '') IS NOT NULL
+    OR NULLIF(c2.Order_Title, '') IS NOT NULL;
+"""
+
+# Tag that enables the animated borderless (parallax) style
+PARALLAX_STYLE_TAG = "1696804317"
+PARALLAX_LOCKED_CONDITION = "(Tags IS NULL OR Tags NOT LIKE '%' || :tag || '%')"
 
 
 def get_tokens_by_artist(
@@ -53,6 +82,8 @@ def swap_card_group_ids(
         database_connection: SQLite database connection
     """
     try:
+        capture_baseline([first_grp_id, second_grp_id], database_cursor, save_path)
+
         # First pass: Set cards to temporary values to avoid conflicts
         database_cursor.executemany(
             """
@@ -106,6 +137,10 @@ def swap_card_styles(
         database_connection: SQLite database connection
     """
     try:
+        capture_baseline(
+            [first_grp_id, second_grp_id], database_cursor, save_path, ["Tags", "ArtId"]
+        )
+
         # First pass: Get first card's tags and ArtId
         first_card_data = database_cursor.execute(
             """
@@ -157,35 +192,87 @@ def unlock_parallax_style(
     database_connection: sqlite3.Connection,
     save_path: str = "",
     asset_bundle_path: str = "",
-) -> None:
+) -> bool:
     """
     Unlock the parallax style for a list of card IDs.
 
+    The GrpIds go into a temporary table and the tag is added with one UPDATE
+    joined against it. Only the Tags change is recorded in the save file; no art
+    bundle is backed up, since this edit doesn't touch any.
+
     Args:
         card_ids: List of card IDs to unlock
         database_cursor: SQLite database cursor
+        database_connection: SQLite database connection
+        save_path: Path to the user's save changes JSON file
+        asset_bundle_path: Unused, kept for existing callers
+
+    Returns:
+        True if the cards were unlocked, False if the database couldn't be written
     """
+    started = time.perf_counter()
+    if database_connection.in_transaction:
+        database_connection.commit()
     try:
-        print(card_ids)
+        database_cursor.execute("BEGIN")
+        # Dropped in the finally below, whether or not the update went through
+        database_cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS parallax_grp_ids (GrpId INTEGER PRIMARY KEY)"
+        )
+        database_cursor.execute("DELETE FROM temp.parallax_grp_ids")
         database_cursor.executemany(
-            """
-        UPDATE Cards
-        SET tags = CASE
-            WHEN tags IS NULL OR TRIM(tags) = '' THEN '1696804317'
-            ELSE tags || ',1696804317'
-        END
-        WHERE GrpId = ? AND tags NOT LIKE '%1696804317%'
-        """,
+            "INSERT OR IGNORE INTO temp.parallax_grp_ids VALUES (?)",
             [(card_id,) for card_id in card_ids],
         )
-        database_cursor.connection.commit()
-        save_grp_id_info(
-            card_ids, save_path, database_cursor, database_connection, asset_bundle_path
+        locked_cards = database_cursor.execute(
+            f"""
+            SELECT GrpId, Tags FROM Cards
+            WHERE GrpId IN (SELECT GrpId FROM temp.parallax_grp_ids)
+                AND {PARALLAX_LOCKED_CONDITION}
+            """,
+            {"tag": PARALLAX_STYLE_TAG},
+        ).fetchall()
+        database_cursor.execute(
+            f"""
+            UPDATE Cards
+            SET Tags = CASE
+                WHEN Tags IS NULL OR TRIM(Tags) = '' THEN :tag
+                ELSE Tags || ',' || :tag
+            END
+            WHERE GrpId IN (SELECT GrpId FROM temp.parallax_grp_ids)
+                AND {PARALLAX_LOCKED_CONDITION}
+            """,
+            {"tag": PARALLAX_STYLE_TAG},
         )
-        return True
-
-    except sqlite3.OperationalError:
+        database_connection.commit()
+    except sqlite3.Error as e:
+        database_connection.rollback()
+        print(f"Could not unlock parallax style: {e}")
         return False
+    finally:
+        database_cursor.execute("DROP TABLE IF EXISTS temp.parallax_grp_ids")
+
+    save_column_changes(
+        save_path,
+        "Tags",
+        {
+            grp_id: (
+                tags,
+                (
+                    PARALLAX_STYLE_TAG
+                    if tags is None or not tags.strip()
+                    else f"{tags},{PARALLAX_STYLE_TAG}"
+                ),
+            )
+            for grp_id, tags in locked_cards
+        },
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"Unlocked parallax style for {len(locked_cards)} of {len(card_ids)} card(s) "
+        f"in {elapsed:.2f}s ({len(card_ids) / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+    return True
 
 
 def get_card_details_by_name(
@@ -220,12 +307,30 @@ def create_database_connection(
     Returns:
         Tuple of (cursor, connection, file_path)
     """
-    database_connection = sqlite3.connect(database_file_path)
+    database_connection = connect_database(database_file_path)
     database_cursor = database_connection.cursor()
 
     return database_cursor, database_connection, database_file_path
 
 
+def fetch_card_list(database_cursor: sqlite3.Cursor) -> List[str]:
+    """
+    Load every card for the main card list.
+
+    Args:
+        database_cursor: SQLite cursor for database operations
+
+    Returns:
+        Sorted list of formatted card strings
+    """
+    return list(
+        map(
+            format_card_display,
+            sorted(database_cursor.execute(CARD_LIST_QUERY).fetchall()),
+        )
+    )
+
+
 def fetch_all_data(database_cursor: sqlite3.Cursor, grp_id: str) -> List[Tuple]:
     """
     Fetch all data from the Cards table for a specific GrpId.
@@ -0,0 +1,118 @@
+# Staged startup for MTGA Swapper
+# The main window is shown first; the update check, database detection, card list load
+# and heavy imports run on background threads and report back through window events
+
+import importlib
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.card_models import build_card_name_index
+
+from src.sql_editor import fetch_card_list
+from src.token_search import ArtistIndex, build_artist_index
+from src.tracing import connect_database, trace_span
+from src.unity_bundle import configure_unity_version
+
+# Imported in the background after the window is shown, so the first bundle opens fast
+PRELOADED_MODULES = ("UnityPy",)
+
+
+def run_in_background(
+    window,
+    task: Callable[[], Any],
+    done_event: str,
+    failed_event: Optional[str] = None,
+) -> threading.Thread:
+    """
+    Run a task on a background thread and post its result to a window.
+
+    Args:
+        window: FreeSimpleGUI window that receives the events
+        task: Function to call without arguments
+        done_event: Event posted with the task's return value
+        failed_event: Event posted with the exception if the task raises; without
+            one the error is only printed
+
+    Returns:
+        The started thread
+    """
+
+    def post_event(event_key: str, event_value: Any) -> None:
+        try:
+            window.write_event_value(event_key, event_value)
+        except Exception:
+            # The window was closed before the task finished
+            pass
+
+    def run_task() -> None:
+        try:
+            task_result = task()
+        except Exception as e:
+            if failed_event:
+                post_event(failed_event, e)
+            else:
+                print(f"Error in background task {done_event}: {e}")
+            return
+        post_event(done_event, task_result)
+
+    task_thread = threading.Thread(target=run_task, daemon=True)
+    task_thread.start()
+    return task_thread
+
+
+def preload_modules(
+    module_names: Iterable[str] = PRELOADED_MODULES,
+) -> threading.Thread:
+    """
+    Import modules on a background thread.
+
+    Code that imports one of them while the preload is running simply waits for it,
+    so this only moves the cost off the startup path.
+
+    Args:
+        module_names: Modules to import
+
+    Returns:
+        The started thread
+    """
+
+    def run_preload() -> None:
+        for module_name in module_names:
+            try:
+                with trace_span("preload", module=module_name):
+                    importlib.import_module(module_name)
+            except ImportError as e:
+                print(f"Could not preload {module_name}: {e}")
+
+    preload_thread = threading.Thread(target=run_preload, daemon=True)
+    preload_thread.start()
+    return preload_thread
+
+
+def load_startup_database(
+    database_file_path: str, fallback_unity_version: str
+) -> Tuple[str, List[str], Dict[str, List[int]], ArtistIndex]:
+    """
+    Load and index the card list and token artists, and detect the Unity version.
+
+    Uses a connection of its own, so it can run on a background thread; the GUI
+    opens its connection once the list is ready.
+
+    Args:
+        database_file_path: Path to the Raw_CardDatabase file
+        fallback_unity_version: Unity version to use if level0 can't be read
+
+    Returns:
+        Tuple of (database_file_path, formatted card list, card name index,
+        token artist index)
+    """
+    with trace_span("load_startup_database"):
+        database_connection = connect_database(database_file_path)
+        try:
+            card_list = fetch_card_list(database_connection.cursor())
+            artist_index = build_artist_index(database_connection.cursor())
+        finally:
+            database_connection.close()
+        card_name_index = build_card_name_index(card_list)
+        configure_unity_version(database_file_path, fallback_unity_version)
+    return database_file_path, card_list, card_name_index, artist_index
@@ -0,0 +1,200 @@
+# Reversible-edit journal of replaced textures
+# Keeps the original serialized Texture2D of every texture this tool replaced, keyed by bundle and path_id,
+# as zlib compressed payloads named after the hash of their uncompressed data
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from src.backup_store import BACKUP_DIRECTORY
+
+JOURNAL_DIRECTORY_NAME = "textures"
+JOURNAL_FILE_NAME = "journal.json"
+PAYLOAD_DIRECTORY_NAME = "payloads"
+# Texture data is already dense, so higher levels mostly cost time
+PAYLOAD_COMPRESSION_LEVEL = 1
+
+
+def get_journal_directory(backup_root: Path = BACKUP_DIRECTORY) -> Path:
+    """Return the directory holding the journal and its texture payloads."""
+    return Path(backup_root) / JOURNAL_DIRECTORY_NAME
+
+
+def payload_path_for(sha256: str, backup_root: Path = BACKUP_DIRECTORY) -> Path:
+    """Return the on-disk location of the payload with the given hash."""
+    return (
+        get_journal_directory(backup_root)
+        / PAYLOAD_DIRECTORY_NAME
+        / sha256[:2]
+        / sha256
+    )
+
+
+def load_journal(backup_root: Path = BACKUP_DIRECTORY) -> Dict[str, Dict[str, dict]]:
+    """
+    Load the journal of original textures.
+
+    Args:
+        backup_root: Root backup directory
+
+    Returns:
+        Dictionary of bundle name -> {path_id: texture entry}
+    """
+    journal_path = get_journal_directory(backup_root) / JOURNAL_FILE_NAME
+    try:
+        with open(journal_path, "r") as journal_file:
+            return json.load(journal_file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_journal(
+    journal: Dict[str, Dict[str, dict]], backup_root: Path = BACKUP_DIRECTORY
+) -> None:
+    """
+    Atomically write the journal of original textures.
+
+    Args:
+        journal: Journal dictionary to persist
+        backup_root: Root backup directory
+    """
+    journal_path = get_journal_directory(backup_root) / JOURNAL_FILE_NAME
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = journal_path.with_suffix(".tmp")
+    with open(temp_path, "w") as journal_file:
+        json.dump(journal, journal_file, indent=4)
+    os.replace(temp_path, journal_path)
+
+
+def record_original_texture(
+    bundle_file_path: str | Path,
+    path_id: int,
+    raw_data: bytes,
+    metadata: dict,
+    backup_root: Path = BACKUP_DIRECTORY,
+) -> bool:
+    """
+    Journal the original serialized data of a texture before it is replaced.
+
+    Only the first original of a texture is kept, so replacing the same texture
+    several times still restores the game's version.
+
+    Args:
+        bundle_file_path: Bundle the texture belongs to
+        path_id: path_id of the Texture2D object in the bundle
+        raw_data: Serialized Texture2D object, including inline image data
+        metadata: Name, size and format of the texture, shown when restoring
+        backup_root: Root backup directory
+
+    Returns:
+        True if the texture was journaled, False if it already was
+    """
+    bundle_name = Path(bundle_file_path).name
+    journal = load_journal(backup_root)
+    bundle_entries = journal.setdefault(bundle_name, {})
+    if str(path_id) in bundle_entries:
+        return False
+
+    payload_hash = hashlib.sha256(raw_data).hexdigest()
+    payload_path = payload_path_for(payload_hash, backup_root)
+    if not payload_path.exists():
+        payload_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_payload_path = payload_path.with_suffix(".tmp")
+        temp_payload_path.write_bytes(
+            zlib.compress(raw_data, PAYLOAD_COMPRESSION_LEVEL)
+        )
+        os.replace(temp_payload_path, payload_path)
+
+    bundle_entries[str(path_id)] = {
+        **metadata,
+        "sha256": payload_hash,
+        "size": len(raw_data),
+    }
+    save_journal(journal, backup_root)
+    return True
+
+
+def get_journaled_textures(
+    bundle_file_path: str | Path, backup_root: Path = BACKUP_DIRECTORY
+) -> Dict[int, dict]:
+    """
+    Return the journaled originals of a bundle.
+
+    Args:
+        bundle_file_path: Bundle in the game directory
+        backup_root: Root backup directory
+
+    Returns:
+        Dictionary of path_id -> texture entry
+    """
+    bundle_entries = load_journal(backup_root).get(Path(bundle_file_path).name, {})
+    return {int(path_id): entry for path_id, entry in bundle_entries.items()}
+
+
+def read_texture_payload(
+    texture_entry: dict, backup_root: Path = BACKUP_DIRECTORY
+) -> Optional[bytes]:
+    """
+    Read the original serialized data of a journaled texture.
+
+    Args:
+        texture_entry: Entry returned by get_journaled_textures
+        backup_root: Root backup directory
+
+    Returns:
+        Serialized Texture2D object, or None if the payload is missing or damaged
+    """
+    try:
+        raw_data = zlib.decompress(
+            payload_path_for(texture_entry["sha256"], backup_root).read_bytes()
+        )
+    except (FileNotFoundError, zlib.error):
+        return None
+    if hashlib.sha256(raw_data).hexdigest() != texture_entry["sha256"]:
+        return None
+    return raw_data
+
+
+def forget_textures(
+    bundle_file_path: str | Path,
+    path_ids: Iterable[int],
+    backup_root: Path = BACKUP_DIRECTORY,
+) -> int:
+    """
+    Drop restored textures from the journal and delete payloads nothing refers to.
+
+    Args:
+        bundle_file_path: Bundle the textures belong to
+        path_ids: path_ids of the restored textures
+        backup_root: Root backup directory
+
+    Returns:
+        Number of bytes freed
+    """
+    bundle_name = Path(bundle_file_path).name
+    journal = load_journal(backup_root)
+    bundle_entries = journal.get(bundle_name, {})
+    removed_hashes = set()
+    for path_id in path_ids:
+        texture_entry = bundle_entries.pop(str(path_id), None)
+        if texture_entry is not None:
+            removed_hashes.add(texture_entry["sha256"])
+    if not bundle_entries:
+        journal.pop(bundle_name, None)
+    save_journal(journal, backup_root)
+
+    referenced_hashes = {
+        texture_entry["sha256"]
+        for entries in journal.values()
+        for texture_entry in entries.values()
+    }
+    freed_bytes = 0
+    for payload_hash in removed_hashes - referenced_hashes:
+        payload_path = payload_path_for(payload_hash, backup_root)
+        if payload_path.exists():
+            freed_bytes += payload_path.stat().st_size
+            payload_path.unlink()
+    return freed_bytes
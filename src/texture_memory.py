@@ -0,0 +1,195 @@
+# Memory budget for decoded textures held by open editors
+# Decoded images are tracked by pixel bytes; off-screen ones are dropped under the budget
+# and decoded again the next time they are looked at
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from PIL import Image
+
+from src.image_utils import get_display_frame_footprint
+
+DEFAULT_TEXTURE_MEMORY_BUDGET_MB = 512
+
+_texture_memory_budget = DEFAULT_TEXTURE_MEMORY_BUDGET_MB * 1024 * 1024
+# (owner id, index) -> pixel bytes, least recently used first
+_decoded_image_sizes: "OrderedDict[Tuple[int, Hashable], int]" = OrderedDict()
+_decoded_image_owners: Dict[int, "weakref.ref[DecodedImageList]"] = {}
+_decoded_bytes = 0
+_memory_lock = threading.RLock()
+
+
+def get_image_footprint(image: Optional[Image.Image]) -> int:
+    """
+    Estimate the memory used by a decoded image's pixels.
+
+    Args:
+        image: PIL Image object
+
+    Returns:
+        Size of the pixel data in bytes
+    """
+    if image is None:
+        return 0
+    # Pillow stores 3-band images such as RGB with a padding byte per pixel
+    bytes_per_pixel = {"1": 1, "L": 1, "P": 1, "I;16": 2}.get(image.mode, 4)
+    return image.width * image.height * bytes_per_pixel
+
+
+def set_texture_memory_budget(megabytes: float) -> None:
+    """
+    Change the decoded texture budget and drop images that no longer fit.
+
+    Args:
+        megabytes: Budget in MB; images on screen are kept even above it
+    """
+    global _texture_memory_budget
+    with _memory_lock:
+        _texture_memory_budget = max(int(float(megabytes) * 1024 * 1024), 0)
+        _trim_decoded_images()
+
+
+def get_texture_memory_footprint() -> Dict[str, int]:
+    """
+    Return the current memory footprint of decoded images.
+
+    Returns:
+        Dictionary with "decoded_bytes" and "decoded_images" for the textures held
+        by editors, "display_bytes" for cached display frames, and "budget_bytes"
+    """
+    with _memory_lock:
+        return {
+            "decoded_bytes": _decoded_bytes,
+            "decoded_images": len(_decoded_image_sizes),
+            "display_bytes": get_display_frame_footprint(),
+            "budget_bytes": _texture_memory_budget,
+        }
+
+
+def describe_texture_memory_footprint() -> str:
+    """Return the memory footprint as a short line for windows and logs."""
+    footprint = get_texture_memory_footprint()
+    megabyte = 1024 * 1024
+    return (
+        f"Decoded textures: {footprint['decoded_bytes'] / megabyte:.0f} MB "
+        f"({footprint['decoded_images']} images) of "
+        f"{footprint['budget_bytes'] / megabyte:.0f} MB, "
+        f"display frames: {footprint['display_bytes'] / megabyte:.0f} MB"
+    )
+
+
+def _record_decoded_image(owner: "DecodedImageList", index: int, size: int) -> None:
+    """Account for an image an owner just decoded, then enforce the budget."""
+    global _decoded_bytes
+    key = (id(owner), index)
+    with _memory_lock:
+        if id(owner) not in _decoded_image_owners:
+            _decoded_image_owners[id(owner)] = weakref.ref(owner)
+            # Closing an editor releases its list; stop counting its images then
+            weakref.finalize(owner, _forget_owner, id(owner))
+        _decoded_bytes += size - _decoded_image_sizes.pop(key, 0)
+        _decoded_image_sizes[key] = size
+        _trim_decoded_images()
+
+
+def _touch_decoded_image(owner: "DecodedImageList", index: int) -> None:
+    """Mark an owner's image as the most recently used."""
+    with _memory_lock:
+        key = (id(owner), index)
+        if key in _decoded_image_sizes:
+            _decoded_image_sizes.move_to_end(key)
+
+
+def _forget_decoded_image(owner_id: int, index: int) -> None:
+    """Stop counting one image."""
+    global _decoded_bytes
+    with _memory_lock:
+        _decoded_bytes -= _decoded_image_sizes.pop((owner_id, index), 0)
+
+
+def _forget_owner(owner_id: int) -> None:
+    """Stop counting every image of a released list."""
+    global _decoded_bytes
+    with _memory_lock:
+        _decoded_image_owners.pop(owner_id, None)
+        for key in [key for key in _decoded_image_sizes if key[0] == owner_id]:
+            _decoded_bytes -= _decoded_image_sizes.pop(key)
+
+
+def _trim_decoded_images() -> None:
+    """Drop least recently used off-screen images until the budget is met."""
+    if _decoded_bytes <= _texture_memory_budget:
+        return
+    for owner_id, index in list(_decoded_image_sizes):
+        if _decoded_bytes <= _texture_memory_budget:
+            break
+        owner_reference = _decoded_image_owners.get(owner_id)
+        owner = owner_reference() if owner_reference else None
+        if owner is not None and owner.current_index == index:
+            # The image an editor is showing stays decoded
+            continue
+        if owner is not None:
+            owner._images.pop(index, None)
+        _forget_decoded_image(owner_id, index)
+
+
+class DecodedImageList(Sequence):
+    """
+    Lazily decoded images of a texture list, kept within the texture memory budget.
+
+    Indexing decodes a texture on first use and keeps the result while it fits in
+    the budget; the most recently indexed image counts as on screen and is never
+    dropped. Works as a drop-in replacement for a list of decoded images.
+    """
+
+    def __init__(
+        self,
+        textures: List[Any],
+        decode: Callable[[Any], Image.Image] = lambda texture: texture.image,
+    ):
+        """
+        Args:
+            textures: Texture2D objects (or anything `decode` accepts)
+            decode: Function turning one texture into a PIL Image
+        """
+        self.textures = textures
+        self.decode = decode
+        self.current_index: Optional[int] = None
+        self._images: Dict[int, Image.Image] = {}
+
+    def __len__(self) -> int:
+        return len(self.textures)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("texture index out of range")
+
+        self.current_index = index
+        image = self._images.get(index)
+        if image is not None:
+            _touch_decoded_image(self, index)
+            return image
+
+        image = self.decode(self.textures[index])
+        self._images[index] = image
+        _record_decoded_image(self, index, get_image_footprint(image))
+        return image
+
+    def __setitem__(self, index: int, image: Image.Image) -> None:
+        """Replace a decoded image, e.g. after the texture was edited."""
+        if index < 0:
+            index += len(self)
+        self._images[index] = image
+        _record_decoded_image(self, index, get_image_footprint(image))
+
+    def release(self) -> None:
+        """Drop every decoded image, e.g. when the editor closes."""
+        self._images.clear()
+        _forget_owner(id(self))
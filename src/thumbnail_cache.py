@@ -0,0 +1,188 @@
+# Persistent on-disk cache of asset gallery thumbnails
+# Thumbnails and texture order are keyed by bundle path, bundle mtime and texture path_id
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.image_utils import convert_texture_to_bytes, resize_image_for_gallery
+
+THUMBNAIL_CACHE_DIRECTORY = Path.home() / ".mtga_swapper" / "thumbnails"
+MANIFEST_FILE_NAME = "manifest.json"
+GALLERY_PAGE_SIZE = 30
+GALLERY_THUMBNAIL_EVENT = "-GALLERY_THUMBNAIL-"
+THUMBNAIL_WORKERS = 4
+
+# Textures of one bundle share a single file reader, so only the decode step is
+# serialized; resizing and PNG encoding still run in parallel. Anything else that
+# reads the gallery's bundle while thumbnails are being built must hold it too
+texture_decode_lock = threading.Lock()
+
+
+def get_bundle_cache_directory(
+    bundle_file_path: str, cache_root: Path = THUMBNAIL_CACHE_DIRECTORY
+) -> Path:
+    """
+    Return the thumbnail cache directory of a bundle, clearing it if the bundle changed.
+
+    Each bundle path gets one directory, so a rewritten bundle replaces its old
+    thumbnails instead of piling up a new set per modification time.
+
+    Args:
+        bundle_file_path: Path to the bundle shown in the gallery
+        cache_root: Root thumbnail cache directory
+
+    Returns:
+        Directory holding the bundle's manifest and thumbnails
+    """
+    bundle_file_path = os.path.abspath(bundle_file_path)
+    bundle_stat = os.stat(bundle_file_path)
+    path_hash = hashlib.sha1(bundle_file_path.encode("utf-8")).hexdigest()
+    cache_directory = Path(cache_root) / path_hash
+    manifest_path = cache_directory / MANIFEST_FILE_NAME
+
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    if (
+        manifest.get("mtime_ns") != bundle_stat.st_mtime_ns
+        or manifest.get("size") != bundle_stat.st_size
+    ):
+        shutil.rmtree(cache_directory, ignore_errors=True)
+        cache_directory.mkdir(parents=True, exist_ok=True)
+        with open(manifest_path, "w") as f:
+            json.dump(
+                {
+                    "bundle": bundle_file_path,
+                    "mtime_ns": bundle_stat.st_mtime_ns,
+                    "size": bundle_stat.st_size,
+                },
+                f,
+            )
+    return cache_directory
+
+
+def load_texture_order(cache_directory: Path) -> Optional[List[int]]:
+    """
+    Return the cached gallery order of the bundle's textures as path_ids.
+
+    Args:
+        cache_directory: Directory returned by get_bundle_cache_directory
+
+    Returns:
+        List of texture path_ids, or None if the order hasn't been cached yet
+    """
+    try:
+        with open(cache_directory / MANIFEST_FILE_NAME, "r") as f:
+            return json.load(f).get("texture_order")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_texture_order(cache_directory: Path, path_ids: List[int]) -> None:
+    """
+    Store the gallery order of the bundle's textures in its manifest.
+
+    Args:
+        cache_directory: Directory returned by get_bundle_cache_directory
+        path_ids: Texture path_ids in display order
+    """
+    manifest_path = cache_directory / MANIFEST_FILE_NAME
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return
+    if manifest.get("texture_order") == path_ids:
+        return
+    manifest["texture_order"] = path_ids
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+
+
+def get_gallery_thumbnail(
+    cache_directory: Path, texture, target_size: Tuple[int, int] = (200, 200)
+) -> Optional[bytes]:
+    """
+    Return PNG thumbnail bytes for a texture, decoding it only on a cache miss.
+
+    Args:
+        cache_directory: Directory returned by get_bundle_cache_directory
+        texture: Texture2D object read from the bundle
+        target_size: Tuple of (width, height) for the thumbnail
+
+    Returns:
+        Thumbnail image data as PNG bytes
+    """
+    path_id = texture.object_reader.path_id
+    thumbnail_path = (
+        cache_directory / f"{path_id}_{target_size[0]}x{target_size[1]}.png"
+    )
+    try:
+        return thumbnail_path.read_bytes()
+    except FileNotFoundError:
+        pass
+
+    with texture_decode_lock:
+        texture_image = texture.image
+    thumbnail_bytes = convert_texture_to_bytes(
+        resize_image_for_gallery(texture_image, target_size)
+    )
+    if thumbnail_bytes:
+        try:
+            temp_path = thumbnail_path.with_suffix(".tmp")
+            temp_path.write_bytes(thumbnail_bytes)
+            os.replace(temp_path, thumbnail_path)
+        except OSError as e:
+            print(f"Could not cache thumbnail {thumbnail_path.name}: {e}")
+    return thumbnail_bytes
+
+
+def queue_gallery_thumbnails(
+    executor: ThreadPoolExecutor,
+    window,
+    cache_directory: Path,
+    indexed_textures: List[Tuple[int, object]],
+    target_size: Tuple[int, int] = (200, 200),
+) -> List[Future]:
+    """
+    Build thumbnails on worker threads and post each one back to the window.
+
+    Every finished thumbnail is delivered as a GALLERY_THUMBNAIL_EVENT whose value
+    is (texture index, PNG bytes), so the GUI thread never decodes textures.
+
+    Args:
+        executor: Thread pool to run the work on
+        window: FreeSimpleGUI window that receives the events
+        cache_directory: Directory returned by get_bundle_cache_directory
+        indexed_textures: (texture index, Texture2D object) pairs to thumbnail
+        target_size: Tuple of (width, height) for the thumbnails
+
+    Returns:
+        Futures of the queued thumbnails, so a page change can cancel them
+    """
+
+    def build_thumbnail(texture_index: int, texture) -> None:
+        try:
+            thumbnail_bytes = get_gallery_thumbnail(
+                cache_directory, texture, target_size
+            )
+            window.write_event_value(
+                GALLERY_THUMBNAIL_EVENT, (texture_index, thumbnail_bytes)
+            )
+        except Exception as e:
+            # The window may have been closed while the thumbnail was being built
+            print(f"Could not build thumbnail {texture_index}: {e}")
+
+    return [
+        executor.submit(build_thumbnail, texture_index, texture)
+        for texture_index, texture in indexed_textures
+    ]
@@ -0,0 +1,251 @@
+# Artist search and preview store for the token browser
+# Token artists are indexed by trigram when the card list loads, and token previews are
+# cached on disk next to the gallery thumbnails, so browsing doesn't re-parse bundles
+
+import bisect
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.image_utils import (
+    DISPLAY_MAX_SIZE,
+    convert_texture_to_bytes,
+    remove_alpha_channel,
+    resize_image_for_gallery,
+    resize_image_to_screen,
+)
+from src.thumbnail_cache import get_bundle_cache_directory
+from src.unity_bundle import extract_textures_from_bundle, load_unity_bundle
+
+TOKEN_ARTIST_QUERY = """
+    SELECT ArtistCredit, ArtId FROM Cards WHERE Rarity=0 AND ArtistCredit IS NOT NULL
+"""
+SEARCH_CACHE_SIZE = 32
+TOKEN_PAGE_SIZE = 30
+TOKEN_PREVIEW_SIZE = (150, 150)
+TOKEN_PREVIEW_EVENT = "-TOKEN_PREVIEW-"
+TOKEN_PREVIEW_WORKERS = 4
+
+
+def get_trigrams(text: str) -> Set[str]:
+    """Return every three character slice of a lowercase string."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class ArtistIndex:
+    """
+    In-memory trigram index of token artists.
+
+    Matches the same tokens as get_tokens_by_artist, a case-insensitive substring
+    search, but only checks artists sharing every trigram of the query instead of
+    scanning the Cards table. Recent searches are answered from a small cache.
+
+    Attributes:
+        token_rows: (ArtistCredit, ArtId) of every token, in database order
+    """
+
+    def __init__(self, token_rows: List[Tuple[str, int]]) -> None:
+        self.token_rows = token_rows
+        # Distinct lowercase artists and the rows credited to each
+        self._artists: List[str] = []
+        self._artist_rows: List[List[int]] = []
+        self._trigram_artists: Dict[str, Set[int]] = {}
+        self._search_cache: "OrderedDict[str, List[Tuple[str, int]]]" = OrderedDict()
+
+        artist_positions: Dict[str, int] = {}
+        for row_position, (artist_credit, _) in enumerate(token_rows):
+            artist = artist_credit.lower()
+            artist_position = artist_positions.get(artist)
+            if artist_position is None:
+                artist_position = artist_positions[artist] = len(self._artists)
+                self._artists.append(artist)
+                self._artist_rows.append([])
+                for trigram in get_trigrams(artist):
+                    self._trigram_artists.setdefault(trigram, set()).add(
+                        artist_position
+                    )
+            self._artist_rows[artist_position].append(row_position)
+
+    def search(self, artist_name: str) -> List[Tuple[str, int]]:
+        """
+        Find tokens whose artist credit contains a name.
+
+        Args:
+            artist_name: Name or part of a name, in any case
+
+        Returns:
+            List of (ArtistCredit, ArtId) tuples in database order
+        """
+        query = artist_name.lower()
+        if query in self._search_cache:
+            self._search_cache.move_to_end(query)
+            return self._search_cache[query]
+
+        query_trigrams = get_trigrams(query)
+        if query_trigrams:
+            candidate_sets = sorted(
+                (
+                    self._trigram_artists.get(trigram, set())
+                    for trigram in query_trigrams
+                ),
+                key=len,
+            )
+            candidates = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+        else:
+            # Too short for a trigram; the list of distinct artists is small
+            candidates = range(len(self._artists))
+
+        row_positions = []
+        for artist_position in candidates:
+            if query in self._artists[artist_position]:
+                row_positions.extend(self._artist_rows[artist_position])
+        results = [self.token_rows[position] for position in sorted(row_positions)]
+
+        self._search_cache[query] = results
+        while len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return results
+
+
+def build_artist_index(database_cursor: sqlite3.Cursor) -> ArtistIndex:
+    """
+    Index the artists of every token in the card database.
+
+    Args:
+        database_cursor: SQLite cursor for the card database
+
+    Returns:
+        ArtistIndex of the database's tokens
+    """
+    return ArtistIndex(database_cursor.execute(TOKEN_ARTIST_QUERY).fetchall())
+
+
+def list_art_bundles(asset_bundle_directory: str) -> List[str]:
+    """
+    List the bundle files of an AssetBundle folder once for find_art_bundle.
+
+    Args:
+        asset_bundle_directory: MTGA AssetBundle folder
+
+    Returns:
+        Sorted bundle file names
+    """
+    if not asset_bundle_directory:
+        return []
+    try:
+        return sorted(
+            file_name
+            for file_name in os.listdir(asset_bundle_directory)
+            if file_name.endswith(".mtga")
+        )
+    except OSError as e:
+        print(f"Could not list asset bundles: {e}")
+        return []
+
+
+def find_art_bundle(bundle_file_names: List[str], art_id) -> Optional[str]:
+    """
+    Find the bundle of an ArtId the same way get_card_texture_data does.
+
+    Args:
+        bundle_file_names: Sorted names from list_art_bundles
+        art_id: ArtId of the card or token
+
+    Returns:
+        File name of the first bundle starting with the ArtId, or None
+    """
+    prefix = str(art_id)
+    position = bisect.bisect_left(bundle_file_names, prefix)
+    if position < len(bundle_file_names) and bundle_file_names[position].startswith(
+        prefix
+    ):
+        return bundle_file_names[position]
+    return None
+
+
+def get_token_preview(
+    bundle_file_path: str, full_size: bool = False
+) -> Optional[bytes]:
+    """
+    Return a token's preview PNG, parsing its bundle only on a cache miss.
+
+    Both preview sizes are made from a single parse: a grid thumbnail and a screen
+    sized image for the token editor. The cache is cleared with the bundle's gallery
+    thumbnails when the bundle changes.
+
+    Args:
+        bundle_file_path: Path to the token's bundle
+        full_size: Return the editor image instead of the grid thumbnail
+
+    Returns:
+        Preview image data as PNG bytes, or None if the bundle has no texture
+    """
+    cache_directory = get_bundle_cache_directory(bundle_file_path)
+    thumbnail_path = cache_directory / "token_{}x{}.png".format(*TOKEN_PREVIEW_SIZE)
+    full_size_path = cache_directory / "token_{}x{}.png".format(*DISPLAY_MAX_SIZE)
+    preview_path = full_size_path if full_size else thumbnail_path
+    try:
+        return preview_path.read_bytes()
+    except FileNotFoundError:
+        pass
+
+    # Same texture and alpha handling as the token editor shows
+    texture_data_list = extract_textures_from_bundle(
+        load_unity_bundle(bundle_file_path), sort_by_colors=False
+    )
+    if not texture_data_list:
+        return None
+    token_image = remove_alpha_channel(texture_data_list[0].image)
+    preview_images = {
+        thumbnail_path: resize_image_for_gallery(token_image, TOKEN_PREVIEW_SIZE),
+        full_size_path: resize_image_to_screen(token_image, *DISPLAY_MAX_SIZE),
+    }
+
+    preview_bytes = None
+    for path, image in preview_images.items():
+        image_bytes = convert_texture_to_bytes(image)
+        if path == preview_path:
+            preview_bytes = image_bytes
+        try:
+            temp_path = path.with_suffix(".tmp")
+            temp_path.write_bytes(image_bytes)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not cache token preview {path.name}: {e}")
+    return preview_bytes
+
+
+def queue_token_previews(
+    executor: ThreadPoolExecutor,
+    window,
+    indexed_bundles: List[Tuple[int, str]],
+) -> List[Future]:
+    """
+    Load grid previews on worker threads and post each one back to the window.
+
+    Every finished preview is delivered as a TOKEN_PREVIEW_EVENT whose value is
+    (result index, PNG bytes).
+
+    Args:
+        executor: Thread pool to run the work on
+        window: FreeSimpleGUI window that receives the events
+        indexed_bundles: (result index, bundle path) pairs to preview
+
+    Returns:
+        Futures of the queued previews, so a page change can cancel them
+    """
+
+    def load_preview(result_index: int, bundle_file_path: str) -> None:
+        try:
+            preview_bytes = get_token_preview(bundle_file_path)
+            window.write_event_value(TOKEN_PREVIEW_EVENT, (result_index, preview_bytes))
+        except Exception as e:
+            # The window may have been closed while the preview was being built
+            print(f"Could not build token preview {result_index}: {e}")
+
+    return [
+        executor.submit(load_preview, result_index, bundle_file_path)
+        for result_index, bundle_file_path in indexed_bundles
+    ]
@@ -0,0 +1,206 @@
+# Lightweight hot-path tracing with Chrome trace export
+# Set MTGA_SWAPPER_TRACE to record spans; the trace is written when the app exits and
+# can be opened in chrome://tracing or https://ui.perfetto.dev
+
+import atexit
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Optional
+
+TRACE_ENVIRONMENT_VARIABLE = "MTGA_SWAPPER_TRACE"
+TRACE_DIRECTORY = Path.home() / ".mtga_swapper" / "traces"
+# SQL text longer than this is cut in span arguments
+TRACE_SQL_LENGTH = 200
+
+# "1"/"true" writes to TRACE_DIRECTORY, anything else is used as the output path
+_trace_setting = os.environ.get(TRACE_ENVIRONMENT_VARIABLE, "").strip()
+TRACING_ENABLED = _trace_setting.lower() not in ("", "0", "false", "no", "off")
+
+_trace_events = []
+_trace_thread_names = {}
+_trace_started = time.perf_counter()
+_disabled_span = nullcontext()
+
+
+def get_trace_path() -> Path:
+    """
+    Return the file the trace is written to.
+
+    Returns:
+        Path from MTGA_SWAPPER_TRACE, or a timestamped file in TRACE_DIRECTORY
+    """
+    if _trace_setting.lower() in ("1", "true", "yes", "on"):
+        return TRACE_DIRECTORY / time.strftime("trace-%Y%m%d-%H%M%S.json")
+    return Path(_trace_setting)
+
+
+@contextmanager
+def _record_span(name: str, arguments: dict):
+    """Time the body and store it as a Chrome trace complete event."""
+    thread = threading.current_thread()
+    _trace_thread_names.setdefault(thread.ident, thread.name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        finished = time.perf_counter()
+        # list.append is atomic, so worker threads can record without a lock
+        _trace_events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": (started - _trace_started) * 1e6,
+                "dur": (finished - started) * 1e6,
+                "pid": os.getpid(),
+                "tid": thread.ident,
+                "args": arguments,
+            }
+        )
+
+
+def trace_span(name: str, **arguments):
+    """
+    Context manager that records the time spent in its body.
+
+    Returns a shared no-op context when tracing is disabled, so spans can stay in
+    hot paths.
+
+    Args:
+        name: Span name shown in the trace viewer
+        **arguments: Extra values shown with the span, e.g. file names
+
+    Returns:
+        Context manager for a with statement
+    """
+    if not TRACING_ENABLED:
+        return _disabled_span
+    return _record_span(name, arguments)
+
+
+def traced(function: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator that records every call of a function as a span.
+
+    When tracing is disabled the function is returned unchanged.
+
+    Args:
+        function: Function to trace, when used as a bare @traced
+        name: Span name, defaults to the function's qualified name
+    """
+
+    def decorate(function: Callable) -> Callable:
+        if not TRACING_ENABLED:
+            return function
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def traced_function(*args, **kwargs):
+            with _record_span(span_name, {}):
+                return function(*args, **kwargs)
+
+        return traced_function
+
+    return decorate(function) if function is not None else decorate
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that records every statement as a span."""
+
+    def execute(self, sql, parameters=()):
+        with _record_span("sql execute", {"sql": sql[:TRACE_SQL_LENGTH]}):
+            return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        with _record_span("sql executemany", {"sql": sql[:TRACE_SQL_LENGTH]}):
+            return super().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        with _record_span("sql executescript", {"sql": sql_script[:TRACE_SQL_LENGTH]}):
+            return super().executescript(sql_script)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors and shortcut execute methods are traced."""
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connect_database(database_path, **kwargs) -> sqlite3.Connection:
+    """
+    Open an SQLite database, tracing its statements when tracing is enabled.
+
+    Args:
+        database_path: Path to the SQLite file
+        **kwargs: Passed on to sqlite3.connect
+
+    Returns:
+        Open connection
+    """
+    if TRACING_ENABLED:
+        kwargs.setdefault("factory", TracedConnection)
+    return sqlite3.connect(database_path, **kwargs)
+
+
+def write_trace(trace_path: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write the recorded spans as Chrome trace JSON.
+
+    Args:
+        trace_path: Output file, defaults to get_trace_path()
+
+    Returns:
+        Path of the written trace, or None if nothing was recorded
+    """
+    if not _trace_events:
+        return None
+    trace_path = Path(trace_path or get_trace_path())
+    trace_path.parent.mkdir(parents=True, exist_ok=True)
+    thread_name_events = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": os.getpid(),
+            "tid": thread_id,
+            "args": {"name": thread_name},
+        }
+        for thread_id, thread_name in list(_trace_thread_names.items())
+    ]
+    with open(trace_path, "w") as trace_file:
+        json.dump(
+            {
+                "traceEvents": thread_name_events + list(_trace_events),
+                "displayTimeUnit": "ms",
+            },
+            trace_file,
+        )
+    return trace_path
+
+
+def _write_trace_at_exit() -> None:
+    try:
+        trace_path = write_trace()
+    except OSError as e:
+        print(f"Could not write trace: {e}")
+        return
+    if trace_path:
+        print(f"Trace written to {trace_path}")
+
+
+if TRACING_ENABLED:
+    atexit.register(_write_trace_at_exit)
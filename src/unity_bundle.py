@@ -1,16 +1,33 @@
 # Unity Asset Bundle operations for MTGA Swapper
 # Handles Unity asset bundle loading, texture extraction, and asset manipulation
 
-import UnityPy
-import UnityPy.classes
-import UnityPy.config
+from __future__ import annotations
+
 from PIL import Image
 from pathlib import Path
 import os
-from typing import List, Tuple, Optional, Union
+from typing import TYPE_CHECKING, List, Tuple, Optional, Union
 from tkinter.filedialog import askopenfilename, askdirectory
 
+from .backup_store import backup_bundle
+from .bundle_writer import save_bundle_file
 from .image_utils import remove_alpha_channel
+from .mesh_export import DEFAULT_MESH_EXPORT_FORMAT, export_mesh
+from .texture_journal import (
+    forget_textures,
+    get_journaled_textures,
+    read_texture_payload,
+    record_original_texture,
+)
+from .texture_memory import DecodedImageList
+from .tracing import trace_span, traced
+
+if TYPE_CHECKING:
+    # UnityPy takes about a second to import, so it is imported on first use
+    import UnityPy
+
+# Bytes of level0 read to find the Unity version
+LEVEL0_HEADER_SIZE = 4096
 
 
 def configure_unity_version(database_path: str, fallback_version: str) -> None:
@@ -21,12 +38,18 @@ def configure_unity_version(database_path: str, fallback_version: str) -> None:
         database_path: Path to the MTGA database file
         fallback_version: Version string to use if detection fails
     """
+    import UnityPy.config
+
     try:
-        # Try to read Unity version from the level0 file in the game directory
+        # Try to read Unity version from the level0 file in the game directory; the
+        # version sits in the header, so only the start of the file is read
         level0_path = Path(database_path).parents[2] / "level0"
         with open(level0_path, "rb") as version_file:
             version_text = (
-                version_file.read().decode("latin-1").strip()[40:60].replace("\x00", "")
+                version_file.read(LEVEL0_HEADER_SIZE)
+                .decode("latin-1")
+                .strip()[40:60]
+                .replace("\x00", "")
             )
             UnityPy.config.FALLBACK_UNITY_VERSION = version_text
 
@@ -45,25 +68,52 @@ def load_unity_bundle(bundle_file_path: str) -> UnityPy.Environment:
     Returns:
         Loaded Unity environment object
     """
-    try:
-        return UnityPy.load(bundle_file_path)
-    except UnityPy.exceptions.UnityVersionFallbackError as error:
-        # Set fallback version and retry
-        UnityPy.config.FALLBACK_UNITY_VERSION = "2022.3.42f1"
-        print(
-            f"Unity version error: {error}. Using fallback version {UnityPy.config.FALLBACK_UNITY_VERSION}."
-        )
-        return UnityPy.load(bundle_file_path)
+    import UnityPy
+
+    with trace_span("load_unity_bundle", bundle=os.path.basename(bundle_file_path)):
+        try:
+            return UnityPy.load(bundle_file_path)
+        except UnityPy.exceptions.UnityVersionFallbackError as error:
+            # Set fallback version and retry
+            UnityPy.config.FALLBACK_UNITY_VERSION = "2022.3.42f1"
+            print(
+                f"Unity version error: {error}. Using fallback version {UnityPy.config.FALLBACK_UNITY_VERSION}."
+            )
+            return UnityPy.load(bundle_file_path)
 
 
+def is_gallery_texture(texture_name: str) -> bool:
+    """
+    Check whether a texture should be shown and exported, skipping atlases and font textures.
+
+    Args:
+        texture_name: The texture's m_Name
+
+    Returns:
+        True if the texture is a regular image
+    """
+    name_parts = texture_name.lower().split()
+    return (
+        not (name_parts and "atlas" in name_parts[-1])
+        and "font texture" != texture_name.lower()
+    )
+
+
+@traced
 def extract_textures_from_bundle(
     unity_environment: UnityPy.Environment,
+    texture_order: Optional[List[int]] = None,
+    sort_by_colors: bool = True,
 ) -> List[UnityPy.classes.Texture2D]:
     """
     Extract all Texture2D objects from a Unity asset bundle.
 
     Args:
         unity_environment: Loaded Unity environment
+        texture_order: Cached display order as path_ids; skips decoding every
+            texture to sort it when it still matches the bundle's textures
+        sort_by_colors: Break size ties by unique color count; set to False to
+            sort from the texture headers alone without decoding any image
 
     Returns:
         List of Texture2D objects sorted by size and complexity
@@ -71,13 +121,26 @@ def extract_textures_from_bundle(
     texture_objects = [
         obj.read() for obj in unity_environment.objects if obj.type.name == "Texture2D"
     ]
-    texture_objects = list(
-        filter(
-            lambda tex: "atlas" not in tex.m_Name.lower().split()[-1]
-            and "font texture" != tex.m_Name.lower(),
+    texture_objects = [
+        texture for texture in texture_objects if is_gallery_texture(texture.m_Name)
+    ]
+
+    if texture_order is not None:
+        order_index = {path_id: index for index, path_id in enumerate(texture_order)}
+        if len(order_index) == len(texture_objects) and all(
+            texture.object_reader.path_id in order_index for texture in texture_objects
+        ):
+            return sorted(
+                texture_objects,
+                key=lambda texture: order_index[texture.object_reader.path_id],
+            )
+
+    if not sort_by_colors:
+        return sorted(
             texture_objects,
+            key=lambda texture: texture.m_Width + texture.m_Height,
+            reverse=True,
         )
-    )
 
     # Sort by size (width + height) and color complexity (number of unique colors), largest first
     return sorted(
@@ -90,27 +153,54 @@ def extract_textures_from_bundle(
     )
 
 
+def get_texture_by_path_id(
+    unity_environment: UnityPy.Environment, path_id: int
+) -> Optional[UnityPy.classes.Texture2D]:
+    """
+    Read the Texture2D with the given path_id, whatever order a list shows it in.
+
+    Args:
+        unity_environment: Loaded Unity environment
+        path_id: path_id of the texture
+
+    Returns:
+        The texture, or None if the bundle has no object with that path_id
+    """
+    for unity_object in unity_environment.objects:
+        if unity_object.path_id == path_id and unity_object.type.name == "Texture2D":
+            return unity_object.read()
+    return None
+
+
 def export_3d_meshes(
-    unity_environment: UnityPy.Environment, export_directory: str
+    unity_environment: UnityPy.Environment,
+    export_directory: str,
+    mesh_format: str = DEFAULT_MESH_EXPORT_FORMAT,
 ) -> int:
     """
-    Export all 3D meshes from the Unity environment to OBJ files.
+    Export all 3D meshes from the Unity environment, streaming one mesh at a time.
 
     Args:
         unity_environment: Loaded Unity environment
         export_directory: Directory to save the exported mesh files
+        mesh_format: One of mesh_export.MESH_EXPORT_FORMATS
 
     Returns:
-        Number of meshes successfully exported
+        Number of meshes successfully exported; meshes without vertices are
+        skipped and logged
     """
     mesh_counter = 0
     for unity_object in unity_environment.objects:
         if unity_object.type.name == "Mesh":
             mesh_data = unity_object.read()
-            mesh_file_path = os.path.join(export_directory, f"{mesh_data.m_Name}.obj")
-            with open(mesh_file_path, "wt", newline="") as mesh_file:
-                mesh_file.write(mesh_data.export())
-            mesh_counter += 1
+            if export_mesh(
+                mesh_data,
+                os.path.join(export_directory, mesh_data.m_Name),
+                mesh_format,
+            ):
+                mesh_counter += 1
+            else:
+                print(f"Skipped mesh {mesh_data.m_Name}: it has no vertices")
     return mesh_counter
 
 
@@ -153,7 +243,8 @@ def get_card_texture_data(
         database_file_path: Path to the MTGA database file
 
     Returns:
-        Tuple of (processed_images_list, raw_texture_data_list) or None if not found
+        Tuple of (processed_images_list, raw_texture_data_list) or None if not found;
+        processed_images_list is a DecodedImageList that decodes on first access
     """
     if card_object and database_file_path:
         try:
@@ -175,16 +266,22 @@ def get_card_texture_data(
 
             bundle_file_path = os.path.join(asset_bundle_path, matching_files[0])
             unity_environment = load_unity_bundle(bundle_file_path)
-            texture_data_list = extract_textures_from_bundle(unity_environment)
+            # Sorted from the texture headers, so opening a card decodes nothing
+            # until the first image is shown
+            texture_data_list = extract_textures_from_bundle(
+                unity_environment, sort_by_colors=False
+            )
 
             print(
                 f"Extracted textures for card {card_object.art_id}: {len(texture_data_list)}"
             )
             if texture_data_list and len(texture_data_list) > 0:
-                # Process images to remove alpha channel
-                processed_images = [
-                    remove_alpha_channel(texture.image) for texture in texture_data_list
-                ]
+                # Images without alpha are decoded when first shown and dropped again
+                # when they fall out of the texture memory budget
+                processed_images = DecodedImageList(
+                    texture_data_list,
+                    lambda texture: remove_alpha_channel(texture.image),
+                )
                 if ret_matching:
                     return processed_images, texture_data_list, matching_files[0]
                 return processed_images, texture_data_list
@@ -194,6 +291,38 @@ def get_card_texture_data(
     return None, None, None
 
 
+def save_unity_bundle(
+    unity_environment: UnityPy.Environment,
+    bundle_file_path: str,
+    compression: Optional[str] = None,
+) -> None:
+    """
+    Write a loaded bundle back to its file.
+
+    UnityFS bundles are written with the configured block compression, reusing the
+    blocks of the file on disk that didn't change; other files are saved by UnityPy.
+
+    Args:
+        unity_environment: Unity environment loaded from bundle_file_path
+        bundle_file_path: Path to the asset bundle file
+        compression: One of bundle_writer.BUNDLE_COMPRESSIONS; the configured one
+            if None
+    """
+    bundle = unity_environment.file
+    with trace_span("BundleFile.save", bundle=os.path.basename(bundle_file_path)):
+        if getattr(bundle, "signature", None) == "UnityFS":
+            try:
+                with open(bundle_file_path, "rb") as original_file:
+                    original_data = original_file.read()
+            except OSError:
+                original_data = None
+            bundle_data = save_bundle_file(bundle, compression, original_data)
+        else:
+            bundle_data = bundle.save()
+    with open(bundle_file_path, "wb") as bundle_file:
+        bundle_file.write(bundle_data)
+
+
 def replace_texture_in_bundle(
     texture_data,
     new_image_path: str,
@@ -203,19 +332,109 @@ def replace_texture_in_bundle(
     """
     Replace a texture in a Unity asset bundle with a new image.
 
+    The texture's original serialized data is journaled first, so the change can be
+    undone with restore_textures_in_bundle.
+
     Args:
         texture_data: Original texture data object
         new_image_path: Path to the new image file
         bundle_file_path: Path to the asset bundle file
         unity_environment: Unity environment object
     """
+    journal_original_texture(texture_data, bundle_file_path)
+
     # Load the new image and replace the texture data
     texture_data.image = Image.open(new_image_path)
-    texture_data.save()
+    with trace_span("Texture2D.save", texture=texture_data.m_Name):
+        texture_data.save()
 
     # Save the modified bundle back to file
-    with open(bundle_file_path, "wb") as bundle_file:
-        bundle_file.write(unity_environment.file.save())
+    save_unity_bundle(unity_environment, bundle_file_path)
+
+
+def journal_original_texture(texture_data, bundle_file_path: str) -> bool:
+    """
+    Record a texture's serialized data in the texture journal before it changes.
+
+    Only the Texture2D object is stored, with its inline image data. Streamed image
+    data stays in the bundle's resource file, which replacing a texture never
+    rewrites, so the restored object still points at it.
+
+    Args:
+        texture_data: Texture2D object read from the bundle, not yet modified
+        bundle_file_path: Path to the asset bundle file
+
+    Returns:
+        True if the texture was journaled, False if its original already was
+    """
+    object_reader = texture_data.object_reader
+    stream_data = texture_data.m_StreamData
+    try:
+        return record_original_texture(
+            bundle_file_path,
+            object_reader.path_id,
+            object_reader.get_raw_data(),
+            {
+                "name": texture_data.m_Name,
+                "width": texture_data.m_Width,
+                "height": texture_data.m_Height,
+                "format": int(texture_data.m_TextureFormat),
+                "stream_path": stream_data.path if stream_data else "",
+            },
+        )
+    except OSError as e:
+        print(f"Could not journal texture {texture_data.m_Name}: {e}")
+        return False
+
+
+def restore_textures_in_bundle(
+    bundle_file_path: str, path_ids: Optional[List[int]] = None
+) -> int:
+    """
+    Splice journaled original textures back into a bundle.
+
+    Restored textures leave the journal. The whole-bundle backup used to re-apply
+    changes after game updates is always refreshed, never dropped: set swaps and
+    edits made by older versions change bundles without journaling, so an empty
+    journal doesn't mean the bundle is back to the game's original.
+
+    Args:
+        bundle_file_path: Path to the asset bundle file
+        path_ids: Textures to restore; every journaled texture of the bundle if None
+
+    Returns:
+        Number of textures restored
+    """
+    journaled_textures = get_journaled_textures(bundle_file_path)
+    if path_ids is not None:
+        journaled_textures = {
+            path_id: texture_entry
+            for path_id, texture_entry in journaled_textures.items()
+            if path_id in path_ids
+        }
+    if not journaled_textures:
+        return 0
+
+    unity_environment = load_unity_bundle(bundle_file_path)
+    restored_path_ids = []
+    for unity_object in unity_environment.objects:
+        texture_entry = journaled_textures.get(unity_object.path_id)
+        if texture_entry is None:
+            continue
+        raw_data = read_texture_payload(texture_entry)
+        if raw_data is None:
+            print(f"Journaled texture {texture_entry['name']} is missing or damaged")
+            continue
+        unity_object.set_raw_data(raw_data)
+        restored_path_ids.append(unity_object.path_id)
+    if not restored_path_ids:
+        return 0
+
+    save_unity_bundle(unity_environment, bundle_file_path)
+
+    forget_textures(bundle_file_path, restored_path_ids)
+    backup_bundle(bundle_file_path)
+    return len(restored_path_ids)
 
 
 def convert_texture_to_bytes(
@@ -1,11 +1,12 @@
 import os
 import sys
-import tempfile
-import requests
 import hashlib
 import subprocess
+import time
 import FreeSimpleGUI as sg
 
+from src.delta_patch import apply_patch
+
 # Configure these
 UPDATE_METADATA_URL = (
     "https://raw.githubusercontent.com/BobJr23/MTGA_Swapper/main/update.json"
@@ -13,6 +14,17 @@ UPDATE_METADATA_URL = (
 MAIN_EXE_NAME = "MTGA_Swapper.exe"
 NO_UPSCALE_EXE_NAME = "MTGA_Swapper_NoUpscale.exe"
 
+# Large reads keep the per-chunk overhead of hashing and writing the exe low
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 30
+# Failed attempts in a row before a download gives up; any progress resets the count
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_PROGRESS_KEY = "-UPDATE_DOWNLOAD-"
+
+
+class DownloadCancelled(Exception):
+    """Raised when the progress callback stops a download; the partial file is kept."""
+
 
 def get_local_version(path):
     # Read version from local update.json
@@ -27,27 +39,220 @@ def get_local_version(path):
 
 
 def get_remote_info():
+    # requests is imported here so the check can run without slowing down startup
+    import requests
+
     r = requests.get(UPDATE_METADATA_URL, timeout=10)
     r.raise_for_status()
     return r.json()
 
 
-def download_file(url, target_path):
-    with requests.get(url, stream=True) as r:
-        r.raise_for_status()
-        with open(target_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=8192):
-                f.write(chunk)
+def parse_content_range(content_range):
+    """
+    Parse a Content-Range header such as "bytes 100-199/200".
+
+    Args:
+        content_range: Header value
+
+    Returns:
+        Tuple of (first byte, total size or None), or None if the header is invalid
+    """
+    try:
+        _, byte_range = content_range.split(" ", 1)
+        first_last, total = byte_range.split("/", 1)
+        first_byte = int(first_last.split("-", 1)[0])
+        return first_byte, None if total.strip() == "*" else int(total)
+    except (AttributeError, ValueError):
+        return None
+
+
+def download_file(url, target_path, progress_callback=None, retries=DOWNLOAD_RETRIES):
+    """
+    Download a file, resuming partial downloads with HTTP Range requests.
+
+    Bytes already in target_path are kept and only the rest is requested, both
+    after a dropped connection and when a previous download was interrupted. Data
+    is hashed as it is written, so the file doesn't have to be read again to
+    verify it. Servers without Range support send the whole file, which then
+    replaces the partial one.
+
+    Args:
+        url: URL to download
+        target_path: File to write; an existing file is treated as the first part
+        progress_callback: Called with (bytes downloaded, total bytes or None) after
+            each chunk; returning False cancels the download
+        retries: Failed attempts in a row before giving up
+
+    Returns:
+        SHA-256 hex digest of the complete file
+
+    Raises:
+        DownloadCancelled: If the progress callback returned False
+        requests.exceptions.RequestException: If the download keeps failing
+    """
+    import requests
+
+    hasher = hashlib.sha256()
+    downloaded = 0
+    if os.path.exists(target_path):
+        # hashlib state can't be saved, so the part on disk is hashed once on resume
+        with open(target_path, "rb") as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                downloaded += len(chunk)
+
+    total_size = None
+    # ETag/Last-Modified of the file being downloaded, so a resume never mixes versions
+    validator = None
+    failed_attempts = 0
+    while True:
+        headers = {}
+        if downloaded:
+            headers["Range"] = f"bytes={downloaded}-"
+            if validator:
+                headers["If-Range"] = validator
+        try:
+            with requests.get(
+                url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT
+            ) as r:
+                if r.status_code == 416 and downloaded:
+                    content_range = parse_content_range(r.headers.get("Content-Range"))
+                    if content_range and content_range[1] == downloaded:
+                        # The partial file already holds every byte
+                        return hasher.hexdigest()
+                    # The partial file is larger than the download; start over
+                    hasher = hashlib.sha256()
+                    downloaded = 0
+                    open(target_path, "wb").close()
+                    continue
+                r.raise_for_status()
+                validator = (
+                    validator or r.headers.get("ETag") or r.headers.get("Last-Modified")
+                )
+
+                content_range = parse_content_range(r.headers.get("Content-Range"))
+                if r.status_code == 206 and content_range:
+                    if content_range[0] != downloaded:
+                        raise requests.exceptions.ContentDecodingError(
+                            "Server resumed at the wrong position"
+                        )
+                    total_size = content_range[1]
+                    file_mode = "ab"
+                else:
+                    # Full response: no Range support, or the file changed on the server
+                    hasher = hashlib.sha256()
+                    downloaded = 0
+                    content_length = r.headers.get("Content-Length")
+                    total_size = int(content_length) if content_length else None
+                    file_mode = "wb"
+
+                with open(target_path, file_mode) as f:
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        downloaded += len(chunk)
+                        failed_attempts = 0
+                        if (
+                            progress_callback
+                            and progress_callback(downloaded, total_size) is False
+                        ):
+                            raise DownloadCancelled("Download cancelled")
+
+            if total_size is None or downloaded >= total_size:
+                return hasher.hexdigest()
+            # The connection ended early without an error; ask for the rest
+            failed_attempts += 1
+            if failed_attempts > retries:
+                raise requests.exceptions.ConnectionError(
+                    f"Download stopped at {downloaded} of {total_size} bytes"
+                )
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.ContentDecodingError,
+        ) as e:
+            failed_attempts += 1
+            if failed_attempts > retries:
+                raise
+            print(f"Download interrupted at {downloaded} bytes ({e}), resuming...")
+        # Back off a little more after each failure in a row
+        time.sleep(min(0.5 * 2 ** (failed_attempts - 1), 10))
+
+
+def show_download_progress(downloaded, total_size):
+    """Progress callback for download_file that shows a cancellable progress bar."""
+    megabyte = 1024 * 1024
+    total_text = f"{total_size / megabyte:.1f} MB" if total_size else "unknown size"
+    return sg.one_line_progress_meter(
+        "Downloading update",
+        downloaded,
+        total_size or downloaded + 1,
+        f"{downloaded / megabyte:.1f} MB of {total_text}",
+        key=DOWNLOAD_PROGRESS_KEY,
+        orientation="h",
+    )
 
 
 def sha256_of_file(path):
     h = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
+def download_patched_update(patch_info, executable_name, remote_ver, expected_checksum):
+    """
+    Build the new executable by patching the installed one.
+
+    Args:
+        patch_info: Entry of the variant's "patches" in update.json for the local
+            version, with "url" and "checksum" of the patch file
+        executable_name: Installed executable the patch applies to
+        remote_ver: Version being installed
+        expected_checksum: SHA-256 of the new executable
+
+    Returns:
+        Path of the patched executable, or None if the full download is needed
+
+    Raises:
+        DownloadCancelled: If the user cancelled the patch download
+    """
+    if not os.path.exists(executable_name) or not patch_info.get("url"):
+        return None
+    patch_path = f"{executable_name}.{remote_ver}.patch.part"
+    patched_path = f"{executable_name}.{remote_ver}.patched"
+    try:
+        try:
+            patch_checksum = download_file(
+                patch_info["url"], patch_path, show_download_progress
+            )
+        finally:
+            sg.one_line_progress_meter_cancel(key=DOWNLOAD_PROGRESS_KEY)
+        expected_patch_checksum = patch_info.get("checksum")
+        if (
+            expected_patch_checksum
+            and patch_checksum.lower() != expected_patch_checksum.lower()
+        ):
+            os.remove(patch_path)
+            raise ValueError("Patch checksum mismatch")
+
+        actual = apply_patch(executable_name, patch_path, patched_path)
+        os.remove(patch_path)
+        if not expected_checksum or actual.lower() != expected_checksum.lower():
+            raise ValueError("Patched executable checksum mismatch")
+        return patched_path
+    except DownloadCancelled:
+        raise
+    except Exception as e:
+        print(f"Could not apply update patch ({e}), downloading the full update")
+        for leftover_path in (patch_path, patched_path):
+            if os.path.exists(leftover_path):
+                os.remove(leftover_path)
+        return None
+
+
 def replace_executable(new_path, dest_path):
     # On Windows, you can't overwrite a running exe. Strategies:
     # - Use a temporary file and schedule replacement after exit
@@ -129,13 +334,26 @@ def run_main_exe(variant):
 
 
 def main(path):
-    local_ver = get_local_version(path)
     try:
         info = get_remote_info()
     except Exception as e:
         sg.popup_error(f"Failed to fetch update info: {e}", title="Update Check Failed")
         return False
+    return offer_update(path, info)
+
+
+def offer_update(path, info):
+    """
+    Offer to install an update if the remote version differs from the local one.
 
+    Args:
+        path: Path to the local update.json
+        info: Remote update.json from get_remote_info
+
+    Returns:
+        True if the user went through the update and the app should exit
+    """
+    local_ver = get_local_version(path)
     remote_ver = info.get("version")
     downloads = info.get("downloads", {})
 
@@ -156,21 +374,33 @@ def main(path):
             sg.popup_error("Error: No download URL found.", title="Update Error")
             sys.exit(1)
 
-        tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".exe")
-        tmp_path = tmp.name
-        tmp.close()
+        executable_name = MAIN_EXE_NAME if variant == "upscale" else NO_UPSCALE_EXE_NAME
+        # Kept next to the exe between attempts so an interrupted download resumes
+        download_path = f"{executable_name}.{remote_ver}.part"
 
-        try:
-            # Show download progress window
+        # Patch from the installed version if the release has one, a fraction of
+        # the full download
+        patch_info = variant_info.get("patches", {}).get(local_ver)
 
-            download_file(url, tmp_path)
-            actual = sha256_of_file(tmp_path)
-            if expected_checksum and actual.lower() != expected_checksum.lower():
-                raise ValueError("Checksum mismatch")
+        try:
+            patched_path = None
+            if patch_info:
+                patched_path = download_patched_update(
+                    patch_info, executable_name, remote_ver, expected_checksum
+                )
+            if patched_path:
+                download_path = patched_path
+            else:
+                try:
+                    actual = download_file(url, download_path, show_download_progress)
+                finally:
+                    sg.one_line_progress_meter_cancel(key=DOWNLOAD_PROGRESS_KEY)
+                if expected_checksum and actual.lower() != expected_checksum.lower():
+                    # A corrupt file can't be resumed, the next attempt starts over
+                    os.remove(download_path)
+                    raise ValueError("Checksum mismatch")
 
-            replace_executable(
-                tmp_path, MAIN_EXE_NAME if variant == "upscale" else NO_UPSCALE_EXE_NAME
-            )
+            replace_executable(download_path, executable_name)
 
             # Update local update.json with new version info
             import json
@@ -191,12 +421,16 @@ def main(path):
                     "https://github.com/BobJr23/MTGA_Swapper/releases/latest"
                 )
 
+        except DownloadCancelled:
+            sg.popup(
+                "Update paused. It will continue where it stopped next time.",
+                title="Update Paused",
+            )
+            return False
+
         except Exception as e:
             sg.popup_error(f"Update failed: {e}", title="Update Error")
-            # Could fallback: run existing version, or abort
-            # Optionally clean up tmp file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            # The partial download is kept so the next attempt resumes it
             if (
                 sg.popup_yes_no(
                     "Would you like to download the update manually from the website?",